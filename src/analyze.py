@@ -0,0 +1,60 @@
+import argparse
+import json
+import os
+import sys
+
+from pkgs.analytics import RecordFileInvalid, analyzeSession, formatReport, \
+    loadRecords
+
+
+def _parseArgs(argv: list) -> argparse.Namespace:
+    """
+    Parse the command line arguments.
+
+    Params:
+        argv:   The command line arguments.
+
+    Return:
+        The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        description='Summarize recorded operator sessions.')
+    parser.add_argument('files', nargs='+', metavar='FILE',
+                        help='the session record files')
+    parser.add_argument('--json', action='store_true',
+                        help='output the summaries as JSON')
+    return parser.parse_args(argv)
+
+
+def main(argv: list = None) -> int:
+    """
+    Report every recorded session.
+
+    Params:
+        argv:   The command line arguments. Default: sys.argv.
+
+    Return:
+        0 if every session was reported, 1 otherwise.
+    """
+    args = _parseArgs(argv)
+    status = 0
+    summaries = {}
+    for path in args.files:
+        try:
+            summary = analyzeSession(loadRecords(path))
+        except (OSError, RecordFileInvalid) as e:
+            print(e, file=sys.stderr)
+            status = 1
+            continue
+        name = os.path.splitext(os.path.basename(path))[0]
+        if args.json:
+            summaries[name] = summary
+        else:
+            print(formatReport(name, summary))
+    if args.json:
+        print(json.dumps(summaries, indent=2))
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
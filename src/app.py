@@ -1,17 +1,33 @@
 from adafruit_servokit import ServoKit
+import json
+import os
 import sys
+import tempfile
+import threading
 import time
 
 from pkgs.controlDevice import ControlDevice
-from pkgs.messages import UnitCxnStateMsg
-from pkgs.messages import UnitWhldCmdMsg
-from pkgs.messages import UnitWhldStateMsg
+from pkgs.linkMonitor import LinkMonitor
+from pkgs.mixer import Mixer
 import pkgs.mqttClient as client
+from pkgs.powerMonitor import PowerMonitor
+from pkgs.profiler import ProfilerInvalid, ProfilerNotInstalled, \
+    ProfilerRunning, SamplingProfiler
+from pkgs.publishQueue import PublishQueue
+from pkgs.pwmBackend import PwmBackend, PwmBackendUnsupported, \
+    createBackend
+from pkgs.tuning import Tunables
+from pkgs.unit import Unit
 from logger import initLogger
 
 
+PWM_BACKEND = os.environ.get('PWM_BACKEND', PwmBackend.TYPE_SERVOKIT)
 PWM_CHAN_CNT = 16
 PWM_FREQ = 180
+PWM_I2C_BUS = 1
+PIGPIO_HOST = os.environ.get('PIGPIO_HOST', 'localhost')
+PIGPIO_PORT = 8888
+PIGPIO_PINS = (12, 13)
 STEERING_TYPE = ControlDevice.TYPE_DIRECT
 STEERING_MIN = ControlDevice.MIN_ROTATION
 STEERING_MAX = ControlDevice.MAX_ROTATION
@@ -26,15 +42,239 @@ CLIENT_ID = 'f1-operator'
 CLIENT_PASSWORD = '12345'
 
 STATE_UPDATE_PERIOD = 0.025
+IDLE_DELAY = float(os.environ.get('IDLE_DELAY', '30.0'))
+IDLE_STATE_UPDATE_PERIOD = 1.0
 
-steering = None
-throttle = None
+TUNING_FILE = os.environ.get('TUNING_FILE')
+
+RECORD_DIR = os.environ.get('RECORD_DIR')
+
+UNITS_FILE = os.environ.get('UNITS_FILE')
+UNITS = ({'id': CLIENT_ID,
+          'steering': ControlDevice.CHANNELS[STEERING_TYPE],
+          'throttle': ControlDevice.CHANNELS[THROTTLE_TYPE],
+          'tuningFile': TUNING_FILE},)
+
+PWM_TOPIC = f"{CLIENT_ID}/pwm"
+PWM_QOS = 1
+
+PROFILE_TOPIC = f"{CLIENT_ID}/profile"
+PROFILE_QOS = 1
+PROFILE_DIR = os.environ.get('PROFILE_DIR', tempfile.gettempdir())
+PROFILE_DURATION = 10.0
+
+PUBLISH_STATS_PERIOD = 10.0
+TELEMETRY_TARGET_LATENCY = 0.05
+TELEMETRY_MAX_SCALE = 20.0
+
+units = {}
+publisher = None
+linkMonitor = None
+powerMonitor = None
+profiler = None
+wakeup = threading.Event()
 logger = None
 
 
-def _onCommandMsg(client, usrData, msg) -> None:
+def _getBackendParams(backendType: str) -> dict:
+    """
+    Get the PWM backend parameters.
+
+    Params:
+        backendType:    The PWM backend type.
+
+    Return:
+        The backend constructor parameters.
+    """
+    if backendType == PwmBackend.TYPE_PCA9685:
+        return {'busNum': PWM_I2C_BUS, 'chanCount': PWM_CHAN_CNT,
+                'frequency': PWM_FREQ}
+    if backendType == PwmBackend.TYPE_PIGPIO:
+        return {'pins': PIGPIO_PINS, 'host': PIGPIO_HOST,
+                'port': PIGPIO_PORT}
+    return {'servoKit': ServoKit, 'chanCount': PWM_CHAN_CNT,
+            'frequency': PWM_FREQ}
+
+
+def _initControlDevices(appLogger) -> None:
+    """
+    Initialize the control devices PWM backend.
+
+    Params:
+        appLogger:  The appLogger.
+    """
+    global logger
+    logger.info(f"initializing control devices with {PWM_BACKEND} backend")
+    ControlDevice.initBackend(createBackend(PWM_BACKEND,
+                                            **_getBackendParams(PWM_BACKEND)))
+    logger.info('control devices initialized')
+
+
+def _loadUnitConfigs() -> tuple:
+    """
+    Load the hosted units configuration.
+
+    Return:
+        The units configuration from UNITS_FILE if defined,
+        UNITS otherwise.
+    """
+    if UNITS_FILE:
+        with open(UNITS_FILE) as unitsFile:
+            return tuple(json.load(unitsFile))
+    return UNITS
+
+
+def _getUnitTunables(unitConfig: dict) -> Tunables:
+    """
+    Get the initial tuning of a unit.
+
+    Params:
+        unitConfig:     The unit configuration.
+
+    Return:
+        The tuning defined by the module constants on the unit channels.
+        A unit with a mixer has no steering or throttle channel.
+    """
+    steering = None
+    throttle = None
+    if 'mixer' not in unitConfig:
+        steering = (unitConfig['steering'],
+                    (STEERING_MIN, STEERING_NEUTRAL, STEERING_MAX))
+        throttle = (unitConfig['throttle'],
+                    (THROTTLE_MIN, THROTTLE_NEUTRAL, THROTTLE_MAX))
+    return Tunables(STATE_UPDATE_PERIOD, steering, throttle,
+                    idleDelay=IDLE_DELAY,
+                    idleStatePeriod=IDLE_STATE_UPDATE_PERIOD)
+
+
+def _getRecordFile(unitId: str) -> str:
+    """
+    Get the record file of a unit session.
+
+    Params:
+        unitId:     The unit ID.
+
+    Return:
+        The record file in RECORD_DIR if defined, None otherwise.
+    """
+    if not RECORD_DIR:
+        return None
+    return os.path.join(RECORD_DIR,
+                        f"{unitId}-{time.strftime('%Y%m%d-%H%M%S')}.rec")
+
+
+def _getUnitMixer(appLogger, unitConfig: dict) -> Mixer:
+    """
+    Get the mixer of a unit.
+
+    Params:
+        appLogger:      The appLogger.
+        unitConfig:     The unit configuration.
+
+    Return:
+        The mixer if the unit configuration has one, None otherwise.
+    """
+    if 'mixer' not in unitConfig:
+        return None
+    return Mixer.fromConfig(appLogger, unitConfig['mixer'], unitConfig['id'])
+
+
+def _checkUnitConfig(unitConfig: object) -> None:
+    """
+    Check a unit configuration has a unit ID and, without a mixer,
+    steering and throttle channels. Raises ValueError otherwise.
+
+    Params:
+        unitConfig:     The unit configuration.
+    """
+    if not isinstance(unitConfig, dict):
+        raise ValueError(f"invalid unit configuration {unitConfig!r}")
+    unitId = unitConfig.get('id')
+    if not isinstance(unitId, str) or not unitId:
+        raise ValueError(f"invalid unit ID {unitId!r}")
+    if 'mixer' not in unitConfig:
+        for key in ('steering', 'throttle'):
+            if key not in unitConfig:
+                raise ValueError(f"unit {unitId} has no {key} channel")
+
+
+def _initUnits(appLogger) -> None:
+    """
+    Initialize the hosted units. A unit leaving the idle mode wakes
+    the main loop up. A unit with an invalid configuration, or failing
+    to be created, is ignored and its channels are released. Raises
+    RuntimeError if no unit is hosted.
+
+    Params:
+        appLogger:  The appLogger.
+    """
+    global logger
+    global units
+    global wakeup
+    units = {}
+    for unitConfig in _loadUnitConfigs():
+        try:
+            _checkUnitConfig(unitConfig)
+        except ValueError as e:
+            logger.error(f"unit is ignored: {e}")
+            continue
+        unitId = unitConfig['id']
+        if unitId in units:
+            logger.error(f"duplicated unit {unitId} is ignored")
+            continue
+        try:
+            mixer = _getUnitMixer(appLogger, unitConfig)
+            unit = Unit(appLogger, unitId, _getUnitTunables(unitConfig),
+                        tuningFile=unitConfig.get('tuningFile'),
+                        recordFile=_getRecordFile(unitId), mixer=mixer)
+        except Exception as e:
+            ControlDevice.channels.release(unitId)
+            logger.error(f"unit {unitId} is ignored: {e}")
+            continue
+        unit.registerWakeListener(wakeup.set)
+        unit.start()
+        units[unitId] = unit
+    if not units:
+        raise RuntimeError('no unit is hosted')
+    logger.info(f"hosting units: {', '.join(units)}")
+
+
+def _saveProfile(report: list) -> None:
     """
-    The on command message callback.
+    Save a profiling report in PROFILE_DIR.
+
+    Params:
+        report:     The collapsed stack lines.
+    """
+    global logger
+    path = os.path.join(PROFILE_DIR,
+                        f"{CLIENT_ID}-{time.strftime('%Y%m%d-%H%M%S')}"
+                        f".folded")
+    try:
+        with open(path, 'w') as profileFile:
+            profileFile.write('\n'.join(report) + '\n')
+    except OSError as e:
+        logger.error(f"unable to save profile: {e}")
+        return
+    logger.info(f"profile saved to {path}")
+
+
+def _initProfiler(appLogger) -> None:
+    """
+    Initialize the sampling profiler. Must run in the main thread.
+
+    Params:
+        appLogger:  The appLogger.
+    """
+    global profiler
+    profiler = SamplingProfiler(appLogger, _saveProfile)
+    profiler.install()
+
+
+def _onProfileMsg(client, usrData, msg) -> None:
+    """
+    The on profile message callback. The message action is start,
+    with an optional duration in seconds, or stop.
 
     Params:
         client:     The client instance.
@@ -42,70 +282,156 @@ def _onCommandMsg(client, usrData, msg) -> None:
         msg:        The received message.
     """
     global logger
-    global steering
-    global throttle
-    logger.debug(f"received command message: {msg}")
-    commandMsg = UnitWhldCmdMsg(CLIENT_ID)
-    commandMsg.fromJson(msg)
-    steering.modifyPosition(commandMsg.getSteering())
-    throttle.modifyPosition(commandMsg.getThrottle())
+    global profiler
+    logger.debug(f"received profile message: {msg}")
+    try:
+        request = json.loads(msg)
+        action = request.get('action')
+        if action == 'start':
+            profiler.start(request.get('duration', PROFILE_DURATION))
+        elif action == 'stop':
+            profiler.stop()
+        else:
+            logger.error(f"unsupported profile action: {action}")
+    except (AttributeError, ValueError, ProfilerInvalid,
+            ProfilerNotInstalled, ProfilerRunning) as e:
+        logger.error(f"unable to handle profile message: {e}")
 
 
-def _initControlDevices(appLogger) -> None:
+def _onPwmMsg(client, usrData, msg) -> None:
     """
-    Initialize the control devices.
+    The on PWM message callback. The PWM frequency is shared by every
+    channel of the backend so it is tuned for the whole process rather
+    than per unit.
 
     Params:
-        appLogger:  The appLogger.
+        client:     The client instance.
+        usrData:    The user data.
+        msg:        The received message.
     """
     global logger
-    global steering
-    global throttle
-    logger.info('initializing control devices')
-    ControlDevice.initServoKit(ServoKit, chanCount=PWM_CHAN_CNT,
-                               frequency=PWM_FREQ)
-    steering = ControlDevice(appLogger, STEERING_TYPE,
-                             (STEERING_MIN, STEERING_NEUTRAL, STEERING_MAX))
-    throttle = ControlDevice(appLogger, THROTTLE_TYPE,
-                             (THROTTLE_MIN, THROTTLE_NEUTRAL, THROTTLE_MAX))
-    logger.info('control devices initialized')
+    logger.debug(f"received PWM message: {msg}")
+    try:
+        frequency = json.loads(msg).get('pwmFreq')
+        if not isinstance(frequency, int) or isinstance(frequency, bool) \
+                or frequency <= 0:
+            raise ValueError(f"invalid PWM frequency {frequency!r}")
+        ControlDevice.backend.setFrequency(frequency)
+        logger.info(f"PWM frequency set to {frequency}")
+    except (AttributeError, ValueError, OSError,
+            PwmBackendUnsupported) as e:
+        logger.error(f"unable to handle PWM message: {e}")
 
 
 def _initMqttClient(appLogger) -> None:
     """
-    Initialize the MQTT client.
+    Initialize the MQTT client shared by every unit. Each unit topic
+    has its own callback so routing a message does not depend on
+    the number of units.
     """
     global logger
-    subs = (UnitWhldCmdMsg(CLIENT_ID).getTopic())
+    global units
     logger.info('initialize the MQTT client')
     client.init(appLogger, CLIENT_ID, CLIENT_PASSWORD)
-    client.subscribe(subs)
-    client.registerMsgCallback(subs[0], _onCommandMsg)
+    for unit in units.values():
+        for subs, callback in unit.getSubscriptions():
+            client.subscribe(subs)
+            client.registerMsgCallback(subs[0], callback)
+    client.subscribe((PWM_TOPIC, PWM_QOS))
+    client.registerMsgCallback(PWM_TOPIC, _onPwmMsg)
+    client.subscribe((PROFILE_TOPIC, PROFILE_QOS))
+    client.registerMsgCallback(PROFILE_TOPIC, _onProfileMsg)
     logger.info('MQTT client initialized')
 
 
+def _initPublisher(appLogger) -> None:
+    """
+    Initialize the outbound publish queue.
+
+    Params:
+        appLogger:  The appLogger.
+    """
+    global logger
+    global publisher
+    global linkMonitor
+    logger.info('initializing publish queue')
+    linkMonitor = LinkMonitor(appLogger,
+                              targetLatency=TELEMETRY_TARGET_LATENCY,
+                              maxScale=TELEMETRY_MAX_SCALE)
+    publisher = PublishQueue(appLogger, client.publish,
+                             onComplete=linkMonitor.recordLatency)
+    publisher.start()
+
+
+def _initPowerMonitor(appLogger) -> None:
+    """
+    Initialize the power usage monitor.
+
+    Params:
+        appLogger:  The appLogger.
+    """
+    global logger
+    global powerMonitor
+    logger.info('initializing power monitor')
+    powerMonitor = PowerMonitor(appLogger)
+
+
 def _sendCxnState() -> None:
     """
-    Send the connection state message.
+    Send the connection state message of every unit. Only the latest
+    connection state of a unit waits in the queue.
     """
     global logger
-    cxnStateMsg = UnitCxnStateMsg(CLIENT_ID)
-    cxnStateMsg.setAsOnline()
-    client.publish(cxnStateMsg)
+    global units
+    global publisher
+    for unit in units.values():
+        publisher.put(unit.getCxnStateMsg(), PublishQueue.PRIORITY_CRITICAL,
+                      key=unit.getId())
 
 
-def _sendUnitState() -> None:
+def _sendUnitState(unit: Unit) -> None:
     """
-    Send the unit state.
+    Send the unit state. The unit records it once published.
+
+    Params:
+        unit:   The unit.
     """
     global logger
-    global steering
-    global throttle
-    unitStateMsg = UnitWhldStateMsg(CLIENT_ID)
-    unitStateMsg.setSteering(steering.getModifier())
-    unitStateMsg.setThrottle(throttle.getModifier())
+    global publisher
+    unitStateMsg = unit.getStateMsg()
     logger.debug(f"sending unit state: {unitStateMsg.getPayload()}")
-    client.publish(unitStateMsg)
+    publisher.put(unitStateMsg, PublishQueue.PRIORITY_TELEMETRY,
+                  onPublished=unit.onStatePublished)
+
+
+def _reportPublishStats() -> None:
+    """
+    Report the publish queue depth and shed counts, and the link
+    quality.
+    """
+    global logger
+    global publisher
+    global linkMonitor
+    stats = publisher.getStats()
+    logger.info(f"publish queue depth: {stats['depth']}, "
+                f"shed: {stats['shed']}, "
+                f"coalesced: {stats['coalesced']}, failed: {stats['failed']}, "
+                f"pending: {stats['pending']}, evicted: {stats['evicted']}, "
+                f"latency: {linkMonitor.getLatency()}, "
+                f"telemetry scale: {linkMonitor.getScale():.2f}")
+
+
+def _reportPowerStats() -> None:
+    """
+    Report the CPU time and wakeups per second of each mode.
+    """
+    global logger
+    global powerMonitor
+    for mode, stats in powerMonitor.getStats().items():
+        logger.info(f"{mode} mode: time: {stats['time']:.1f} s, "
+                    f"CPU time: {stats['cpuTime']:.3f} s, "
+                    f"CPU load: {stats['cpuLoad']}, "
+                    f"wakeups/s: {stats['wakeupRate']}")
 
 
 def init() -> None:
@@ -116,22 +442,57 @@ def init() -> None:
     appLogger = initLogger()
     logger = appLogger.getLogger('APP')
     _initControlDevices(appLogger)
+    _initUnits(appLogger)
+    _initProfiler(appLogger)
     _initMqttClient(appLogger)
     client.startLoop()
+    _initPublisher(appLogger)
+    _initPowerMonitor(appLogger)
     _sendCxnState()
 
 
 def run() -> None:
     """
-    Run the application.
+    Run the application. Every unit state is sent on its own period,
+    scaled to the link quality. The loop sleeps until the next state
+    deadline or until an idle unit wakes up, and is idle when every
+    unit is.
     """
     global logger
-    global steering
-    global throttle
+    global units
+    global publisher
+    global linkMonitor
+    global powerMonitor
+    global wakeup
     logger.info('starting RC control mission operator')
+    start = time.monotonic()
+    deadlines = dict.fromkeys(units, start)
+    idleUnits = dict.fromkeys(units, False)
+    statsDeadline = start + PUBLISH_STATS_PERIOD
     while True:
-        _sendUnitState()
-        time.sleep(STATE_UPDATE_PERIOD)
+        now = time.monotonic()
+        wakeup.clear()
+        for unitId, unit in units.items():
+            idle = unit.updateIdle(now)
+            if idleUnits[unitId] and not idle:
+                deadlines[unitId] = now
+            idleUnits[unitId] = idle
+        powerMonitor.recordWakeup(now, all(idleUnits.values()))
+        if now >= statsDeadline:
+            _reportPublishStats()
+            _reportPowerStats()
+            statsDeadline = now + PUBLISH_STATS_PERIOD
+        shed = publisher.getStats()['shed'][PublishQueue.PRIORITY_TELEMETRY]
+        scale = linkMonitor.update(now, shed, publisher.getPendingAge(now))
+        for unitId, unit in units.items():
+            if now >= deadlines[unitId]:
+                _sendUnitState(unit)
+                period = unit.getStatePeriod() * scale
+                deadline = deadlines[unitId] + period
+                if deadline < now:
+                    deadline = now + period
+                deadlines[unitId] = deadline
+        wakeup.wait(max(min(deadlines.values()) - time.monotonic(), 0))
 
 
 def stop():
@@ -139,11 +500,21 @@ def stop():
     Stop the application.
     """
     global logger
-    global steering
-    global throttle
+    global units
+    global publisher
+    global powerMonitor
+    global profiler
     logger.info('stopping RC control mission operator')
-    steering.setToNeutral()
-    throttle.setToNeutral()
+    if profiler is not None:
+        profiler.stop()
+    for unit in units.values():
+        unit.stop()
+    ControlDevice.backend.close()
+    if publisher is not None:
+        _reportPublishStats()
+        publisher.stop()
+    if powerMonitor is not None:
+        _reportPowerStats()
     client.disconnect()
 
 
@@ -0,0 +1,3 @@
+from .records import RECORD_DTYPE, loadRecords              # noqa: F401
+from .sessionAnalysis import analyzeSession, formatReport   # noqa: F401
+from .exceptions import RecordFileInvalid                   # noqa: F401
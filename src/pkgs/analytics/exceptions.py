@@ -0,0 +1,13 @@
+class RecordFileInvalid(Exception):
+    """
+    The invalid record file exception.
+    """
+    def __init__(self, path: str, reason: str) -> None:
+        """
+        Constructor.
+
+        Params:
+            path:       The record file path.
+            reason:     The reason the file is not valid.
+        """
+        super().__init__(f"record file {path} is not valid: {reason}.")
@@ -0,0 +1,42 @@
+import os
+import struct
+
+import numpy as np
+
+from pkgs.recorder import Recorder
+
+from .exceptions import RecordFileInvalid
+
+
+RECORD_DTYPE = np.dtype([('kind', '<u1'), ('flags', '<u1'), ('pad', 'V2'),
+                         ('seq', '<u4'), ('time0', '<f8'), ('time1', '<f8'),
+                         ('steering', '<f4'), ('throttle', '<f4')])
+HEADER_SIZE = struct.calcsize(Recorder.HEADER_FORMAT)
+
+
+def loadRecords(path: str) -> np.ndarray:
+    """
+    Load a record file without copying it. The records are memory
+    mapped read only and a truncated trailing record is ignored.
+
+    Params:
+        path:   The record file path.
+
+    Return:
+        The records as a structured array.
+    """
+    with open(path, 'rb') as recordFile:
+        header = recordFile.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE:
+        raise RecordFileInvalid(path, 'truncated header')
+    magic, version, recordSize = struct.unpack(Recorder.HEADER_FORMAT,
+                                               header)
+    if magic != Recorder.MAGIC:
+        raise RecordFileInvalid(path, 'bad magic')
+    if version != Recorder.VERSION or recordSize != RECORD_DTYPE.itemsize:
+        raise RecordFileInvalid(path, f"unsupported version {version}")
+    count = (os.path.getsize(path) - HEADER_SIZE) // RECORD_DTYPE.itemsize
+    if count == 0:
+        return np.empty(0, dtype=RECORD_DTYPE)
+    return np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=HEADER_SIZE,
+                     shape=(count,))
@@ -0,0 +1,159 @@
+import numpy as np
+
+from pkgs.recorder import Recorder
+
+
+DEFAULT_PERCENTILES = (50, 90, 99, 99.9)
+
+
+def _distribution(values: np.ndarray, percentiles: tuple) -> dict:
+    """
+    Summarize a distribution.
+
+    Params:
+        values:         The values.
+        percentiles:    The percentiles to compute.
+
+    Return:
+        The percentiles and the max of the values, None if empty.
+    """
+    if len(values) == 0:
+        return None
+    summary = dict(zip((f"p{percentile:g}" for percentile in percentiles),
+                       np.percentile(values, percentiles).tolist()))
+    summary['max'] = float(values.max())
+    return summary
+
+
+def _ratio(count: int, total: int) -> float:
+    """
+    Get a ratio.
+
+    Params:
+        count:  The counted items.
+        total:  The total items.
+
+    Return:
+        The ratio, None if there is no item.
+    """
+    return count / total if total else None
+
+
+def analyzeSession(records: np.ndarray,
+                   percentiles: tuple = DEFAULT_PERCENTILES) -> dict:
+    """
+    Analyze a recorded session. Every statistic is computed on whole
+    columns, without iterating over the records. The state lag of a
+    command runs from its receive time to the publication of the first
+    state queued after its write.
+
+    Params:
+        records:        The session records.
+        percentiles:    The percentiles to compute.
+                        Default: 50, 90, 99 and 99.9.
+
+    Return:
+        The session summary. The times are in seconds.
+    """
+    kinds = records['kind']
+    commands = records[kinds == Recorder.KIND_COMMAND]
+    states = records[kinds == Recorder.KIND_STATE]
+    drops = records[kinds == Recorder.KIND_DROP]
+    duration = 0.0
+    if len(records):
+        duration = float(records['time1'].max() - records['time0'].min())
+    received = commands['time0']
+    applied = commands['time1']
+    intervals = np.diff(received)
+    commandRate = None
+    interval = None
+    jitter = None
+    if len(intervals) and received[-1] > received[0]:
+        commandRate = len(intervals) / float(received[-1] - received[0])
+        interval = {'mean': float(intervals.mean()),
+                    'std': float(intervals.std())}
+        jitter = _distribution(np.abs(intervals - np.median(intervals)),
+                               percentiles)
+    states = states[np.argsort(states['time0'])]
+    nextStates = np.searchsorted(states['time0'], applied)
+    reported = nextStates < len(states)
+    stateLag = states['time1'][nextStates[reported]] - received[reported]
+    clamped = int(np.count_nonzero(commands['flags'] &
+                                   Recorder.FLAG_CLAMPED))
+    coalesced = int(np.count_nonzero(drops['flags'] &
+                                     Recorder.FLAG_COALESCED))
+    estop = int(np.count_nonzero(drops['flags'] & Recorder.FLAG_ESTOP))
+    return {'records': len(records), 'duration': duration,
+            'commands': len(commands), 'states': len(states),
+            'commandRate': commandRate, 'interval': interval,
+            'jitter': jitter,
+            'latency': _distribution(applied - received, percentiles),
+            'stateLag': _distribution(stateLag, percentiles),
+            'clamped': clamped,
+            'clampRatio': _ratio(clamped, len(commands)),
+            'dropped': {'coalesced': coalesced, 'estop': estop},
+            'dropRatio': _ratio(len(drops), len(commands) + len(drops))}
+
+
+def _formatDistribution(distribution: dict) -> str:
+    """
+    Format a time distribution in milliseconds.
+
+    Params:
+        distribution:   The time distribution.
+
+    Return:
+        The formatted distribution.
+    """
+    if distribution is None:
+        return 'n/a'
+    return ', '.join(f"{key} {value * 1000:.3f} ms"
+                     for key, value in distribution.items())
+
+
+def _formatRatio(ratio: float) -> str:
+    """
+    Format a ratio as a percentage.
+
+    Params:
+        ratio:  The ratio.
+
+    Return:
+        The formatted ratio.
+    """
+    return 'n/a' if ratio is None else f"{ratio * 100:.2f} %"
+
+
+def formatReport(name: str, summary: dict) -> str:
+    """
+    Format a session summary report.
+
+    Params:
+        name:       The session name.
+        summary:    The session summary.
+
+    Return:
+        The session report.
+    """
+    commandRate = summary['commandRate']
+    interval = summary['interval']
+    dropped = summary['dropped']
+    lines = [f"session {name}",
+             f"  duration:       {summary['duration']:.3f} s, "
+             f"{summary['records']} records",
+             f"  commands:       {summary['commands']}, rate "
+             + ('n/a' if commandRate is None else f"{commandRate:.2f} Hz"),
+             '  interval:       '
+             + ('n/a' if interval is None else
+                f"mean {interval['mean'] * 1000:.3f} ms, "
+                f"std {interval['std'] * 1000:.3f} ms"),
+             f"  jitter:         {_formatDistribution(summary['jitter'])}",
+             f"  latency:        {_formatDistribution(summary['latency'])}",
+             f"  state lag:      {_formatDistribution(summary['stateLag'])}",
+             f"  states:         {summary['states']}",
+             f"  clamped:        {summary['clamped']} "
+             f"({_formatRatio(summary['clampRatio'])})",
+             f"  dropped:        {dropped['coalesced']} coalesced, "
+             f"{dropped['estop']} e-stop "
+             f"({_formatRatio(summary['dropRatio'])})"]
+    return '\n'.join(lines)
@@ -1,5 +1,7 @@
+from .channelRegistry import ChannelRegistry  # noqa: F401
 from .controlDevice import ControlDevice    # noqa: F401
 from .exceptions import ContrelDevicePositionRange, \
+    ControlDeviceChannelUnavailable, \
     ControlDeviceMotionRangeInvalid, \
     ControlDeviceType, \
     ServoKitUninitialized                   # noqa: F401
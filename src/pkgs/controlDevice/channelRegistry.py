@@ -0,0 +1,80 @@
+import threading
+
+from .exceptions import ControlDeviceChannelUnavailable
+
+
+class ChannelRegistry:
+    """
+    Process-wide PWM channel ownership.
+
+    Every unit hosted by the process claims its channels before driving
+    them, so two units never write to the same channel. A claim is all
+    or nothing and is serialized with the other claims and releases.
+    """
+    def __init__(self, chanCount: int) -> None:
+        """
+        Constructor.
+
+        Params:
+            chanCount:  The number of available PWM channels.
+        """
+        self._chanCount = chanCount
+        self._lock = threading.Lock()
+        self._owners = {}
+
+    def getChannelCount(self) -> int:
+        """
+        Get the number of available PWM channels.
+
+        Return:
+            The number of channels.
+        """
+        return self._chanCount
+
+    def getOwner(self, channel: int) -> str:
+        """
+        Get the owner of a channel.
+
+        Params:
+            channel:    The channel.
+
+        Return:
+            The channel owner, None if the channel is free.
+        """
+        return self._owners.get(channel)
+
+    def claim(self, owner: str, channels: tuple) -> None:
+        """
+        Claim channels for an owner. Claiming a channel the owner
+        already has is allowed.
+
+        Params:
+            owner:      The channel owner.
+            channels:   The claimed channels.
+        """
+        with self._lock:
+            for channel in channels:
+                if not isinstance(channel, int) or channel < 0 or \
+                        channel >= self._chanCount:
+                    raise ControlDeviceChannelUnavailable(channel)
+                current = self._owners.get(channel, owner)
+                if current != owner:
+                    raise ControlDeviceChannelUnavailable(channel, current)
+            for channel in channels:
+                self._owners[channel] = owner
+
+    def release(self, owner: str, channels: tuple = None) -> None:
+        """
+        Release the channels of an owner.
+
+        Params:
+            owner:      The channel owner.
+            channels:   The released channels. Default: None, all the
+                        owner channels.
+        """
+        with self._lock:
+            if channels is None:
+                channels = tuple(self._owners)
+            for channel in channels:
+                if self._owners.get(channel) == owner:
+                    del self._owners[channel]
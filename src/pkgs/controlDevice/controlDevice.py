@@ -1,3 +1,6 @@
+from pkgs.pwmBackend import PwmBackend, ServoKitBackend
+
+from .channelRegistry import ChannelRegistry
 from .exceptions import ContrelDevicePositionRange, \
     ControlDeviceMotionRangeInvalid, \
     ControlDeviceType, \
@@ -23,26 +26,55 @@ class ControlDevice:
     CONNECTION_ERR_MSG = 'Unable to connected to PIGPIO service.'
     PWM_OP_FAILED_MSG = 'PWM operation failed, err: '
 
-    servos = None
+    backend = None
+    channels = None
+
+    @classmethod
+    def initBackend(cls, backend: PwmBackend) -> None:
+        """
+        Initialize the PWM backend and the ownership of its channels.
+
+        Params:
+            backend:    The PWM backend driving the devices.
+        """
+        cls.backend = backend
+        cls.channels = ChannelRegistry(backend.getChannelCount())
 
     @classmethod
     def initServoKit(cls, adafruitServoKit: object,
                      chanCount: int = SUPPORTED_CHAN_CNT[0],
                      frequency: int = DEFAULT_FREQ) -> None:
         """
-        Intialize the servo kit.
+        Intialize the servo kit backend.
 
         Params:
             chanCount:  The number of channel in the servo kit. Default 8.
             frequency:  The desired frequency.
         """
-        cls.servos = adafruitServoKit(channels=chanCount, frequency=frequency)
+        cls.initBackend(ServoKitBackend(adafruitServoKit,
+                                        chanCount=chanCount,
+                                        frequency=frequency))
+
+    @classmethod
+    def setAllToNeutral(cls, devices: tuple) -> None:
+        """
+        Set many devices to neutral with a single bulk backend write.
+
+        Params:
+            devices:    The devices, in writing order.
+        """
+        setups = tuple(device._setup for device in devices)
+        cls.backend.setAngles(tuple((channel, motionRange[1])
+                                    for channel, motionRange in setups))
+        for device in devices:
+            device._modifier = 0.0
 
     def __init__(self, logger: object,
                  servoType: str = TYPE_DIRECT,
                  motionRange: tuple = (MIN_ROTATION,
                                        DEFAULT_CENTER,
-                                       MAX_ROTATION)):
+                                       MAX_ROTATION),
+                 channel: int = None, saturate: bool = False):
         """
         Constructor.
 
@@ -50,9 +82,13 @@ class ControlDevice:
             servoType:      The type of device (servo or ESC). Default servo.
             motionRange:    The motion range of the device.
                             Default: (0, 90, 180).
+            channel:        The PWM channel of the device.
+                            Default: the channel of the device type.
+            saturate:       Saturate the out of range modifiers instead of
+                            raising. Default: False.
         """
         self._logger = logger.getLogger(f"{servoType.upper()}")
-        if self.servos is None:
+        if self.backend is None:
             raise ServoKitUninitialized()
         if servoType != self.TYPE_DIRECT and servoType != self.TYPE_ESC:
             raise ControlDeviceType(servoType)
@@ -60,11 +96,16 @@ class ControlDevice:
         self._validateMotionRange(motionRange)
         self._logger.info(f"creating device with motion range: {motionRange}")
         self._type = servoType
-        self._min, self._center, self._max = motionRange
+        if channel is None:
+            channel = self.CHANNELS[self._type]
+        self._setup = (channel, tuple(motionRange))
         self._modifier = 0.0
-        self.servos[self.CHANNELS[self._type]].angle = self._center
+        self._saturate = saturate
+        self._clampCount = 0
+        self.backend.setAngle(channel, motionRange[1])
 
-    def _validateMotionRange(self, motionRange: tuple) -> None:
+    @classmethod
+    def _validateMotionRange(cls, motionRange: tuple) -> None:
         """
         Validate the motion range.
 
@@ -72,22 +113,24 @@ class ControlDevice:
             motionRange:    The motion range to validate.
         """
         minPos, center, maxPos = motionRange
-        if minPos < self.MIN_ROTATION or minPos >= maxPos:
+        if minPos < cls.MIN_ROTATION or minPos >= maxPos:
             raise ControlDeviceMotionRangeInvalid('min', motionRange)
-        if maxPos > self.MAX_ROTATION or maxPos <= minPos:
+        if maxPos > cls.MAX_ROTATION or maxPos <= minPos:
             raise ControlDeviceMotionRangeInvalid('max', motionRange)
         if center <= minPos or center >= maxPos:
             raise ControlDeviceMotionRangeInvalid('center', motionRange)
 
-    def _validatePosition(self, position: int) -> None:
+    def _validatePosition(self, position: int, motionRange: tuple) -> None:
         """
         Check if a position is valid. min >= position >= max.
 
         Params:
-            position:   The position to validate.
+            position:       The position to validate.
+            motionRange:    The motion range to validate against.
         """
-        if position < self._min or position > self._max:
-            raise ContrelDevicePositionRange(position, self._min, self._max)
+        minPos, _, maxPos = motionRange
+        if position < minPos or position > maxPos:
+            raise ContrelDevicePositionRange(position, minPos, maxPos)
 
     def setMotionRange(self, motionRange: tuple) -> None:
         """
@@ -98,7 +141,7 @@ class ControlDevice:
         """
         self._validateMotionRange(motionRange)
         self._logger.debug(f"updating motion range to: {motionRange}")
-        self._min, self._center, self._max = motionRange
+        self._setup = (self._setup[0], tuple(motionRange))
 
     def getMotionRange(self) -> tuple:
         """
@@ -107,7 +150,55 @@ class ControlDevice:
         Return:
             The current motion range.
         """
-        return (self._min, self._center, self._max)
+        return self._setup[1]
+
+    def getType(self) -> str:
+        """
+        Get the device type.
+
+        Return:
+            The device type.
+        """
+        return self._type
+
+    def getChannel(self) -> int:
+        """
+        Get the device PWM channel.
+
+        Return:
+            The device PWM channel.
+        """
+        return self._setup[0]
+
+    def setSetup(self, setup: tuple) -> None:
+        """
+        Set the device channel and motion range at once. The setup is
+        swapped as a single reference so a concurrent position update
+        never sees a channel and a range from different setups. When
+        the channel changes, the previous channel is set to neutral and
+        the new one centered.
+
+        Params:
+            setup:  The (channel, motion range) pair.
+        """
+        channel, motionRange = setup
+        self._validateMotionRange(motionRange)
+        self._logger.debug(f"updating setup to: {setup}")
+        previous = self._setup
+        self._setup = (channel, tuple(motionRange))
+        if channel != previous[0]:
+            self.backend.setAngles(((previous[0], previous[1][1]),
+                                    (channel, motionRange[1])))
+            self._modifier = 0.0
+
+    def getSetup(self) -> tuple:
+        """
+        Get the device setup.
+
+        Return:
+            The (channel, motion range) pair.
+        """
+        return self._setup
 
     def getModifier(self) -> float:
         """
@@ -118,23 +209,53 @@ class ControlDevice:
         """
         return self._modifier
 
-    def modifyPosition(self, modifier: float) -> None:
+    def getClampCount(self) -> int:
+        """
+        Get the number of modifiers saturated since the device creation.
+
+        Return:
+            The clamp event count.
         """
-        Set a new position.
+        return self._clampCount
+
+    def modifyPosition(self, modifier: float, setup: tuple = None) -> None:
+        """
+        Set a new position. In saturating mode, the modifier is clamped
+        to [-1.0, 1.0] and counted as a clamp event instead of raising.
 
         Params:
-            modifier:    The position modifier.
+            modifier:   The position modifier.
+            setup:      The (channel, motion range) pair to use, a
+                        snapshot of the device setup. A channel the
+                        device is no longer on is set back to neutral.
+                        Default: the device setup.
         """
-        workingRange = None
+        channel, motionRange = setup or self._setup
+        minPos, center, maxPos = motionRange
+        if self._saturate:
+            if modifier > 1.0:
+                modifier = 1.0
+                self._clampCount += 1
+            elif modifier < -1.0:
+                modifier = -1.0
+                self._clampCount += 1
+            elif modifier != modifier:
+                modifier = 0.0
+                self._clampCount += 1
         if modifier < 0:
-            workingRange = self._center - self._min
-        if modifier > 0:
-            workingRange = self._max - self._center
-        newPos = int(self._center + (workingRange * modifier))
-        self._validatePosition(newPos)
+            newPos = int(center + ((center - minPos) * modifier))
+        elif modifier > 0:
+            newPos = int(center + ((maxPos - center) * modifier))
+        else:
+            newPos = center
+        if not self._saturate:
+            self._validatePosition(newPos, motionRange)
         self._modifier = modifier
         self._logger.debug(f"updatingposition to: {newPos}")
-        self.servos[self.CHANNELS[self._type]].angle = newPos
+        self.backend.setAngle(channel, newPos)
+        if self._setup[0] != channel:
+            # The device moved off this channel during the write.
+            self.backend.setAngle(channel, center)
 
     def getPosition(self) -> int:
         """
@@ -143,10 +264,11 @@ class ControlDevice:
         Return
             The current position.
         """
-        return self.servos[self.CHANNELS[self._type]].angle
+        return self.backend.getAngle(self._setup[0])
 
     def setToNeutral(self) -> None:
         """
         Set to neutral position (center).
         """
-        self.servos[self.CHANNELS[self._type]].angle = self._center
+        channel, motionRange = self._setup
+        self.backend.setAngle(channel, motionRange[1])
@@ -54,3 +54,20 @@ class ContrelDevicePositionRange(Exception):
         """
         super().__init__(f"position {pos} is not included "
                          f"between {min} and {max}")
+
+
+class ControlDeviceChannelUnavailable(Exception):
+    """
+    The unavailable PWM channel exception.
+    """
+    def __init__(self, channel: int, owner: str = None):
+        """
+        Constructor.
+
+        Params:
+            channel:    The unavailable channel.
+            owner:      The channel owner. Default: None, the channel
+                        does not exist.
+        """
+        reason = 'does not exist' if owner is None else f"is used by {owner}"
+        super().__init__(f"channel {channel} {reason}.")
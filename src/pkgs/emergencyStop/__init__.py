@@ -0,0 +1 @@
+from .emergencyStop import EmergencyStop    # noqa: F401
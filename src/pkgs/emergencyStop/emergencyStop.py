@@ -0,0 +1,80 @@
+import time
+
+from pkgs.controlDevice import ControlDevice
+from pkgs.latencyStats import LatencyStats
+
+
+class EmergencyStop:
+    """
+    Latching emergency stop.
+
+    Triggering the stop drives every device to neutral, in the given
+    order, with a single bulk PWM write and latches the stopped state
+    until it is explicitly re-armed.
+    """
+    def __init__(self, logger: object, devices: tuple) -> None:
+        """
+        Constructor.
+
+        Params:
+            logger:     The app logger.
+            devices:    The devices to stop, in stopping order.
+        """
+        self._logger = logger.getLogger('ESTOP')
+        self._devices = tuple(devices)
+        self._latched = False
+        self._latency = LatencyStats()
+
+    def isLatched(self) -> bool:
+        """
+        Check if the stop is latched. Never blocks.
+
+        Return:
+            True if the stop is latched, False otherwise.
+        """
+        return self._latched
+
+    def trigger(self, receivedTime: float = None) -> None:
+        """
+        Latch the stop and drive the devices to neutral. A backend
+        failure is logged and the stop stays latched.
+
+        Params:
+            receivedTime:   The monotonic time the stop was received.
+                            Default: now.
+        """
+        if receivedTime is None:
+            receivedTime = time.monotonic()
+        self._latched = True
+        try:
+            ControlDevice.setAllToNeutral(self._devices)
+        except Exception as e:
+            # The stop stays latched, enforce retries on the next write.
+            self._logger.error(f"unable to stop the devices: {e}")
+            return
+        self._latency.record(time.monotonic() - receivedTime)
+        self._logger.warning('emergency stop latched')
+
+    def enforce(self) -> None:
+        """
+        Drive the devices back to neutral if the stop is latched.
+        """
+        if self._latched:
+            ControlDevice.setAllToNeutral(self._devices)
+
+    def rearm(self) -> None:
+        """
+        Release the latched stop.
+        """
+        if self._latched:
+            self._latched = False
+            self._logger.warning('emergency stop re-armed')
+
+    def getLatencyStats(self) -> dict:
+        """
+        Get the stop to PWM latency statistics.
+
+        Return:
+            The latency statistics.
+        """
+        return self._latency.getStats()
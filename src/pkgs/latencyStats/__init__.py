@@ -0,0 +1 @@
+from .latencyStats import LatencyStats      # noqa: F401
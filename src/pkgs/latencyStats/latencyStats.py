@@ -0,0 +1,39 @@
+class LatencyStats:
+    """
+    Latency statistics accumulator.
+
+    Each instance is meant to be updated by a single thread.
+    """
+    def __init__(self) -> None:
+        """
+        Constructor.
+        """
+        self._count = 0
+        self._total = 0.0
+        self._max = 0.0
+        self._last = None
+
+    def record(self, latency: float) -> None:
+        """
+        Record a latency.
+
+        Params:
+            latency:    The latency in seconds.
+        """
+        self._count += 1
+        self._total += latency
+        self._last = latency
+        if latency > self._max:
+            self._max = latency
+
+    def getStats(self) -> dict:
+        """
+        Get the latency statistics.
+
+        Return:
+            The count, mean, max and last latency in seconds.
+        """
+        mean = self._total / self._count if self._count else None
+        return {'count': self._count, 'mean': mean,
+                'max': self._max if self._count else None,
+                'last': self._last}
@@ -0,0 +1 @@
+from .linkMonitor import LinkMonitor        # noqa: F401
@@ -0,0 +1,116 @@
+class LinkMonitor:
+    """
+    Link quality monitor and telemetry rate controller.
+
+    The publish completion latencies (queueing plus broker acknowledge
+    when available) are averaged and compared against a target, as is
+    the age of the oldest publication still waiting for its acknowledge
+    since a stalled link completes none. The
+    telemetry period scale backs off multiplicatively when the link
+    degrades or telemetry is shed, and recovers gradually when the link
+    is healthy again.
+    """
+    DEFAULT_TARGET_LATENCY = 0.05
+    DEFAULT_MAX_SCALE = 20.0
+    DEFAULT_ADJUST_PERIOD = 0.5
+    LATENCY_ALPHA = 0.2
+    BACKOFF_FACTOR = 2.0
+    RECOVERY_FACTOR = 0.8
+
+    def __init__(self, logger: object,
+                 targetLatency: float = DEFAULT_TARGET_LATENCY,
+                 maxScale: float = DEFAULT_MAX_SCALE,
+                 adjustPeriod: float = DEFAULT_ADJUST_PERIOD) -> None:
+        """
+        Constructor.
+
+        Params:
+            logger:         The app logger.
+            targetLatency:  The highest healthy publish latency in seconds.
+                            Default: 0.05.
+            maxScale:       The largest telemetry period scale.
+                            Default: 20.
+            adjustPeriod:   The minimal time between two adjustments in
+                            seconds. Default: 0.5.
+        """
+        self._logger = logger.getLogger('LINK_MONITOR')
+        self._targetLatency = targetLatency
+        self._maxScale = maxScale
+        self._adjustPeriod = adjustPeriod
+        self._latency = None
+        self._samples = 0
+        self._scale = 1.0
+        self._lastShed = 0
+        self._lastSamples = 0
+        self._nextAdjust = None
+
+    def recordLatency(self, latency: float) -> None:
+        """
+        Record a publish completion latency.
+
+        Params:
+            latency:    The publish completion latency in seconds.
+        """
+        if self._latency is None:
+            self._latency = latency
+        else:
+            self._latency += self.LATENCY_ALPHA * (latency - self._latency)
+        self._samples += 1
+
+    def getLatency(self) -> float:
+        """
+        Get the averaged publish completion latency.
+
+        Return:
+            The averaged latency in seconds, None without samples.
+        """
+        return self._latency
+
+    def getScale(self) -> float:
+        """
+        Get the telemetry period scale.
+
+        Return:
+            The telemetry period scale, 1.0 on a healthy link.
+        """
+        return self._scale
+
+    def update(self, now: float, shedCount: int,
+               pendingAge: float = None) -> float:
+        """
+        Adjust the telemetry period scale to the link quality.
+
+        Params:
+            now:        The current monotonic time.
+            shedCount:  The total number of shed telemetry messages.
+            pendingAge: The age of the oldest publication waiting for its
+                        acknowledge. Default: None, none is pending.
+
+        Return:
+            The telemetry period scale.
+        """
+        if self._nextAdjust is None:
+            self._nextAdjust = now + self._adjustPeriod
+            self._lastShed = shedCount
+        if now < self._nextAdjust:
+            return self._scale
+        self._nextAdjust = now + self._adjustPeriod
+        shed = shedCount > self._lastShed
+        self._lastShed = shedCount
+        samples = self._samples
+        newSamples = samples > self._lastSamples
+        self._lastSamples = samples
+        latency = self._latency
+        if pendingAge is not None and (latency is None or
+                                       pendingAge > latency):
+            latency = pendingAge
+        scale = self._scale
+        if shed or (latency is not None and latency > self._targetLatency):
+            scale = min(scale * self.BACKOFF_FACTOR, self._maxScale)
+        elif newSamples:
+            scale = max(scale * self.RECOVERY_FACTOR, 1.0)
+        if scale != self._scale:
+            self._logger.debug(f"telemetry period scale: {scale:.2f} "
+                               f"(latency: {latency}, shed: {shed})")
+            self._scale = scale
+        return scale
@@ -0,0 +1,4 @@
+from .mission import Mission                        # noqa: F401
+from .missionRunner import MissionRunner            # noqa: F401
+from .exceptions import MissionInvalid, \
+    MissionNotLoaded                                # noqa: F401
@@ -0,0 +1,23 @@
+class MissionInvalid(Exception):
+    """
+    The invalid mission exception.
+    """
+    def __init__(self, reason: str) -> None:
+        """
+        Constructor.
+
+        Params:
+            reason:     The reason why the mission is invalid.
+        """
+        super().__init__(f"mission is not valid: {reason}.")
+
+
+class MissionNotLoaded(Exception):
+    """
+    The mission not loaded exception.
+    """
+    def __init__(self) -> None:
+        """
+        Constructor.
+        """
+        super().__init__('no mission is loaded.')
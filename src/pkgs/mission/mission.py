@@ -0,0 +1,131 @@
+from .exceptions import MissionInvalid
+
+
+class Mission:
+    """
+    Timed steering/throttle trajectory.
+
+    The mission is described by keyframes [time, steering, throttle]
+    and an execution rate. The setpoints between keyframes are linearly
+    interpolated, so a waypoint reached at a given rate is a keyframe
+    pair. Every setpoint is computed once when the mission is created.
+    """
+    MIN_MODIFIER = -1.0
+    MAX_MODIFIER = 1.0
+    MAX_RATE = 200
+    MAX_SETPOINTS = 120000
+
+    def __init__(self, description: dict) -> None:
+        """
+        Constructor.
+
+        Params:
+            description:    The mission description:
+                            {'rate': Hz, 'points': [[t, steering,
+                            throttle], ...]}.
+        """
+        try:
+            rate = description['rate']
+            points = [tuple(float(value) for value in point)
+                      for point in description['points']]
+        except (KeyError, TypeError, ValueError):
+            raise MissionInvalid('rate and points are required')
+        self._validate(rate, points)
+        self._rate = rate
+        self._period = 1.0 / rate
+        self._setpoints = self._interpolate(points)
+
+    def _validate(self, rate: float, points: list) -> None:
+        """
+        Validate the mission rate and keyframes.
+
+        Params:
+            rate:       The mission rate.
+            points:     The mission keyframes.
+        """
+        if not isinstance(rate, (int, float)) or isinstance(rate, bool) or \
+                not 0 < rate <= self.MAX_RATE:
+            raise MissionInvalid(f"rate {rate} is out of range")
+        if len(points) < 2:
+            raise MissionInvalid('at least 2 points are required')
+        previousTime = None
+        for point in points:
+            if len(point) != 3:
+                raise MissionInvalid(f"point {point} is malformed")
+            pointTime, steering, throttle = point
+            if previousTime is None and pointTime != 0:
+                raise MissionInvalid('first point must be at time 0')
+            if previousTime is not None and pointTime <= previousTime:
+                raise MissionInvalid(f"point {point} is not in order")
+            for modifier in (steering, throttle):
+                if not self.MIN_MODIFIER <= modifier <= self.MAX_MODIFIER:
+                    raise MissionInvalid(f"point {point} is out of range")
+            previousTime = pointTime
+        if previousTime * rate >= self.MAX_SETPOINTS:
+            raise MissionInvalid('mission is too long')
+
+    def _interpolate(self, points: list) -> tuple:
+        """
+        Compute the setpoints at the mission rate.
+
+        Params:
+            points:     The mission keyframes.
+
+        Return:
+            The (steering, throttle) setpoints.
+        """
+        setpoints = []
+        count = int(points[-1][0] * self._rate + 1e-9) + 1
+        segment = 0
+        for index in range(count):
+            setpointTime = index * self._period
+            while segment < len(points) - 2 and \
+                    setpointTime >= points[segment + 1][0]:
+                segment += 1
+            startTime, startSteering, startThrottle = points[segment]
+            endTime, endSteering, endThrottle = points[segment + 1]
+            ratio = min((setpointTime - startTime) / (endTime - startTime),
+                        1.0)
+            setpoints.append(
+                (startSteering + (endSteering - startSteering) * ratio,
+                 startThrottle + (endThrottle - startThrottle) * ratio))
+        return tuple(setpoints)
+
+    def __len__(self) -> int:
+        """
+        Get the number of setpoints.
+
+        Return:
+            The number of setpoints.
+        """
+        return len(self._setpoints)
+
+    def getRate(self) -> float:
+        """
+        Get the mission rate.
+
+        Return:
+            The mission rate in Hz.
+        """
+        return self._rate
+
+    def getPeriod(self) -> float:
+        """
+        Get the setpoint period.
+
+        Return:
+            The setpoint period in seconds.
+        """
+        return self._period
+
+    def getSetpoint(self, index: int) -> tuple:
+        """
+        Get a setpoint.
+
+        Params:
+            index:  The setpoint index.
+
+        Return:
+            The (steering, throttle) setpoint.
+        """
+        return self._setpoints[index]
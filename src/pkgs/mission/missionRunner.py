@@ -0,0 +1,175 @@
+import threading
+import time
+
+from .exceptions import MissionNotLoaded
+from .mission import Mission
+
+
+class MissionRunner(threading.Thread):
+    """
+    Onboard mission runner.
+
+    Executes the loaded mission setpoints at the mission rate using
+    absolute deadlines, so the execution does not drift and does not
+    depend on the network. The setpoints are applied under the runner
+    lock: once override, pause or abort returns, no mission setpoint
+    is applied anymore.
+    """
+    STATE_IDLE = 'idle'
+    STATE_RUNNING = 'running'
+    STATE_PAUSED = 'paused'
+
+    def __init__(self, logger: object, actuate: callable) -> None:
+        """
+        Constructor.
+
+        Params:
+            logger:     The app logger.
+            actuate:    The setpoint callback: actuate(steering, throttle).
+        """
+        super().__init__(name='mission-runner', daemon=True)
+        self._logger = logger.getLogger('MISSION')
+        self._actuate = actuate
+        self._cond = threading.Condition()
+        self._mission = None
+        self._state = self.STATE_IDLE
+        self._index = 0
+        self._startTime = 0.0
+        self._stopped = False
+
+    def getState(self) -> str:
+        """
+        Get the runner state.
+
+        Return:
+            The runner state.
+        """
+        return self._state
+
+    def isActive(self) -> bool:
+        """
+        Check if a mission is running or paused. Never blocks.
+
+        Return:
+            True if a mission is running or paused, False otherwise.
+        """
+        return self._state != self.STATE_IDLE
+
+    def load(self, mission: Mission) -> None:
+        """
+        Load a mission. The active mission, if any, is aborted.
+
+        Params:
+            mission:    The mission to load.
+        """
+        with self._cond:
+            self._mission = mission
+            self._state = self.STATE_IDLE
+            self._index = 0
+            self._cond.notify()
+        self._logger.info(f"mission loaded: {len(mission)} setpoints "
+                          f"at {mission.getRate()} Hz")
+
+    def begin(self) -> None:
+        """
+        Start the loaded mission from its first setpoint.
+        """
+        with self._cond:
+            if self._mission is None:
+                raise MissionNotLoaded()
+            self._index = 0
+            self._startTime = time.monotonic()
+            self._state = self.STATE_RUNNING
+            self._cond.notify()
+        self._logger.info('mission started')
+
+    def pause(self) -> None:
+        """
+        Pause the running mission on its current setpoint.
+        """
+        with self._cond:
+            if self._state == self.STATE_RUNNING:
+                self._state = self.STATE_PAUSED
+                self._cond.notify()
+                self._logger.info(f"mission paused at setpoint {self._index}")
+
+    def resume(self) -> None:
+        """
+        Resume the paused mission.
+        """
+        with self._cond:
+            if self._state == self.STATE_PAUSED:
+                self._startTime = time.monotonic() - \
+                    self._index * self._mission.getPeriod()
+                self._state = self.STATE_RUNNING
+                self._cond.notify()
+                self._logger.info('mission resumed')
+
+    def abort(self) -> None:
+        """
+        Abort the active mission.
+        """
+        with self._cond:
+            if self._state != self.STATE_IDLE:
+                self._state = self.STATE_IDLE
+                self._index = 0
+                self._cond.notify()
+                self._logger.info('mission aborted')
+
+    def override(self) -> None:
+        """
+        Give the control back to the live commands by aborting
+        the active mission.
+        """
+        if self.isActive():
+            self._logger.warning('mission overridden by live command')
+            self.abort()
+
+    def stop(self) -> None:
+        """
+        Stop the runner thread.
+        """
+        with self._cond:
+            self._stopped = True
+            self._state = self.STATE_IDLE
+            self._cond.notify()
+
+    def _step(self) -> None:
+        """
+        Apply the next setpoint of the running mission and wait for
+        the following setpoint deadline. A failing setpoint aborts the
+        mission.
+        """
+        mission = self._mission
+        if self._index >= len(mission):
+            self._state = self.STATE_IDLE
+            self._index = 0
+            self._logger.info('mission completed')
+            return
+        steering, throttle = mission.getSetpoint(self._index)
+        try:
+            self._actuate(steering, throttle)
+        except Exception as e:
+            self._state = self.STATE_IDLE
+            self._index = 0
+            self._logger.error(f"mission aborted, unable to actuate "
+                               f"setpoint: {e}")
+            return
+        self._index += 1
+        deadline = self._startTime + self._index * mission.getPeriod()
+        while self._state == self.STATE_RUNNING and not self._stopped:
+            delay = deadline - time.monotonic()
+            if delay <= 0:
+                break
+            self._cond.wait(delay)
+
+    def run(self) -> None:
+        """
+        Run the missions until the runner is stopped.
+        """
+        with self._cond:
+            while not self._stopped:
+                if self._state == self.STATE_RUNNING:
+                    self._step()
+                else:
+                    self._cond.wait()
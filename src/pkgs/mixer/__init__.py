@@ -0,0 +1,2 @@
+from .mixer import Mixer                    # noqa: F401
+from .exceptions import MixerInvalid        # noqa: F401
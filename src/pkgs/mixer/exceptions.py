@@ -0,0 +1,12 @@
+class MixerInvalid(Exception):
+    """
+    The invalid mixer exception.
+    """
+    def __init__(self, reason: str) -> None:
+        """
+        Constructor.
+
+        Params:
+            reason:     The reason why the mixer is invalid.
+        """
+        super().__init__(f"mixer is not valid: {reason}.")
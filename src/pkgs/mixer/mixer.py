@@ -0,0 +1,230 @@
+import numpy as np
+
+from pkgs.controlDevice import ControlDevice, \
+    ControlDeviceChannelUnavailable, ControlDeviceMotionRangeInvalid, \
+    ControlDeviceType
+
+from .exceptions import MixerInvalid
+
+
+class Mixer:
+    """
+    Command axes to output channels mixer.
+
+    Each output is a row of the mixing matrix applied to the steering
+    and throttle axes, shaped by its expo curve, shifted by its trim
+    and bounded by its limit. Every stage is a whole array operation,
+    as is the mapping of the output modifiers to the device positions,
+    so the cost of a command does not grow with the number of outputs.
+    The positions are written with a single bulk backend write.
+    """
+    AXES = ('steering', 'throttle')
+
+    def __init__(self, logger: object, devices: tuple, matrix: list,
+                 trims: list = None, expos: list = None,
+                 limits: list = None) -> None:
+        """
+        Constructor.
+
+        Params:
+            logger:     The app logger.
+            devices:    The output devices.
+            matrix:     The (steering, throttle) weights of each output.
+            trims:      The output trims in [-1.0, 1.0]. Default: 0.
+            expos:      The output expo factors in [0.0, 1.0]. Default: 0.
+            limits:     The output limits in ]0.0, 1.0]. Default: 1.
+        """
+        self._logger = logger.getLogger('MIXER')
+        count = len(devices)
+        if count == 0:
+            raise MixerInvalid('no output')
+        self._matrix = self._toArray('matrix', matrix, (count, 2))
+        trims = self._toArray('trims', trims, (count,), 0.0)
+        expos = self._toArray('expos', expos, (count,), 0.0)
+        limits = self._toArray('limits', limits, (count,), 1.0)
+        if np.any(np.abs(trims) > 1.0):
+            raise MixerInvalid(f"trims {trims.tolist()}")
+        if np.any((expos < 0.0) | (expos > 1.0)):
+            raise MixerInvalid(f"expos {expos.tolist()}")
+        if np.any((limits <= 0.0) | (limits > 1.0)):
+            raise MixerInvalid(f"limits {limits.tolist()}")
+        self._devices = tuple(devices)
+        self._channels = tuple(device.getChannel() for device in devices)
+        if len(set(self._channels)) != count:
+            raise MixerInvalid(f"channels {self._channels}")
+        ranges = np.array([device.getMotionRange() for device in devices],
+                          dtype=float)
+        self._center = ranges[:, 1]
+        self._lowSpan = ranges[:, 1] - ranges[:, 0]
+        self._highSpan = ranges[:, 2] - ranges[:, 1]
+        self._trims = trims
+        self._cubic = expos
+        self._linear = 1.0 - expos
+        self._lowLimits = -limits
+        self._highLimits = limits
+        self._stopOrder = tuple(sorted(
+            self._devices,
+            key=lambda device: device.getType() != ControlDevice.TYPE_ESC))
+        self._axes = (0.0, 0.0)
+        self._outputs = np.zeros(count)
+        self._clampCount = 0
+        self._logger.info(f"mixing {count} outputs on channels "
+                          f"{self._channels}")
+
+    @staticmethod
+    def _toArray(key: str, values: list, shape: tuple,
+                 default: float = None) -> np.ndarray:
+        """
+        Convert the mixer parameters to a finite array.
+
+        Params:
+            key:        The parameters name.
+            values:     The parameters, None for the default.
+            shape:      The expected shape.
+            default:    The default value. Default: None, required.
+
+        Return:
+            The parameters array.
+        """
+        if values is None and default is not None:
+            return np.full(shape, default)
+        try:
+            array = np.array(values, dtype=float)
+        except (TypeError, ValueError):
+            raise MixerInvalid(f"{key} {values}")
+        if array.shape != shape or not np.all(np.isfinite(array)):
+            raise MixerInvalid(f"{key} {values}")
+        return array
+
+    @classmethod
+    def fromConfig(cls, logger: object, config: dict,
+                   owner: str) -> 'Mixer':
+        """
+        Create a mixer and its output devices from a configuration:
+        {'outputs': [{'channel', 'type', 'range', 'mix', 'trim', 'expo',
+        'limit'}, ...]} where mix is the (steering, throttle) weights
+        pair and type, range, trim, expo and limit are optional. The
+        output channels are claimed for the owner before any device is
+        created, and released if the mixer is not valid.
+
+        Params:
+            logger:     The app logger.
+            config:     The mixer configuration.
+            owner:      The owner of the output channels.
+
+        Return:
+            The mixer.
+        """
+        try:
+            outputs = config['outputs']
+            channels = tuple(output['channel'] for output in outputs)
+            ControlDevice.channels.claim(owner, channels)
+        except (AttributeError, KeyError, TypeError,
+                ControlDeviceChannelUnavailable) as e:
+            raise MixerInvalid(f"configuration {config}: {e}")
+        try:
+            devices = [ControlDevice(
+                logger, output.get('type', ControlDevice.TYPE_ESC),
+                output.get('range', (ControlDevice.MIN_ROTATION,
+                                     ControlDevice.DEFAULT_CENTER,
+                                     ControlDevice.MAX_ROTATION)),
+                channel=channel, saturate=True)
+                for channel, output in zip(channels, outputs)]
+            return cls(logger, devices,
+                       [output['mix'] for output in outputs],
+                       trims=[output.get('trim', 0.0) for output in outputs],
+                       expos=[output.get('expo', 0.0) for output in outputs],
+                       limits=[output.get('limit', 1.0)
+                               for output in outputs])
+        except MixerInvalid:
+            ControlDevice.channels.release(owner, channels)
+            raise
+        except (AttributeError, KeyError, TypeError, ValueError,
+                ControlDeviceMotionRangeInvalid, ControlDeviceType) as e:
+            ControlDevice.channels.release(owner, channels)
+            raise MixerInvalid(f"configuration {config}: {e}")
+
+    def getDevices(self) -> tuple:
+        """
+        Get the output devices in stopping order, the ESCs first.
+
+        Return:
+            The output devices.
+        """
+        return self._stopOrder
+
+    def getAxes(self) -> tuple:
+        """
+        Get the last mixed command axes.
+
+        Return:
+            The (steering, throttle) modifiers.
+        """
+        return self._axes
+
+    def getOutputs(self) -> np.ndarray:
+        """
+        Get the last output modifiers.
+
+        Return:
+            The output modifiers, in configuration order.
+        """
+        return self._outputs
+
+    def getClampCount(self) -> int:
+        """
+        Get the number of command axes saturated since the mixer creation.
+
+        Return:
+            The clamp event count.
+        """
+        return self._clampCount
+
+    def mix(self, steeringMod: float, throttleMod: float) -> np.ndarray:
+        """
+        Mix the command axes. The axes are saturated to [-1.0, 1.0], a
+        NaN axis being neutral.
+
+        Params:
+            steeringMod:    The steering modifier.
+            throttleMod:    The throttle modifier.
+
+        Return:
+            The output modifiers.
+        """
+        if not (-1.0 <= steeringMod <= 1.0 and -1.0 <= throttleMod <= 1.0):
+            self._clampCount += 1
+        axes = np.clip(np.nan_to_num((steeringMod, throttleMod)), -1.0, 1.0)
+        outputs = self._matrix @ axes
+        np.clip(outputs, -1.0, 1.0, out=outputs)
+        outputs = self._linear * outputs + self._cubic * outputs ** 3
+        outputs += self._trims
+        np.clip(outputs, self._lowLimits, self._highLimits, out=outputs)
+        self._axes = (float(axes[0]), float(axes[1]))
+        self._outputs = outputs
+        return outputs
+
+    def getPositions(self, outputs: np.ndarray) -> np.ndarray:
+        """
+        Map output modifiers to the device positions.
+
+        Params:
+            outputs:    The output modifiers.
+
+        Return:
+            The device positions.
+        """
+        spans = np.where(outputs < 0.0, self._lowSpan, self._highSpan)
+        return (self._center + spans * outputs).astype(int)
+
+    def apply(self, steeringMod: float, throttleMod: float) -> None:
+        """
+        Mix the command axes and write every output position at once.
+
+        Params:
+            steeringMod:    The steering modifier.
+            throttleMod:    The throttle modifier.
+        """
+        positions = self.getPositions(self.mix(steeringMod, throttleMod))
+        ControlDevice.backend.setAngles(tuple(zip(self._channels,
+                                                  positions.tolist())))
@@ -0,0 +1 @@
+from .powerMonitor import PowerMonitor      # noqa: F401
@@ -0,0 +1,72 @@
+import time
+
+
+class PowerMonitor:
+    """
+    Operator power usage monitor.
+
+    The main loop records each of its wakeups with the current mode.
+    The wall time, process CPU time and wakeups elapsed since the
+    previous wakeup are accounted to the mode the loop was sleeping in.
+    """
+    MODE_ACTIVE = 'active'
+    MODE_IDLE = 'idle'
+
+    def __init__(self, logger: object) -> None:
+        """
+        Constructor.
+
+        Params:
+            logger:     The app logger.
+        """
+        self._logger = logger.getLogger('POWER_MONITOR')
+        self._mode = self.MODE_ACTIVE
+        self._last = None
+        self._totals = {self.MODE_ACTIVE: [0.0, 0.0, 0],
+                        self.MODE_IDLE: [0.0, 0.0, 0]}
+
+    def recordWakeup(self, now: float, idle: bool) -> None:
+        """
+        Record a main loop wakeup.
+
+        Params:
+            now:    The monotonic time of the wakeup.
+            idle:   The mode of the loop after the wakeup.
+        """
+        cpuTime = time.process_time()
+        if self._last is not None:
+            totals = self._totals[self._mode]
+            totals[0] += now - self._last[0]
+            totals[1] += cpuTime - self._last[1]
+            totals[2] += 1
+        mode = self.MODE_IDLE if idle else self.MODE_ACTIVE
+        if mode != self._mode:
+            self._logger.info(f"entering {mode} mode")
+            self._mode = mode
+        self._last = (now, cpuTime)
+
+    def getMode(self) -> str:
+        """
+        Get the current mode.
+
+        Return:
+            The current mode.
+        """
+        return self._mode
+
+    def getStats(self) -> dict:
+        """
+        Get the power usage statistics of each mode.
+
+        Return:
+            For each mode, the time spent, the CPU time used, the CPU
+            load and the wakeups per second.
+        """
+        stats = {}
+        for mode, (wallTime, cpuTime, wakeups) in self._totals.items():
+            stats[mode] = {'time': wallTime, 'cpuTime': cpuTime,
+                           'cpuLoad': cpuTime / wallTime
+                           if wallTime else None,
+                           'wakeupRate': wakeups / wallTime
+                           if wallTime else None}
+        return stats
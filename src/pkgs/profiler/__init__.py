@@ -0,0 +1,3 @@
+from .samplingProfiler import SamplingProfiler      # noqa: F401
+from .exceptions import ProfilerInvalid, ProfilerNotInstalled, \
+    ProfilerRunning                                 # noqa: F401
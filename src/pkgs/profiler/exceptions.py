@@ -0,0 +1,34 @@
+class ProfilerInvalid(Exception):
+    """
+    The invalid profiling request exception.
+    """
+    def __init__(self, reason: str) -> None:
+        """
+        Constructor.
+
+        Params:
+            reason:     The reason why the request is invalid.
+        """
+        super().__init__(f"profiling request is not valid: {reason}.")
+
+
+class ProfilerNotInstalled(Exception):
+    """
+    The profiler not installed exception.
+    """
+    def __init__(self) -> None:
+        """
+        Constructor.
+        """
+        super().__init__('profiler signal handler is not installed.')
+
+
+class ProfilerRunning(Exception):
+    """
+    The profiler already running exception.
+    """
+    def __init__(self) -> None:
+        """
+        Constructor.
+        """
+        super().__init__('profiler is already running.')
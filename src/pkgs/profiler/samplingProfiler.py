@@ -0,0 +1,171 @@
+import os
+import signal
+import sys
+import threading
+
+from .exceptions import ProfilerInvalid, ProfilerNotInstalled, \
+    ProfilerRunning
+
+
+class SamplingProfiler:
+    """
+    Signal based sampling profiler.
+
+    A profiling timer raises SIGPROF every interval of process CPU
+    time. The handler, run by the main thread, samples the stack of
+    every thread: the MQTT network thread, the main loop and the
+    workers. Only the code objects are kept while sampling; they are
+    formatted as collapsed stacks, the flame graph input format, once
+    the profiling is over.
+
+    The signal handler can only be installed from the main thread but
+    the profiling can be started and stopped from any thread.
+    """
+    DEFAULT_INTERVAL = 0.005
+    DEFAULT_MAX_DEPTH = 64
+    MAX_DURATION = 300.0
+
+    def __init__(self, logger: object, onReport: callable,
+                 interval: float = DEFAULT_INTERVAL,
+                 maxDepth: int = DEFAULT_MAX_DEPTH) -> None:
+        """
+        Constructor.
+
+        Params:
+            logger:     The app logger.
+            onReport:   The callback called with the collapsed stack
+                        lines at the end of each profiling.
+            interval:   The sampling interval in seconds of CPU time.
+                        Default: 0.005.
+            maxDepth:   The deepest sampled stack. Default: 64.
+        """
+        self._logger = logger.getLogger('PROFILER')
+        self._onReport = onReport
+        self._interval = interval
+        self._maxDepth = maxDepth
+        self._lock = threading.Lock()
+        self._installed = False
+        self._previousHandler = None
+        self._mainIdent = None
+        self._running = False
+        self._timer = None
+        self._threadNames = {}
+        self._samples = {}
+
+    def install(self) -> None:
+        """
+        Install the SIGPROF handler. Must be called from the main thread.
+        """
+        self._previousHandler = signal.signal(signal.SIGPROF,
+                                              self._onSignal)
+        self._mainIdent = threading.main_thread().ident
+        self._installed = True
+
+    def uninstall(self) -> None:
+        """
+        Stop the profiling and restore the previous SIGPROF handler.
+        Must be called from the main thread.
+        """
+        self.stop()
+        if self._installed:
+            signal.signal(signal.SIGPROF, self._previousHandler)
+            self._installed = False
+
+    def isRunning(self) -> bool:
+        """
+        Check if the profiler is running.
+
+        Return:
+            True if the profiler is running, False otherwise.
+        """
+        return self._running
+
+    def start(self, duration: float) -> None:
+        """
+        Start profiling for a duration.
+
+        Params:
+            duration:   The profiling duration in seconds.
+        """
+        if not isinstance(duration, (int, float)) or \
+                not 0 < duration <= self.MAX_DURATION:
+            raise ProfilerInvalid(f"duration {duration}")
+        with self._lock:
+            if not self._installed:
+                raise ProfilerNotInstalled()
+            if self._running:
+                raise ProfilerRunning()
+            self._threadNames = {thread.ident: thread.name
+                                 for thread in threading.enumerate()}
+            self._samples = {}
+            self._running = True
+            self._timer = threading.Timer(duration, self.stop)
+            self._timer.daemon = True
+            self._timer.start()
+            signal.setitimer(signal.ITIMER_PROF, self._interval,
+                             self._interval)
+        self._logger.info(f"profiling for {duration} s")
+
+    def stop(self) -> None:
+        """
+        Stop profiling and report the collapsed stacks.
+        """
+        with self._lock:
+            if not self._running:
+                return
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            self._running = False
+            self._timer.cancel()
+            samples, self._samples = self._samples, {}
+        items = list(samples.items())
+        report = self._collapse(items)
+        self._logger.info(f"profiling done: "
+                          f"{sum(count for _, count in items)} samples, "
+                          f"{len(report)} stacks")
+        self._onReport(report)
+
+    def _onSignal(self, signum: int, frame: object) -> None:
+        """
+        The SIGPROF handler. Samples the stack of every thread; the
+        main thread stack is the interrupted frame. The handler stops
+        writing as soon as the samples are taken by stop.
+
+        Params:
+            signum:     The signal number.
+            frame:      The interrupted main thread frame.
+        """
+        if not self._running:
+            return
+        samples = self._samples
+        for ident, threadFrame in sys._current_frames().items():
+            if ident == self._mainIdent:
+                threadFrame = frame
+            codes = []
+            while threadFrame is not None and len(codes) < self._maxDepth:
+                codes.append(threadFrame.f_code)
+                threadFrame = threadFrame.f_back
+            key = (ident, tuple(codes))
+            if self._samples is not samples:
+                return
+            samples[key] = samples.get(key, 0) + 1
+
+    def _collapse(self, samples: list) -> list:
+        """
+        Format the samples as collapsed stacks.
+
+        Params:
+            samples:    The ((thread, leaf first stack), count) samples.
+
+        Return:
+            The "thread;root;...;leaf count" lines.
+        """
+        counts = {}
+        for (ident, codes), count in samples:
+            names = [self._threadNames.get(ident, f"thread-{ident}")]
+            names.extend(f"{code.co_name} "
+                         f"({os.path.basename(code.co_filename)}:"
+                         f"{code.co_firstlineno})"
+                         for code in reversed(codes))
+            stack = ';'.join(names)
+            counts[stack] = counts.get(stack, 0) + count
+        return [f"{stack} {count}" for stack, count in sorted(counts.items())]
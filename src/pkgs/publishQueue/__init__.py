@@ -0,0 +1 @@
+from .publishQueue import PublishQueue      # noqa: F401
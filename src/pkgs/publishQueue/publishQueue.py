@@ -0,0 +1,273 @@
+from collections import deque
+import threading
+import time
+
+
+class PublishQueue(threading.Thread):
+    """
+    Prioritized outbound publish queue.
+
+    The messages are queued per priority class and published by a
+    worker thread, highest priority first, so the callers never wait
+    on the broker. The connection states and faults come first, then
+    the acknowledgements, then the telemetry. A message queued with a
+    key replaces the queued message of its class with the same key, so
+    only the latest state of each key is published. The acknowledgement
+    and telemetry classes are bounded: when a class is full, its oldest
+    message is shed to make room for the newest one. A critical message
+    is never shed, its class is bounded by coalescing on the key: a
+    critical class over its size is logged once per overflow.
+
+    The completion latency of every message, from its queueing to its
+    publication, is reported to the completion callback, and a message
+    can have its own publication callback, never called for a shed or
+    failed message. When the
+    publish function returns a message info with is_published (paho),
+    the completion is the broker acknowledge for QoS > 0. Otherwise it
+    is the return of the publish function, which leaves the broker
+    round trip out of the latency: a warning is logged once.
+
+    At most MAX_PENDING publications wait for their acknowledge. Beyond
+    that the oldest one is evicted and counted, and its completion is
+    never reported. The age of the oldest pending publication tells a
+    stalled link apart while no acknowledge completes.
+    """
+    PRIORITY_CRITICAL = 0
+    PRIORITY_ACK = 1
+    PRIORITY_TELEMETRY = 2
+    DEFAULT_SIZES = (64, 32, 4)
+    ACK_POLL_PERIOD = 0.005
+    MAX_PENDING = 64
+
+    def __init__(self, logger: object, publish: callable,
+                 sizes: tuple = DEFAULT_SIZES,
+                 onComplete: callable = None) -> None:
+        """
+        Constructor.
+
+        Params:
+            logger:     The app logger.
+            publish:    The publish function: publish(msg).
+            sizes:      The maximum size of each priority class.
+                        Default: (64, 32, 4).
+            onComplete: The completion callback: onComplete(latency).
+                        Default: None.
+        """
+        super().__init__(name='publish-queue', daemon=True)
+        self._logger = logger.getLogger('PUBLISH_QUEUE')
+        self._publish = publish
+        self._sizes = tuple(sizes)
+        self._queues = tuple(deque() for _ in self._sizes)
+        self._shed = [0] * len(self._sizes)
+        self._coalesced = [0] * len(self._sizes)
+        self._overflowing = False
+        self._published = 0
+        self._failed = 0
+        self._onComplete = onComplete
+        self._pending = deque()
+        self._evicted = 0
+        self._evicting = False
+        self._noInfoWarned = False
+        self._cond = threading.Condition()
+        self._stopped = False
+
+    def put(self, msg: object, priority: int = PRIORITY_TELEMETRY,
+            onPublished: callable = None, key: object = None) -> bool:
+        """
+        Queue a message. Never blocks on the broker.
+
+        Params:
+            msg:            The message to publish.
+            priority:       The message priority class. Default: telemetry.
+            onPublished:    The publication callback, called from the
+                            worker: onPublished(msg, queuedTime,
+                            publishedTime). Default: None.
+            key:            The coalescing key: a queued message of the
+                            same class and key is replaced. Default: None.
+
+        Return:
+            False if an older message was shed, True otherwise.
+        """
+        overflow = False
+        with self._cond:
+            queue = self._queues[priority]
+            item = (msg, time.monotonic(), onPublished, key)
+            if key is not None and self._replace(queue, item):
+                self._coalesced[priority] += 1
+                return True
+            full = len(queue) >= self._sizes[priority]
+            shed = full and priority != self.PRIORITY_CRITICAL
+            if shed:
+                queue.popleft()
+                self._shed[priority] += 1
+            elif priority == self.PRIORITY_CRITICAL:
+                overflow = full and not self._overflowing
+                self._overflowing = full
+            queue.append(item)
+            depth = len(queue)
+            self._cond.notify()
+        if overflow:
+            self._logger.error(f"critical messages over the queue size: "
+                               f"{depth}")
+        return not shed
+
+    @staticmethod
+    def _replace(queue: deque, item: tuple) -> bool:
+        """
+        Replace the queued item with the same key.
+
+        Params:
+            queue:  The priority class queue.
+            item:   The (message, queueing time, publication callback,
+                    key) item.
+
+        Return:
+            True if an item was replaced, False otherwise.
+        """
+        for index, queued in enumerate(queue):
+            if queued[3] == item[3]:
+                queue[index] = item
+                return True
+        return False
+
+    def getStats(self) -> dict:
+        """
+        Get the queue statistics.
+
+        Return:
+            The depth, shed and coalesced counts of every priority
+            class, the published and failed message counts, and the
+            pending and evicted publication counts.
+        """
+        with self._cond:
+            return {'depth': tuple(len(queue) for queue in self._queues),
+                    'shed': tuple(self._shed),
+                    'coalesced': tuple(self._coalesced),
+                    'published': self._published,
+                    'failed': self._failed,
+                    'pending': len(self._pending),
+                    'evicted': self._evicted}
+
+    def getPendingAge(self, now: float) -> float:
+        """
+        Get the age of the oldest publication waiting for its
+        acknowledge. Never blocks.
+
+        Params:
+            now:    The current monotonic time.
+
+        Return:
+            The age in seconds, None if no publication is pending.
+        """
+        try:
+            # Indexing a deque is atomic, the worker may pop meanwhile.
+            queuedTime = self._pending[0][2]
+        except IndexError:
+            return None
+        return now - queuedTime
+
+    def _next(self) -> tuple:
+        """
+        Wait for the next message to publish. While some publications
+        are waiting for their completion, the wait is bounded so they
+        can be polled.
+
+        Return:
+            The highest priority (message, queueing time, publication
+            callback, key) item, None if there is none.
+        """
+        with self._cond:
+            if not self._stopped:
+                for queue in self._queues:
+                    if queue:
+                        return queue.popleft()
+                self._cond.wait(self.ACK_POLL_PERIOD if self._pending
+                                else None)
+        return None
+
+    def _complete(self, msg: object, queuedTime: float,
+                  onPublished: callable) -> None:
+        """
+        Report a publication completion.
+
+        Params:
+            msg:            The published message.
+            queuedTime:     The message queueing time.
+            onPublished:    The message publication callback.
+        """
+        now = time.monotonic()
+        if self._onComplete is not None:
+            self._onComplete(now - queuedTime)
+        if onPublished is not None:
+            try:
+                onPublished(msg, queuedTime, now)
+            except Exception as e:
+                self._logger.error(f"publication callback failed: {e}")
+
+    def _pollPending(self) -> None:
+        """
+        Report the completed publications waiting for their acknowledge.
+        """
+        while self._pending and self._pending[0][0].is_published():
+            _, msg, queuedTime, onPublished = self._pending.popleft()
+            self._complete(msg, queuedTime, onPublished)
+        if not self._pending:
+            self._evicting = False
+
+    def _addPending(self, item: tuple) -> None:
+        """
+        Add a publication waiting for its acknowledge, evicting the
+        oldest one if there are too many. The first eviction of a
+        stall is logged.
+
+        Params:
+            item:   The (message info, message, queueing time,
+                    publication callback) item.
+        """
+        if len(self._pending) >= self.MAX_PENDING:
+            self._pending.popleft()
+            with self._cond:
+                self._evicted += 1
+            if not self._evicting:
+                self._evicting = True
+                self._logger.warning(f"more than {self.MAX_PENDING} "
+                                     f"publications wait for their "
+                                     f"acknowledge, evicting the oldest")
+        self._pending.append(item)
+
+    def run(self) -> None:
+        """
+        Publish the queued messages until stopped.
+        """
+        while not self._stopped:
+            item = self._next()
+            self._pollPending()
+            if item is None:
+                continue
+            msg, queuedTime, onPublished, _ = item
+            try:
+                info = self._publish(msg)
+                self._published += 1
+            except Exception as e:
+                self._failed += 1
+                self._logger.error(f"unable to publish message: {e}")
+                continue
+            if not hasattr(info, 'is_published'):
+                if not self._noInfoWarned:
+                    self._noInfoWarned = True
+                    self._logger.warning('publish returns no completion '
+                                         'info, the latencies exclude the '
+                                         'broker acknowledge')
+                self._complete(msg, queuedTime, onPublished)
+            elif not info.is_published():
+                self._addPending((info, msg, queuedTime, onPublished))
+            else:
+                self._complete(msg, queuedTime, onPublished)
+
+    def stop(self) -> None:
+        """
+        Stop the publishing worker. The queued messages are discarded.
+        """
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
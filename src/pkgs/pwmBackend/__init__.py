@@ -0,0 +1,9 @@
+from .pwmBackend import PwmBackend                  # noqa: F401
+from .servoKitBackend import ServoKitBackend        # noqa: F401
+from .pca9685Backend import Pca9685Backend          # noqa: F401
+from .pigpioBackend import PigpioBackend            # noqa: F401
+from .factory import BACKENDS, createBackend        # noqa: F401
+from .exceptions import PwmBackendType, \
+    PwmBackendConnection, \
+    PwmBackendOperation, \
+    PwmBackendUnsupported                           # noqa: F401
@@ -0,0 +1,58 @@
+class PwmBackendType(Exception):
+    """
+    The unsupported PWM backend type exception.
+    """
+    def __init__(self, backendType: str) -> None:
+        """
+        Constructor.
+
+        Params:
+            backendType:    The backend type.
+        """
+        super().__init__(f"PWM backend {backendType} is unsupported.")
+
+
+class PwmBackendConnection(Exception):
+    """
+    The PWM backend connection exception.
+    """
+    def __init__(self, host: str, port: int) -> None:
+        """
+        Constructor.
+
+        Params:
+            host:   The daemon host.
+            port:   The daemon port.
+        """
+        super().__init__(f"unable to connect to PIGPIO service "
+                         f"at {host}:{port}.")
+
+
+class PwmBackendUnsupported(Exception):
+    """
+    The unsupported PWM backend operation exception.
+    """
+    def __init__(self, operation: str) -> None:
+        """
+        Constructor.
+
+        Params:
+            operation:  The unsupported operation.
+        """
+        super().__init__(f"PWM backend does not support {operation}.")
+
+
+class PwmBackendOperation(Exception):
+    """
+    The PWM backend operation failure exception.
+    """
+    def __init__(self, channel: int, err: object) -> None:
+        """
+        Constructor.
+
+        Params:
+            channel:    The channel on which the operation failed.
+            err:        The error code or description.
+        """
+        super().__init__(f"PWM operation on channel {channel} failed, "
+                         f"err: {err}")
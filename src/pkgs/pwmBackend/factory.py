@@ -0,0 +1,28 @@
+from .exceptions import PwmBackendType
+from .pca9685Backend import Pca9685Backend
+from .pigpioBackend import PigpioBackend
+from .pwmBackend import PwmBackend
+from .servoKitBackend import ServoKitBackend
+
+
+BACKENDS = {
+    PwmBackend.TYPE_SERVOKIT: ServoKitBackend,
+    PwmBackend.TYPE_PCA9685: Pca9685Backend,
+    PwmBackend.TYPE_PIGPIO: PigpioBackend,
+}
+
+
+def createBackend(backendType: str, **params) -> PwmBackend:
+    """
+    Create a PWM backend.
+
+    Params:
+        backendType:    The backend type.
+        params:         The backend constructor parameters.
+
+    Return:
+        The PWM backend.
+    """
+    if backendType not in BACKENDS:
+        raise PwmBackendType(backendType)
+    return BACKENDS[backendType](**params)
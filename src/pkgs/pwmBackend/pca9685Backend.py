@@ -0,0 +1,133 @@
+import time
+
+from .pwmBackend import PwmBackend
+
+
+class Pca9685Backend(PwmBackend):
+    """
+    Raw PCA9685 PWM backend over smbus2.
+
+    The angle to tick conversion is done through a lookup table built
+    when the frequency is set, so updating a channel is a single block
+    write with no float math.
+    """
+    DEFAULT_ADDRESS = 0x40
+    OSC_FREQ = 25000000
+    RESOLUTION = 4096
+    MAX_BLOCK_CHAN = 8
+
+    MODE1 = 0x00
+    PRESCALE = 0xFE
+    LED0_ON_L = 0x06
+
+    MODE1_RESTART = 0x80
+    MODE1_AUTO_INC = 0x20
+    MODE1_SLEEP = 0x10
+
+    def __init__(self, busNum: int = 1, address: int = DEFAULT_ADDRESS,
+                 chanCount: int = 16, frequency: int = 50,
+                 minPulse: int = PwmBackend.DEFAULT_MIN_PULSE,
+                 maxPulse: int = PwmBackend.DEFAULT_MAX_PULSE,
+                 smbus: object = None) -> None:
+        """
+        Constructor.
+
+        Params:
+            busNum:     The I2C bus number. Default 1.
+            address:    The PCA9685 I2C address. Default 0x40.
+            chanCount:  The number of channels used. Default 16.
+            frequency:  The PWM frequency. Default 50.
+            minPulse:   The pulse width at the minimal angle in us.
+            maxPulse:   The pulse width at the maximal angle in us.
+            smbus:      The SMBus class. Default smbus2.SMBus.
+        """
+        super().__init__(chanCount)
+        if smbus is None:
+            from smbus2 import SMBus
+            smbus = SMBus
+        self._bus = smbus(busNum)
+        self._address = address
+        self._pulses = self.buildPulseTable(minPulse, maxPulse)
+        self._ticks = None
+        self.setFrequency(frequency)
+
+    def _buildTickTable(self, frequency: float) -> tuple:
+        """
+        Build the angle to PCA9685 register bytes lookup table.
+
+        Params:
+            frequency:  The actual PWM frequency.
+
+        Return:
+            The ON/OFF register bytes for every integer angle.
+        """
+        ticksPerUs = frequency * self.RESOLUTION / 1000000
+        table = []
+        for pulse in self._pulses:
+            ticks = min(round(pulse * ticksPerUs), self.RESOLUTION - 1)
+            table.append((0, 0, ticks & 0xFF, ticks >> 8))
+        return tuple(table)
+
+    def setFrequency(self, frequency: int) -> None:
+        """
+        Set the PWM frequency.
+
+        Params:
+            frequency:  The PWM frequency.
+        """
+        prescale = round(self.OSC_FREQ / (self.RESOLUTION * frequency)) - 1
+        actualFreq = self.OSC_FREQ / (self.RESOLUTION * (prescale + 1))
+        ticks = self._buildTickTable(actualFreq)
+        self._bus.write_byte_data(self._address, self.MODE1,
+                                  self.MODE1_SLEEP)
+        self._bus.write_byte_data(self._address, self.PRESCALE, prescale)
+        self._bus.write_byte_data(self._address, self.MODE1,
+                                  self.MODE1_AUTO_INC)
+        time.sleep(0.0005)
+        self._bus.write_byte_data(self._address, self.MODE1,
+                                  self.MODE1_RESTART | self.MODE1_AUTO_INC)
+        self._ticks = ticks
+
+    def _setAngle(self, channel: int, angle: int) -> None:
+        """
+        Write a checked channel angle.
+
+        Params:
+            channel:    The channel.
+            angle:      The angle.
+        """
+        self._bus.write_i2c_block_data(self._address,
+                                       self.LED0_ON_L + 4 * channel,
+                                       self._ticks[angle])
+        self._angles[channel] = angle
+
+    def _setAngles(self, angles: tuple) -> None:
+        """
+        Write checked channel angles. Consecutive channels are written in
+        the same auto-increment block write.
+
+        Params:
+            angles:     The (channel, angle) pairs.
+        """
+        ticks = self._ticks
+        start = None
+        block = []
+        for channel, angle in angles:
+            if start is None or channel != start + len(block) // 4 or \
+                    len(block) == 4 * self.MAX_BLOCK_CHAN:
+                if block:
+                    self._bus.write_i2c_block_data(
+                        self._address, self.LED0_ON_L + 4 * start, block)
+                start = channel
+                block = []
+            block.extend(ticks[angle])
+            self._angles[channel] = angle
+        if block:
+            self._bus.write_i2c_block_data(self._address,
+                                           self.LED0_ON_L + 4 * start, block)
+
+    def close(self) -> None:
+        """
+        Close the I2C bus.
+        """
+        self._bus.close()
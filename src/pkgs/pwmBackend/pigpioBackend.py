@@ -0,0 +1,112 @@
+import socket
+import struct
+import threading
+
+from .exceptions import PwmBackendConnection, PwmBackendOperation
+from .pwmBackend import PwmBackend
+
+
+class PigpioBackend(PwmBackend):
+    """
+    PIGPIO daemon PWM backend.
+
+    The servo pulse commands are sent over a single socket connection
+    to the pigpiod service. Bulk updates are pipelined: every command is
+    sent in one write before the responses are read back.
+    """
+    DEFAULT_HOST = 'localhost'
+    DEFAULT_PORT = 8888
+    CMD_SERVO = 8
+    CMD_FORMAT = '<IIII'
+    RES_FORMAT = '<IIIi'
+    MSG_SIZE = 16
+
+    def __init__(self, pins: tuple, host: str = DEFAULT_HOST,
+                 port: int = DEFAULT_PORT,
+                 minPulse: int = PwmBackend.DEFAULT_MIN_PULSE,
+                 maxPulse: int = PwmBackend.DEFAULT_MAX_PULSE) -> None:
+        """
+        Constructor.
+
+        Params:
+            pins:       The GPIO of each channel.
+            host:       The pigpiod host. Default localhost.
+            port:       The pigpiod port. Default 8888.
+            minPulse:   The pulse width at the minimal angle in us.
+            maxPulse:   The pulse width at the maximal angle in us.
+        """
+        super().__init__(len(pins))
+        self._pins = tuple(pins)
+        self._pulses = self.buildPulseTable(minPulse, maxPulse)
+        self._lock = threading.Lock()
+        try:
+            self._sock = socket.create_connection((host, port))
+        except OSError:
+            raise PwmBackendConnection(host, port)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def _recvAll(self, size: int) -> bytes:
+        """
+        Receive an exact amount of bytes from the daemon.
+
+        Params:
+            size:   The number of bytes to receive.
+
+        Return:
+            The received bytes.
+        """
+        data = bytearray()
+        while len(data) < size:
+            chunk = self._sock.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError('PIGPIO service closed the connection.')
+            data.extend(chunk)
+        return bytes(data)
+
+    def _setAngle(self, channel: int, angle: int) -> None:
+        """
+        Write a checked channel angle.
+
+        Params:
+            channel:    The channel.
+            angle:      The angle.
+        """
+        self._setAngles(((channel, angle),))
+
+    def _setAngles(self, angles: tuple) -> None:
+        """
+        Write checked channel angles with pipelined servo commands.
+
+        Params:
+            angles:     The (channel, angle) pairs.
+        """
+        pins = self._pins
+        pulses = self._pulses
+        request = b''.join(struct.pack(self.CMD_FORMAT, self.CMD_SERVO,
+                                       pins[channel], pulses[angle], 0)
+                           for channel, angle in angles)
+        with self._lock:
+            self._sock.sendall(request)
+            response = self._recvAll(self.MSG_SIZE * len(angles))
+        for index, (channel, angle) in enumerate(angles):
+            _, _, _, res = struct.unpack_from(self.RES_FORMAT, response,
+                                              index * self.MSG_SIZE)
+            if res < 0:
+                raise PwmBackendOperation(channel, res)
+            self._angles[channel] = angle
+
+    def setFrequency(self, frequency: int) -> None:
+        """
+        Set the PWM frequency. The pigpiod servo pulses run at a fixed
+        50 Hz so this is a no-op.
+
+        Params:
+            frequency:  The PWM frequency.
+        """
+        pass
+
+    def close(self) -> None:
+        """
+        Close the daemon connection.
+        """
+        self._sock.close()
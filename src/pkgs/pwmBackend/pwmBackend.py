@@ -0,0 +1,150 @@
+import math
+import numbers
+
+from .exceptions import PwmBackendOperation
+
+
+class PwmBackend:
+    """
+    PWM backend base class.
+
+    A backend drives the PWM channels of the control devices. The base
+    class checks every angle before the implementations write it: a
+    real angle is rounded to an integer between MIN_ANGLE and MAX_ANGLE
+    and anything else is refused, so implementations can use
+    precomputed lookup tables.
+    """
+    TYPE_SERVOKIT = 'servokit'
+    TYPE_PCA9685 = 'pca9685'
+    TYPE_PIGPIO = 'pigpio'
+    MIN_ANGLE = 0
+    MAX_ANGLE = 180
+    DEFAULT_MIN_PULSE = 750
+    DEFAULT_MAX_PULSE = 2250
+
+    @classmethod
+    def buildPulseTable(cls, minPulse: int, maxPulse: int) -> tuple:
+        """
+        Build the angle to pulse width lookup table.
+
+        Params:
+            minPulse:   The pulse width at MIN_ANGLE in us.
+            maxPulse:   The pulse width at MAX_ANGLE in us.
+
+        Return:
+            The pulse width in us for every integer angle.
+        """
+        span = cls.MAX_ANGLE - cls.MIN_ANGLE
+        return tuple(round(minPulse + (maxPulse - minPulse) * angle / span)
+                     for angle in range(span + 1))
+
+    def __init__(self, chanCount: int) -> None:
+        """
+        Constructor.
+
+        Params:
+            chanCount:  The number of channels driven by the backend.
+        """
+        self._chanCount = chanCount
+        self._angles = [None] * chanCount
+
+    def getChannelCount(self) -> int:
+        """
+        Get the number of channels.
+
+        Return:
+            The number of channels.
+        """
+        return self._chanCount
+
+    @classmethod
+    def _toAngle(cls, channel: int, angle: object) -> int:
+        """
+        Check an angle and round it to an integer.
+
+        Params:
+            channel:    The channel.
+            angle:      The angle.
+
+        Return:
+            The integer angle.
+        """
+        if isinstance(angle, numbers.Integral) and \
+                not isinstance(angle, bool):
+            angle = int(angle)
+        elif isinstance(angle, numbers.Real) and \
+                not isinstance(angle, bool) and math.isfinite(angle):
+            angle = round(angle)
+        else:
+            raise PwmBackendOperation(channel, f"invalid angle {angle!r}")
+        if angle < cls.MIN_ANGLE or angle > cls.MAX_ANGLE:
+            raise PwmBackendOperation(channel, f"invalid angle {angle}")
+        return angle
+
+    def setAngle(self, channel: int, angle: int) -> None:
+        """
+        Set a channel angle.
+
+        Params:
+            channel:    The channel.
+            angle:      The angle.
+        """
+        self._setAngle(channel, self._toAngle(channel, angle))
+
+    def setAngles(self, angles: tuple) -> None:
+        """
+        Set many channel angles in one bulk operation. The angles are
+        applied in the given order, none of them if one is not valid.
+
+        Params:
+            angles:     The (channel, angle) pairs.
+        """
+        self._setAngles(tuple((channel, self._toAngle(channel, angle))
+                              for channel, angle in angles))
+
+    def _setAngle(self, channel: int, angle: int) -> None:
+        """
+        Write a checked channel angle.
+
+        Params:
+            channel:    The channel.
+            angle:      The integer angle.
+        """
+        raise NotImplementedError()
+
+    def _setAngles(self, angles: tuple) -> None:
+        """
+        Write checked channel angles, in the given order.
+
+        Params:
+            angles:     The (channel, integer angle) pairs.
+        """
+        for channel, angle in angles:
+            self._setAngle(channel, angle)
+
+    def getAngle(self, channel: int) -> int:
+        """
+        Get the last angle applied on a channel.
+
+        Params:
+            channel:    The channel.
+
+        Return:
+            The channel angle, None if it was never set.
+        """
+        return self._angles[channel]
+
+    def setFrequency(self, frequency: int) -> None:
+        """
+        Set the PWM frequency.
+
+        Params:
+            frequency:  The PWM frequency.
+        """
+        raise NotImplementedError()
+
+    def close(self) -> None:
+        """
+        Release the backend resources.
+        """
+        pass
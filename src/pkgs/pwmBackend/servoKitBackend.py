@@ -0,0 +1,55 @@
+from .exceptions import PwmBackendUnsupported
+from .pwmBackend import PwmBackend
+
+
+class ServoKitBackend(PwmBackend):
+    """
+    Adafruit ServoKit PWM backend. The servo kit only sets its PWM
+    frequency when created.
+    """
+    def __init__(self, servoKit: object, chanCount: int = 16,
+                 frequency: int = 50) -> None:
+        """
+        Constructor.
+
+        Params:
+            servoKit:   The adafruit ServoKit class.
+            chanCount:  The number of channel in the servo kit. Default 16.
+            frequency:  The desired frequency. Default 50.
+        """
+        super().__init__(chanCount)
+        self._frequency = frequency
+        self._kit = servoKit(channels=chanCount, frequency=frequency)
+
+    def _setAngle(self, channel: int, angle: int) -> None:
+        """
+        Write a checked channel angle.
+
+        Params:
+            channel:    The channel.
+            angle:      The angle.
+        """
+        self._kit.servo[channel].angle = angle
+
+    def getAngle(self, channel: int) -> int:
+        """
+        Get the channel angle as reported by the servo kit.
+
+        Params:
+            channel:    The channel.
+
+        Return:
+            The channel angle.
+        """
+        return self._kit.servo[channel].angle
+
+    def setFrequency(self, frequency: int) -> None:
+        """
+        Set the PWM frequency. Only the frequency the servo kit was
+        created with is supported.
+
+        Params:
+            frequency:  The PWM frequency.
+        """
+        if frequency != self._frequency:
+            raise PwmBackendUnsupported('PWM frequency changes')
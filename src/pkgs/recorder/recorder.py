@@ -0,0 +1,96 @@
+import struct
+import threading
+
+
+class Recorder:
+    """
+    Binary command and state recorder.
+
+    A record file starts with a header (magic, version, record size)
+    followed by fixed size little endian records: kind, flags, sequence
+    number, two monotonic times, steering and throttle. Fixed size
+    records let the analysis tools map a whole file without parsing it.
+
+    The command records carry the receive and the PWM write times, the
+    state records the queueing and the publish times and the drop
+    records the receive and the drop times.
+    """
+    MAGIC = b'RCOP'
+    VERSION = 1
+    HEADER_FORMAT = '<4sHH'
+    RECORD_FORMAT = '<BBxxIddff'
+    KIND_COMMAND = 0
+    KIND_STATE = 1
+    KIND_DROP = 2
+    FLAG_CLAMPED = 0x01
+    FLAG_COALESCED = 0x02
+    FLAG_ESTOP = 0x04
+    BUFFER_SIZE = 65536
+
+    def __init__(self, logger: object, path: str) -> None:
+        """
+        Constructor.
+
+        Params:
+            logger:     The app logger.
+            path:       The record file path.
+        """
+        self._logger = logger.getLogger('RECORDER')
+        self._path = path
+        self._record = struct.Struct(self.RECORD_FORMAT)
+        self._lock = threading.Lock()
+        self._count = 0
+        self._file = open(path, 'wb', buffering=self.BUFFER_SIZE)
+        self._file.write(struct.pack(self.HEADER_FORMAT, self.MAGIC,
+                                     self.VERSION, self._record.size))
+        self._logger.info(f"recording to {path}")
+
+    def getPath(self) -> str:
+        """
+        Get the record file path.
+
+        Return:
+            The record file path.
+        """
+        return self._path
+
+    def getCount(self) -> int:
+        """
+        Get the number of records.
+
+        Return:
+            The number of records.
+        """
+        return self._count
+
+    def record(self, kind: int, time0: float, time1: float,
+               steering: float, throttle: float, flags: int = 0) -> None:
+        """
+        Append a record. Ignored once closed.
+
+        Params:
+            kind:       The record kind.
+            time0:      The receive or publish monotonic time.
+            time1:      The write, drop or publish monotonic time.
+            steering:   The steering modifier.
+            throttle:   The throttle modifier.
+            flags:      The record flags. Default: 0.
+        """
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(self._record.pack(kind, flags,
+                                               self._count & 0xffffffff,
+                                               time0, time1, steering,
+                                               throttle))
+            self._count += 1
+
+    def close(self) -> None:
+        """
+        Flush and close the record file.
+        """
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+                self._logger.info(f"{self._count} records saved to "
+                                  f"{self._path}")
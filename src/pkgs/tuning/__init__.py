@@ -0,0 +1,5 @@
+from .tunables import Tunables                      # noqa: F401
+from .tuningStore import TuningStore                # noqa: F401
+from .tuningFileWatcher import TuningFileWatcher    # noqa: F401
+from .exceptions import TuningApplyFailed, \
+    TuningInvalid                                   # noqa: F401
@@ -0,0 +1,27 @@
+class TuningInvalid(Exception):
+    """
+    The invalid tuning exception.
+    """
+    def __init__(self, key: str, value: object) -> None:
+        """
+        Constructor.
+
+        Params:
+            key:    The invalid tuning key.
+            value:  The invalid value.
+        """
+        super().__init__(f"tuning {key}: {value} is not valid.")
+
+
+class TuningApplyFailed(Exception):
+    """
+    The tuning application failure exception.
+    """
+    def __init__(self, error: Exception) -> None:
+        """
+        Constructor.
+
+        Params:
+            error:  The error raised while applying the tuning.
+        """
+        super().__init__(f"unable to apply tuning: {error}")
@@ -0,0 +1,19 @@
+from typing import NamedTuple
+
+
+class Tunables(NamedTuple):
+    """
+    Immutable runtime tuning snapshot.
+
+    The device setups are (channel, (min, center, max)) pairs as
+    expected by ControlDevice.modifyPosition, None for a unit driving
+    a mixer instead of its own devices. The unit goes idle after
+    idleDelay seconds at neutral and then reports its state every
+    idleStatePeriod seconds. The PWM frequency is not a unit tuning:
+    it is shared by every channel of the backend and set by the process.
+    """
+    stateUpdatePeriod: float
+    steering: tuple
+    throttle: tuple
+    idleDelay: float = 30.0
+    idleStatePeriod: float = 1.0
@@ -0,0 +1,73 @@
+import json
+import os
+import threading
+
+from .exceptions import TuningApplyFailed, TuningInvalid
+from .tuningStore import TuningStore
+
+
+class TuningFileWatcher(threading.Thread):
+    """
+    Tuning file watcher.
+
+    Polls a JSON tuning file and updates the tuning store every time
+    the file is modified.
+    """
+    DEFAULT_POLL_PERIOD = 1.0
+
+    def __init__(self, logger: object, store: TuningStore, path: str,
+                 pollPeriod: float = DEFAULT_POLL_PERIOD) -> None:
+        """
+        Constructor.
+
+        Params:
+            logger:     The app logger.
+            store:      The tuning store to update.
+            path:       The tuning file path.
+            pollPeriod: The file polling period. Default 1 second.
+        """
+        super().__init__(name='tuning-watcher', daemon=True)
+        self._logger = logger.getLogger('TUNING_WATCHER')
+        self._store = store
+        self._path = path
+        self._pollPeriod = pollPeriod
+        self._mtime = None
+        self._stopEvent = threading.Event()
+
+    def poll(self) -> bool:
+        """
+        Load the tuning file if it was modified since the last poll.
+
+        Return:
+            True if the tuning was updated, False otherwise.
+        """
+        try:
+            mtime = os.stat(self._path).st_mtime_ns
+        except OSError:
+            return False
+        if mtime == self._mtime:
+            return False
+        self._mtime = mtime
+        try:
+            with open(self._path) as tuningFile:
+                self._store.update(json.load(tuningFile))
+        except (OSError, ValueError, TuningApplyFailed,
+                TuningInvalid) as e:
+            self._logger.error(f"unable to apply {self._path}: {e}")
+            return False
+        return True
+
+    def run(self) -> None:
+        """
+        Watch the tuning file until stopped.
+        """
+        self._logger.info(f"watching tuning file: {self._path}")
+        self.poll()
+        while not self._stopEvent.wait(self._pollPeriod):
+            self.poll()
+
+    def stop(self) -> None:
+        """
+        Stop watching the tuning file.
+        """
+        self._stopEvent.set()
@@ -0,0 +1,224 @@
+import threading
+
+from pkgs.controlDevice import ControlDevice, \
+    ControlDeviceChannelUnavailable, ControlDeviceMotionRangeInvalid
+
+from .exceptions import TuningApplyFailed, TuningInvalid
+from .tunables import Tunables
+
+
+class TuningStore:
+    """
+    Runtime tuning store.
+
+    The current tuning is an immutable snapshot. Updates build and
+    validate a new snapshot, apply it through the listeners and only
+    then swap it in with a single reference assignment, so readers
+    never take a lock and never see a tuning that is not applied. Only
+    the writers are serialized. The device channels are claimed in the
+    process channel registry, so a tuning never moves a device onto a
+    channel driven by another unit.
+    """
+    DEVICES = ('steering', 'throttle')
+    PERIODS = ('stateUpdatePeriod', 'idleDelay', 'idleStatePeriod')
+
+    def __init__(self, logger: object, defaults: Tunables,
+                 owner: str) -> None:
+        """
+        Constructor.
+
+        Params:
+            logger:     The app logger.
+            defaults:   The initial tuning.
+            owner:      The owner of the device channels.
+        """
+        self._logger = logger.getLogger('TUNING')
+        self._owner = owner
+        self._writeLock = threading.Lock()
+        self._listeners = []
+        defaults = self._validate(defaults)
+        self._claim(self._getChannels(defaults))
+        self._current = defaults
+
+    def _validateSetup(self, key: str, setup: tuple) -> tuple:
+        """
+        Validate a device setup.
+
+        Params:
+            key:    The device tuning key.
+            setup:  The (channel, motion range) pair, None if the unit
+                    has no such device.
+
+        Return:
+            The setup as an immutable pair.
+        """
+        if setup is None:
+            return None
+        try:
+            channel, motionRange = setup
+            motionRange = tuple(motionRange)
+            ControlDevice._validateMotionRange(motionRange)
+        except (TypeError, ValueError, ControlDeviceMotionRangeInvalid):
+            raise TuningInvalid(key, setup)
+        if not all(self._isInt(value) for value in (channel,) + motionRange):
+            raise TuningInvalid(key, setup)
+        return (channel, motionRange)
+
+    @staticmethod
+    def _isInt(value: object) -> bool:
+        """
+        Check if a value is an integer, booleans excluded.
+
+        Params:
+            value:  The value to check.
+
+        Return:
+            True if the value is an integer, False otherwise.
+        """
+        return isinstance(value, int) and not isinstance(value, bool)
+
+    def _getChannels(self, tunables: Tunables) -> set:
+        """
+        Get the device channels of a tuning.
+
+        Params:
+            tunables:   The tuning.
+
+        Return:
+            The device channels.
+        """
+        return {getattr(tunables, key)[0] for key in self.DEVICES
+                if getattr(tunables, key) is not None}
+
+    def _claim(self, channels: set) -> None:
+        """
+        Claim device channels.
+
+        Params:
+            channels:   The claimed channels.
+        """
+        try:
+            ControlDevice.channels.claim(self._owner, tuple(channels))
+        except ControlDeviceChannelUnavailable:
+            raise TuningInvalid('channels', tuple(sorted(channels)))
+
+    def _validate(self, tunables: Tunables) -> Tunables:
+        """
+        Validate a tuning snapshot.
+
+        Params:
+            tunables:   The tuning to validate.
+
+        Return:
+            The validated tuning.
+        """
+        for key in self.PERIODS:
+            value = getattr(tunables, key)
+            if not isinstance(value, (int, float)) or value <= 0:
+                raise TuningInvalid(key, value)
+        steering = self._validateSetup('steering', tunables.steering)
+        throttle = self._validateSetup('throttle', tunables.throttle)
+        if steering is not None and throttle is not None and \
+                steering[0] == throttle[0]:
+            raise TuningInvalid('channels', (steering[0], throttle[0]))
+        return tunables._replace(steering=steering, throttle=throttle)
+
+    def _merge(self, changes: dict) -> Tunables:
+        """
+        Merge the changes into the current tuning.
+
+        Params:
+            changes:    The changed tuning entries. The device entries
+                        are dictionaries with optional channel and range.
+
+        Return:
+            The merged tuning.
+        """
+        if not isinstance(changes, dict):
+            raise TuningInvalid('tuning', changes)
+        values = self._current._asdict()
+        for key, value in changes.items():
+            if key not in values:
+                raise TuningInvalid(key, value)
+            if key in self.DEVICES:
+                if not isinstance(value, dict) or values[key] is None:
+                    raise TuningInvalid(key, value)
+                channel, motionRange = values[key]
+                value = (value.get('channel', channel),
+                         value.get('range', motionRange))
+            values[key] = value
+        return Tunables(**values)
+
+    def get(self) -> Tunables:
+        """
+        Get the current tuning snapshot. Never blocks.
+
+        Return:
+            The current tuning.
+        """
+        return self._current
+
+    def update(self, changes: dict) -> Tunables:
+        """
+        Validate and apply a tuning update. The new device channels are
+        claimed before the listeners are called and the channels left
+        are released afterwards. If a listener fails, the listeners
+        already called are given the previous tuning back, the new
+        channels are released and the current tuning is kept.
+
+        Params:
+            changes:    The changed tuning entries.
+
+        Return:
+            The new tuning.
+        """
+        with self._writeLock:
+            previous = self._current
+            tunables = self._validate(self._merge(changes))
+            channels = self._getChannels(previous)
+            claimed = self._getChannels(tunables) - channels
+            self._claim(claimed)
+            called = []
+            try:
+                for listener in self._listeners:
+                    called.append(listener)
+                    listener(previous, tunables)
+            except Exception as e:
+                self._rollback(called, tunables, previous)
+                ControlDevice.channels.release(self._owner, tuple(claimed))
+                raise TuningApplyFailed(e)
+            ControlDevice.channels.release(
+                self._owner, tuple(channels - self._getChannels(tunables)))
+            self._current = tunables
+            self._logger.info(f"tuning updated to: {tunables}")
+        return tunables
+
+    def _rollback(self, listeners: list, tunables: Tunables,
+                  previous: Tunables) -> None:
+        """
+        Give the previous tuning back to the listeners, the last called
+        first.
+
+        Params:
+            listeners:  The listeners called with the failed tuning.
+            tunables:   The failed tuning.
+            previous:   The previous tuning.
+        """
+        self._logger.error(f"unable to apply tuning: {tunables}, "
+                           f"rolling back")
+        for listener in reversed(listeners):
+            try:
+                listener(tunables, previous)
+            except Exception as e:
+                self._logger.error(f"unable to roll tuning back: {e}")
+
+    def registerListener(self, listener: callable) -> None:
+        """
+        Register a listener called with the current and the new tuning
+        on every update, before the new tuning is swapped in. A listener
+        raising aborts the update.
+
+        Params:
+            listener:   The tuning listener.
+        """
+        self._listeners.append(listener)
@@ -0,0 +1 @@
+from .unit import Unit      # noqa: F401
@@ -0,0 +1,84 @@
+from collections import deque
+import threading
+import time
+
+
+class CommandWorker(threading.Thread):
+    """
+    Latest-wins command worker.
+
+    The MQTT thread only posts the raw command and returns, so it is
+    free to handle the next message right away. The worker decodes and
+    applies the most recent command; a command superseded before being
+    handled is dropped and counted as coalesced.
+    """
+    def __init__(self, logger: object, handler: callable,
+                 name: str = 'command-worker',
+                 onCoalesced: callable = None) -> None:
+        """
+        Constructor.
+
+        Params:
+            logger:         The app logger.
+            handler:        The command handler: handler(msg, receivedTime).
+            name:           The worker thread name.
+            onCoalesced:    The callback called with the posting time when
+                            a command is superseded. Default: None.
+        """
+        super().__init__(name=name, daemon=True)
+        self._logger = logger.getLogger('COMMAND_WORKER')
+        self._handler = handler
+        self._onCoalesced = onCoalesced
+        self._mailbox = deque(maxlen=1)
+        self._coalesced = 0
+        self._event = threading.Event()
+        self._stopped = False
+
+    def post(self, msg: object) -> None:
+        """
+        Post a command. Never blocks.
+
+        Params:
+            msg:    The raw command message.
+        """
+        now = time.monotonic()
+        if self._mailbox:
+            self._coalesced += 1
+            if self._onCoalesced is not None:
+                self._onCoalesced(now)
+        self._mailbox.append((msg, now))
+        self._event.set()
+
+    def getCoalescedCount(self) -> int:
+        """
+        Get the number of superseded commands.
+
+        Return:
+            The coalesced command count.
+        """
+        return self._coalesced
+
+    def run(self) -> None:
+        """
+        Handle the posted commands until stopped.
+        """
+        while True:
+            self._event.wait()
+            self._event.clear()
+            if self._stopped:
+                return
+            try:
+                pending = self._mailbox.popleft()
+            except IndexError:
+                continue
+            try:
+                self._handler(*pending)
+            except Exception as e:
+                self._logger.error(f"unable to handle command: {e}")
+
+    def stop(self) -> None:
+        """
+        Stop the worker.
+        """
+        self._stopped = True
+        self._event.set()
@@ -0,0 +1,501 @@
+from collections import deque
+import json
+import time
+
+from pkgs.controlDevice import ControlDevice
+from pkgs.emergencyStop import EmergencyStop
+from pkgs.latencyStats import LatencyStats
+from pkgs.messages import UnitCxnStateMsg
+from pkgs.messages import UnitWhldCmdMsg
+from pkgs.messages import UnitWhldStateMsg
+from pkgs.mixer import Mixer
+from pkgs.mission import Mission, MissionInvalid, MissionNotLoaded, \
+    MissionRunner
+from pkgs.recorder import Recorder
+from pkgs.tuning import Tunables, TuningApplyFailed, TuningFileWatcher, \
+    TuningInvalid, TuningStore
+from pkgs.unit.commandWorker import CommandWorker
+
+
+class Unit:
+    """
+    Logical wheeled unit.
+
+    A unit owns its steering and throttle control devices, its runtime
+    tuning and its mission runner. Several units can share the same
+    PWM backend and MQTT connection, each one with its own topics.
+
+    Commands are handed to a latest-wins worker so that an emergency
+    stop, handled directly on the MQTT thread, never queues behind them.
+
+    A unit left at neutral without setpoint changes goes idle: its state
+    period is lowered and the repeated neutral setpoints are not written.
+    The first non-neutral setpoint wakes it up.
+
+    A unit with a mixer drives the mixer outputs instead of its steering
+    and throttle devices, for tank drive or multiple motors platforms.
+    """
+    NEUTRAL_SETPOINT = (0.0, 0.0)
+    ESTOP_TOPIC = '{unitId}/estop'
+    REARM_TOPIC = '{unitId}/rearm'
+    TUNING_TOPIC = '{unitId}/tuning'
+    MISSION_TOPIC = '{unitId}/mission'
+    TOPIC_QOS = 1
+    DROP_BACKLOG = 1024
+
+    def __init__(self, appLogger: object, unitId: str, defaults: Tunables,
+                 tuningFile: str = None, recordFile: str = None,
+                 mixer: Mixer = None) -> None:
+        """
+        Constructor.
+
+        Params:
+            appLogger:  The app logger.
+            unitId:     The unit ID.
+            defaults:   The unit initial tuning.
+            tuningFile: The tuning file to watch. Default: None.
+            recordFile: The command and state record file.
+                        Default: None, no recording.
+            mixer:      The command mixer. Default: None, the steering
+                        and throttle devices are driven directly. A unit
+                        with a mixer has no steering or throttle device.
+        """
+        self._logger = appLogger.getLogger(f"UNIT:{unitId}")
+        self._id = unitId
+        self._logger.info('creating unit')
+        self._steering = None
+        self._throttle = None
+        if mixer is not None:
+            defaults = defaults._replace(steering=None, throttle=None)
+        elif defaults.steering is None or defaults.throttle is None:
+            raise TuningInvalid('devices', (defaults.steering,
+                                            defaults.throttle))
+        self._tuning = TuningStore(appLogger, defaults, unitId)
+        if mixer is None:
+            defaults = self._tuning.get()
+            self._steering = ControlDevice(appLogger,
+                                           ControlDevice.TYPE_DIRECT,
+                                           defaults.steering[1],
+                                           channel=defaults.steering[0],
+                                           saturate=True)
+            self._throttle = ControlDevice(appLogger, ControlDevice.TYPE_ESC,
+                                           defaults.throttle[1],
+                                           channel=defaults.throttle[0],
+                                           saturate=True)
+        self._tuning.registerListener(self._applyTunables)
+        self._tuningWatcher = None
+        if tuningFile:
+            self._tuningWatcher = TuningFileWatcher(appLogger, self._tuning,
+                                                    tuningFile)
+        self._mixer = mixer
+        if mixer is not None:
+            self._estop = EmergencyStop(appLogger, mixer.getDevices())
+        else:
+            self._estop = EmergencyStop(appLogger,
+                                        (self._throttle, self._steering))
+        self._cmdLatency = LatencyStats()
+        self._recorder = None
+        if recordFile:
+            self._recorder = Recorder(appLogger, recordFile)
+        self._drops = deque(maxlen=self.DROP_BACKLOG)
+        self._commandWorker = CommandWorker(appLogger, self._handleCommand,
+                                            name=f"command-{unitId}",
+                                            onCoalesced=self._onCoalesced)
+        self._idle = False
+        self._idleActivity = None
+        self._lastSetpoint = self.NEUTRAL_SETPOINT
+        self._lastActivity = time.monotonic()
+        self._skippedWrites = 0
+        self._wakeListeners = []
+        self._missionRunner = MissionRunner(appLogger, self.applySetpoint)
+        self._cmdTopic = UnitWhldCmdMsg(unitId).getTopic()
+        self._estopTopic = self.ESTOP_TOPIC.format(unitId=unitId)
+        self._rearmTopic = self.REARM_TOPIC.format(unitId=unitId)
+        self._tuningTopic = self.TUNING_TOPIC.format(unitId=unitId)
+        self._missionTopic = self.MISSION_TOPIC.format(unitId=unitId)
+
+    def getId(self) -> str:
+        """
+        Get the unit ID.
+
+        Return:
+            The unit ID.
+        """
+        return self._id
+
+    def getTuning(self) -> TuningStore:
+        """
+        Get the unit tuning store.
+
+        Return:
+            The unit tuning store.
+        """
+        return self._tuning
+
+    def getSubscriptions(self) -> tuple:
+        """
+        Get the unit subscriptions.
+
+        Return:
+            The ((topic, qos), callback) pairs of the unit.
+        """
+        return (((self._estopTopic, self.TOPIC_QOS), self.onEstopMsg),
+                ((self._rearmTopic, self.TOPIC_QOS), self.onRearmMsg),
+                (self._cmdTopic, self.onCommandMsg),
+                ((self._tuningTopic, self.TOPIC_QOS), self.onTuningMsg),
+                ((self._missionTopic, self.TOPIC_QOS), self.onMissionMsg))
+
+    def _applyTunables(self, previous: Tunables, tunables: Tunables) -> None:
+        """
+        Apply a new tuning to the control devices.
+
+        Params:
+            previous:   The previous tuning.
+            tunables:   The new tuning.
+        """
+        if self._steering is not None:
+            self._steering.setSetup(tunables.steering)
+            self._throttle.setSetup(tunables.throttle)
+
+    def applySetpoint(self, steeringMod: float, throttleMod: float) -> None:
+        """
+        Apply a steering/throttle setpoint with a single tuning snapshot.
+        Ignored while the emergency stop is latched, and not written at
+        neutral while idle.
+
+        Params:
+            steeringMod:    The steering modifier.
+            throttleMod:    The throttle modifier.
+        """
+        if self._estop.isLatched():
+            return
+        setpoint = (steeringMod, throttleMod)
+        neutral = setpoint == self.NEUTRAL_SETPOINT
+        # The setpoint writers only publish their activity and the main
+        # loop alone switches the mode in updateIdle, so no lock is taken
+        # here. The activity is published before the mode is read.
+        previous = self._lastSetpoint
+        if not neutral or setpoint != previous:
+            self._lastActivity = time.monotonic()
+        self._lastSetpoint = setpoint
+        if self._idle:
+            if neutral and previous == self.NEUTRAL_SETPOINT:
+                self._skippedWrites += 1
+                return
+            if not neutral:
+                for listener in self._wakeListeners:
+                    listener()
+        if self._mixer is not None:
+            self._mixer.apply(steeringMod, throttleMod)
+            self._estop.enforce()
+            return
+        tunables = self._tuning.get()
+        self._steering.modifyPosition(steeringMod, tunables.steering)
+        self._throttle.modifyPosition(throttleMod, tunables.throttle)
+        # A stop latched while writing must win over this setpoint.
+        self._estop.enforce()
+
+    def onCommandMsg(self, client, usrData, msg) -> None:
+        """
+        The on command message callback. The command is only posted to
+        the command worker.
+
+        Params:
+            client:     The client instance.
+            usrData:    The user data.
+            msg:        The received message.
+        """
+        self._commandWorker.post(msg)
+
+    def _handleCommand(self, msg, receivedTime: float) -> None:
+        """
+        Handle a command on the command worker. A live command overrides
+        the active mission.
+
+        Params:
+            msg:            The received message.
+            receivedTime:   The monotonic time the command was received.
+        """
+        self._logger.debug(f"received command message: {msg}")
+        self._recordDrops()
+        if self._estop.isLatched():
+            self._record(Recorder.KIND_DROP, receivedTime, time.monotonic(),
+                         float('nan'), float('nan'), Recorder.FLAG_ESTOP)
+            return
+        commandMsg = UnitWhldCmdMsg(self._id)
+        commandMsg.fromJson(msg)
+        if self._missionRunner.isActive():
+            self._missionRunner.override()
+        steeringMod = commandMsg.getSteering()
+        throttleMod = commandMsg.getThrottle()
+        self.applySetpoint(steeringMod, throttleMod)
+        appliedTime = time.monotonic()
+        self._cmdLatency.record(appliedTime - receivedTime)
+        if self._recorder is not None:
+            clamped = not (-1.0 <= steeringMod <= 1.0 and
+                           -1.0 <= throttleMod <= 1.0)
+            self._record(Recorder.KIND_COMMAND, receivedTime, appliedTime,
+                         steeringMod, throttleMod,
+                         Recorder.FLAG_CLAMPED if clamped else 0)
+
+    def _onCoalesced(self, postTime: float) -> None:
+        """
+        Keep a command superseded before being handled, to be recorded
+        by the command worker. Called on the MQTT thread, so it never
+        blocks and never touches the record file.
+
+        Params:
+            postTime:   The monotonic time the command was superseded.
+        """
+        if self._recorder is not None:
+            self._drops.append(postTime)
+
+    def _recordDrops(self) -> None:
+        """
+        Record the superseded commands kept since the last call.
+        """
+        while self._drops:
+            postTime = self._drops.popleft()
+            self._record(Recorder.KIND_DROP, postTime, postTime,
+                         float('nan'), float('nan'), Recorder.FLAG_COALESCED)
+
+    def _record(self, kind: int, time0: float, time1: float,
+                steeringMod: float, throttleMod: float,
+                flags: int = 0) -> None:
+        """
+        Record an event if recording is enabled.
+
+        Params:
+            kind:           The record kind.
+            time0:          The receive or publish monotonic time.
+            time1:          The write, drop or publish monotonic time.
+            steeringMod:    The steering modifier.
+            throttleMod:    The throttle modifier.
+            flags:          The record flags. Default: 0.
+        """
+        if self._recorder is not None:
+            self._recorder.record(kind, time0, time1, steeringMod,
+                                  throttleMod, flags)
+
+    def onEstopMsg(self, client, usrData, msg) -> None:
+        """
+        The on emergency stop message callback. Handled on the MQTT
+        thread, without decoding the payload. The stop latency is
+        measured from the callback entry, like the command latency.
+
+        Params:
+            client:     The client instance.
+            usrData:    The user data.
+            msg:        The received message.
+        """
+        self._estop.trigger(time.monotonic())
+        self._missionRunner.abort()
+
+    def onRearmMsg(self, client, usrData, msg) -> None:
+        """
+        The on re-arm message callback.
+
+        Params:
+            client:     The client instance.
+            usrData:    The user data.
+            msg:        The received message.
+        """
+        self._estop.rearm()
+
+    def onMissionMsg(self, client, usrData, msg) -> None:
+        """
+        The on mission message callback. The message can carry a mission
+        to load and an action: start, pause, resume or abort.
+
+        Params:
+            client:     The client instance.
+            usrData:    The user data.
+            msg:        The received message.
+        """
+        self._logger.debug(f"received mission message: {msg}")
+        try:
+            request = json.loads(msg)
+            if not isinstance(request, dict):
+                raise ValueError(f"mission request {request} is not an "
+                                 f"object")
+            if 'mission' in request:
+                self._missionRunner.load(Mission(request['mission']))
+            action = request.get('action')
+            if action == 'start':
+                self._missionRunner.begin()
+            elif action == 'pause':
+                self._missionRunner.pause()
+            elif action == 'resume':
+                self._missionRunner.resume()
+            elif action == 'abort':
+                self._missionRunner.abort()
+            elif action is not None:
+                self._logger.error(f"unsupported mission action: {action}")
+        except (AttributeError, ValueError, MissionInvalid,
+                MissionNotLoaded) as e:
+            self._logger.error(f"unable to handle mission message: {e}")
+
+    def onTuningMsg(self, client, usrData, msg) -> None:
+        """
+        The on tuning message callback.
+
+        Params:
+            client:     The client instance.
+            usrData:    The user data.
+            msg:        The received message.
+        """
+        self._logger.debug(f"received tuning message: {msg}")
+        try:
+            self._tuning.update(json.loads(msg))
+        except (ValueError, TuningApplyFailed, TuningInvalid) as e:
+            self._logger.error(f"unable to apply tuning: {e}")
+
+    def registerWakeListener(self, listener: callable) -> None:
+        """
+        Register a listener called when the unit leaves the idle mode.
+
+        Params:
+            listener:   The wake listener.
+        """
+        self._wakeListeners.append(listener)
+
+    def updateIdle(self, now: float) -> bool:
+        """
+        Enter the idle mode if the unit stayed at neutral, or stopped,
+        without setpoint changes for the idle delay, and leave it on the
+        first setpoint change. Only called by the main loop.
+
+        Params:
+            now:    The current monotonic time.
+
+        Return:
+            True if the unit is idle, False otherwise.
+        """
+        activity = self._lastActivity
+        if self._idle:
+            if activity != self._idleActivity:
+                self._idle = False
+                self._logger.info('leaving idle mode')
+        elif now - activity >= self._tuning.get().idleDelay and \
+                (self._lastSetpoint == self.NEUTRAL_SETPOINT or
+                 self._estop.isLatched()):
+            self._idleActivity = activity
+            self._idle = True
+            # A setpoint published meanwhile has not seen the idle mode.
+            if self._lastActivity != activity:
+                self._idle = False
+            else:
+                self._logger.info('entering idle mode')
+        return self._idle
+
+    def isIdle(self) -> bool:
+        """
+        Check if the unit is idle.
+
+        Return:
+            True if the unit is idle, False otherwise.
+        """
+        return self._idle
+
+    def getLatencyStats(self) -> dict:
+        """
+        Get the command and emergency stop latency statistics.
+
+        Return:
+            The latency statistics and the coalesced command count.
+        """
+        return {'command': self._cmdLatency.getStats(),
+                'estop': self._estop.getLatencyStats(),
+                'coalesced': self._commandWorker.getCoalescedCount()}
+
+    def getStatePeriod(self) -> float:
+        """
+        Get the unit state update period of the current mode.
+
+        Return:
+            The state update period in seconds.
+        """
+        tunables = self._tuning.get()
+        if self._idle:
+            return tunables.idleStatePeriod
+        return tunables.stateUpdatePeriod
+
+    def getCxnStateMsg(self) -> UnitCxnStateMsg:
+        """
+        Get the online connection state message.
+
+        Return:
+            The connection state message.
+        """
+        cxnStateMsg = UnitCxnStateMsg(self._id)
+        cxnStateMsg.setAsOnline()
+        return cxnStateMsg
+
+    def getStateMsg(self) -> UnitWhldStateMsg:
+        """
+        Get the unit state message to publish.
+
+        Return:
+            The unit state message.
+        """
+        if self._mixer is not None:
+            steeringMod, throttleMod = self._mixer.getAxes()
+        else:
+            steeringMod = self._steering.getModifier()
+            throttleMod = self._throttle.getModifier()
+        unitStateMsg = UnitWhldStateMsg(self._id)
+        unitStateMsg.setSteering(steeringMod)
+        unitStateMsg.setThrottle(throttleMod)
+        return unitStateMsg
+
+    def onStatePublished(self, unitStateMsg: UnitWhldStateMsg,
+                         queuedTime: float, publishedTime: float) -> None:
+        """
+        Record a published unit state. Called by the publish queue once
+        the state is published, never for a shed state.
+
+        Params:
+            unitStateMsg:   The published unit state message.
+            queuedTime:     The monotonic time the state was queued.
+            publishedTime:  The monotonic time the state was published.
+        """
+        self._record(Recorder.KIND_STATE, queuedTime, publishedTime,
+                     unitStateMsg.getSteering(), unitStateMsg.getThrottle())
+
+    def start(self) -> None:
+        """
+        Start the unit workers.
+        """
+        self._commandWorker.start()
+        self._missionRunner.start()
+        if self._tuningWatcher is not None:
+            self._tuningWatcher.start()
+
+    def stop(self) -> None:
+        """
+        Stop the unit workers, set the devices to neutral and release
+        the unit channels.
+        """
+        self._logger.info('stopping unit')
+        self._commandWorker.stop()
+        self._missionRunner.stop()
+        if self._tuningWatcher is not None:
+            self._tuningWatcher.stop()
+        if self._mixer is not None:
+            self._logger.info(f"clamped commands: "
+                              f"{self._mixer.getClampCount()}")
+        else:
+            self._logger.info(f"clamped commands: "
+                              f"steering {self._steering.getClampCount()}, "
+                              f"throttle {self._throttle.getClampCount()}")
+        self._logger.info(f"latency: {self.getLatencyStats()}")
+        self._logger.info(f"skipped idle writes: {self._skippedWrites}")
+        if self._mixer is not None:
+            ControlDevice.setAllToNeutral(self._mixer.getDevices())
+        else:
+            self._steering.setToNeutral()
+            self._throttle.setToNeutral()
+        ControlDevice.channels.release(self._id)
+        if self._recorder is not None:
+            self._recordDrops()
+            self._recorder.close()
@@ -0,0 +1,76 @@
+import logging
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+import os
+import sys
+
+sys.path.append(os.path.abspath('./src'))
+
+from pkgs.analytics import RecordFileInvalid, loadRecords  # noqa: E402
+from pkgs.recorder import Recorder                          # noqa: E402
+
+
+class TestRecords(TestCase):
+    """
+    Record file loading test cases.
+    """
+    def setUp(self):
+        """
+        Test cases setup.
+        """
+        self.tmpDir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpDir.name, 'unit-1.rec')
+
+    def tearDown(self):
+        """
+        Test cases teardown.
+        """
+        self.tmpDir.cleanup()
+
+    def test_loadRecords(self):
+        """
+        The loadRecords function must map the recorded records.
+        """
+        recorder = Recorder(logging, self.path)
+        recorder.record(Recorder.KIND_COMMAND, 1.0, 1.5, 0.25, -0.5,
+                        Recorder.FLAG_CLAMPED)
+        recorder.record(Recorder.KIND_STATE, 2.0, 2.0, 0.25, -0.5)
+        recorder.close()
+        records = loadRecords(self.path)
+        self.assertIsInstance(records, np.memmap)
+        self.assertEqual(records['kind'].tolist(),
+                         [Recorder.KIND_COMMAND, Recorder.KIND_STATE])
+        self.assertEqual(records['flags'].tolist(),
+                         [Recorder.FLAG_CLAMPED, 0])
+        self.assertEqual(records['seq'].tolist(), [0, 1])
+        self.assertEqual(records['time1'].tolist(), [1.5, 2.0])
+        self.assertEqual(records['throttle'].tolist(), [-0.5, -0.5])
+
+    def test_loadRecordsTruncated(self):
+        """
+        The loadRecords function must ignore a truncated trailing record
+        and load a file without records.
+        """
+        recorder = Recorder(logging, self.path)
+        recorder.close()
+        self.assertEqual(len(loadRecords(self.path)), 0)
+        recorder = Recorder(logging, self.path)
+        recorder.record(Recorder.KIND_STATE, 2.0, 2.0, 0.0, 0.0)
+        recorder.close()
+        with open(self.path, 'ab') as recordFile:
+            recordFile.write(b'\x00' * 5)
+        self.assertEqual(len(loadRecords(self.path)), 1)
+
+    def test_loadRecordsInvalid(self):
+        """
+        The loadRecords function must raise a RecordFileInvalid exception
+        if the header is not valid.
+        """
+        for header in (b'RC', b'NOPE\x01\x00\x20\x00',
+                       b'RCOP\x02\x00\x20\x00'):
+            with open(self.path, 'wb') as recordFile:
+                recordFile.write(header)
+            with self.assertRaises(RecordFileInvalid):
+                loadRecords(self.path)
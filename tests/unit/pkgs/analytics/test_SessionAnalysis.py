@@ -0,0 +1,85 @@
+from unittest import TestCase
+
+import numpy as np
+import os
+import sys
+
+sys.path.append(os.path.abspath('./src'))
+
+from pkgs.analytics import RECORD_DTYPE, analyzeSession, \
+    formatReport                                    # noqa: E402
+from pkgs.recorder import Recorder                  # noqa: E402
+
+
+class TestSessionAnalysis(TestCase):
+    """
+    Session analysis test cases.
+    """
+    def _records(self, rows):
+        """
+        Build session records from (kind, flags, time0, time1) rows.
+        """
+        records = np.zeros(len(rows), dtype=RECORD_DTYPE)
+        for index, (kind, flags, time0, time1) in enumerate(rows):
+            records[index] = (kind, flags, b'', index, time0, time1,
+                              0.0, 0.0)
+        return records
+
+    def test_analyzeSession(self):
+        """
+        The analyzeSession function must compute the command rate,
+        jitter, latencies, state lag and clamp and drop statistics.
+        """
+        command = Recorder.KIND_COMMAND
+        state = Recorder.KIND_STATE
+        drop = Recorder.KIND_DROP
+        records = self._records(
+            [(command, 0, 0.0, 0.001),
+             (state, 0, 0.005, 0.005),
+             (command, Recorder.FLAG_CLAMPED, 0.01, 0.012),
+             (drop, Recorder.FLAG_COALESCED, 0.015, 0.015),
+             (command, 0, 0.02, 0.023),
+             (state, 0, 0.03, 0.035),
+             (command, 0, 0.04, 0.044),
+             (drop, Recorder.FLAG_ESTOP, 0.05, 0.0501)])
+        testResult = analyzeSession(records, percentiles=(50, 100))
+        self.assertEqual(testResult['records'], 8)
+        self.assertAlmostEqual(testResult['duration'], 0.0501)
+        self.assertEqual(testResult['commands'], 4)
+        self.assertEqual(testResult['states'], 2)
+        self.assertAlmostEqual(testResult['commandRate'], 75.0)
+        self.assertAlmostEqual(testResult['interval']['mean'], 0.04 / 3)
+        self.assertAlmostEqual(testResult['jitter']['p50'], 0.0)
+        self.assertAlmostEqual(testResult['jitter']['max'], 0.01)
+        self.assertAlmostEqual(testResult['latency']['p50'], 0.0025)
+        self.assertAlmostEqual(testResult['latency']['p100'], 0.004)
+        self.assertAlmostEqual(testResult['stateLag']['max'], 0.025)
+        self.assertAlmostEqual(testResult['stateLag']['p50'], 0.015)
+        self.assertEqual(testResult['clamped'], 1)
+        self.assertEqual(testResult['clampRatio'], 0.25)
+        self.assertEqual(testResult['dropped'],
+                         {'coalesced': 1, 'estop': 1})
+        self.assertAlmostEqual(testResult['dropRatio'], 2 / 6)
+
+    def test_analyzeSessionEmpty(self):
+        """
+        The analyzeSession function must handle a session without
+        records.
+        """
+        testResult = analyzeSession(np.empty(0, dtype=RECORD_DTYPE))
+        self.assertEqual(testResult['commands'], 0)
+        self.assertIsNone(testResult['commandRate'])
+        self.assertIsNone(testResult['latency'])
+        self.assertIsNone(testResult['dropRatio'])
+        self.assertIn('rate n/a', formatReport('empty', testResult))
+
+    def test_formatReport(self):
+        """
+        The formatReport function must format the session summary.
+        """
+        records = self._records([(Recorder.KIND_COMMAND, 0, 0.0, 0.001),
+                                 (Recorder.KIND_COMMAND, 0, 0.01, 0.011)])
+        testResult = formatReport('unit-1', analyzeSession(records))
+        self.assertTrue(testResult.startswith('session unit-1'))
+        self.assertIn('rate 100.00 Hz', testResult)
+        self.assertIn('latency:        p50 1.000 ms', testResult)
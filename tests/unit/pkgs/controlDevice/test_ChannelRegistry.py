@@ -0,0 +1,56 @@
+from unittest import TestCase
+
+import os
+import sys
+
+sys.path.append(os.path.abspath('./src'))
+
+from pkgs.controlDevice import ChannelRegistry, \
+    ControlDeviceChannelUnavailable     # noqa: E402
+
+
+class TestChannelRegistry(TestCase):
+    """
+    Channel registry test cases.
+    """
+    def setUp(self):
+        """
+        Test cases setup.
+        """
+        self.registry = ChannelRegistry(16)
+        self.registry.claim('unit-1', (0, 1))
+
+    def test_claim(self):
+        """
+        The claim method must give the channels to their owner, also
+        when the owner already has some of them.
+        """
+        self.registry.claim('unit-1', (1, 2))
+        self.assertEqual(self.registry.getChannelCount(), 16)
+        for channel in (0, 1, 2):
+            self.assertEqual(self.registry.getOwner(channel), 'unit-1')
+        self.assertIsNone(self.registry.getOwner(3))
+
+    def test_claimUnavailable(self):
+        """
+        The claim method must raise a ControlDeviceChannelUnavailable
+        exception and claim nothing if a channel does not exist or is
+        used by another owner.
+        """
+        for channels in ((2, 1), (2, 16), (2, -1), (2, '3')):
+            with self.assertRaises(ControlDeviceChannelUnavailable):
+                self.registry.claim('unit-2', channels)
+            self.assertIsNone(self.registry.getOwner(2))
+        self.assertEqual(self.registry.getOwner(1), 'unit-1')
+
+    def test_release(self):
+        """
+        The release method must only release the channels of the owner.
+        """
+        self.registry.claim('unit-2', (2, 3))
+        self.registry.release('unit-1', (0, 2))
+        self.assertIsNone(self.registry.getOwner(0))
+        self.assertEqual(self.registry.getOwner(2), 'unit-2')
+        self.registry.release('unit-2')
+        self.assertIsNone(self.registry.getOwner(3))
+        self.assertEqual(self.registry.getOwner(1), 'unit-1')
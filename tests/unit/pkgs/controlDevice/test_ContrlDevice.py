@@ -1,6 +1,6 @@
 import logging
 from unittest import TestCase
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, call, patch
 
 import os
 import sys
@@ -25,7 +25,7 @@ class TestControlDevice(TestCase):
         self.mockedEsc = Mock(angle=ControlDevice.MAX_ROTATION)
         self.mockedServos = [self.mockedServo, self.mockedEsc]
         mockedServoKit = Mock()
-        mockedServoKit.return_value = self.mockedServos
+        mockedServoKit.return_value = Mock(servo=self.mockedServos)
         ControlDevice.initServoKit(mockedServoKit)
         self.ctrlDev = ControlDevice(logging)
 
@@ -37,7 +37,7 @@ class TestControlDevice(TestCase):
         expectedChan = 8
         expectedFreq = 90
         mockedServoKit = Mock()
-        mockedServoKit.return_value = self.mockedServos
+        mockedServoKit.return_value = Mock(servo=self.mockedServos)
         ControlDevice.initServoKit(mockedServoKit)
         mockedServoKit.assert_called_with(channels=expectedChan,
                                           frequency=expectedFreq)
@@ -49,12 +49,42 @@ class TestControlDevice(TestCase):
         mockedServoKit.assert_called_with(channels=expectedChan,
                                           frequency=expectedFreq)
 
+    def test_initBackend(self):
+        """
+        The initBackend class method must set the backend driving
+        the devices.
+        """
+        mockedBackend = Mock()
+        ControlDevice.initBackend(mockedBackend)
+        ctrlDev = ControlDevice(logging, servoType=ControlDevice.TYPE_ESC)
+        mockedBackend.setAngle.assert_called_once_with(
+            ControlDevice.CHANNELS[ControlDevice.TYPE_ESC],
+            ControlDevice.DEFAULT_CENTER)
+        self.assertIs(ctrlDev.backend, mockedBackend)
+
+    def test_setAllToNeutral(self):
+        """
+        The setAllToNeutral class method must set every device to
+        neutral, in order, with one bulk backend write.
+        """
+        mockedBackend = Mock()
+        ControlDevice.initBackend(mockedBackend)
+        steering = ControlDevice(logging, motionRange=(10, 50, 90))
+        esc = ControlDevice(logging, servoType=ControlDevice.TYPE_ESC)
+        steering.modifyPosition(0.5)
+        esc.modifyPosition(-0.5)
+        ControlDevice.setAllToNeutral((esc, steering))
+        mockedBackend.setAngles.assert_called_once_with(
+            ((1, ControlDevice.DEFAULT_CENTER), (0, 50)))
+        self.assertEqual(steering.getModifier(), 0.0)
+        self.assertEqual(esc.getModifier(), 0.0)
+
     def test_constructorServoUninitialized(self):
         """
         The constructor must raise a ServoKitUninitialized exception
         if the servo kit is not initialized.
         """
-        ControlDevice.servos = None
+        ControlDevice.backend = None
         with self.assertRaises(ServoKitUninitialized) as context:
             ctlrDev = ControlDevice(logging)                   # noqa: F841
             self.assertTrue(isinstance(context.exception,
@@ -90,6 +120,19 @@ class TestControlDevice(TestCase):
         self.assertEqual(self.mockedEsc.angle,
                          ctrlDev.DEFAULT_CENTER)
 
+    def test_contructorChannel(self):
+        """
+        The constructor must use the requested channel instead of the
+        device type default channel.
+        """
+        mockedBackend = Mock()
+        ControlDevice.initBackend(mockedBackend)
+        ctrlDev = ControlDevice(logging, servoType=ControlDevice.TYPE_ESC,
+                                channel=5)
+        self.assertEqual(ctrlDev.getChannel(), 5)
+        mockedBackend.setAngle.assert_called_once_with(
+            5, ControlDevice.DEFAULT_CENTER)
+
     def test_validateMotionRangeMin(self):
         """
         The _validateMotionRange method must raise a
@@ -199,12 +242,14 @@ class TestControlDevice(TestCase):
                        ControlDevice.DEFAULT_CENTER]
         for nonValidValue in nonValidValues:
             with self.assertRaises(ContrelDevicePositionRange) as context:
-                self.ctrlDev._validatePosition(nonValidValue)
+                self.ctrlDev._validatePosition(nonValidValue,
+                                               self.ctrlDev.getMotionRange())
                 self.assertTrue(isinstance(context.exception,
                                 ContrelDevicePositionRange))
         for validValue in validValues:
             try:
-                self.ctrlDev._validatePosition(validValue)
+                self.ctrlDev._validatePosition(validValue,
+                                               self.ctrlDev.getMotionRange())
             except Exception:
                 self.fail('The DeviceControl _validatePosition failed to '
                           'raise an exception only if the position is out '
@@ -229,6 +274,61 @@ class TestControlDevice(TestCase):
         testResult = self.ctrlDev.getMotionRange()
         self.assertEqual(testResult, testRange)
 
+    def test_getType(self):
+        """
+        The getType method must return the device type.
+        """
+        self.assertEqual(self.ctrlDev.getType(), ControlDevice.TYPE_DIRECT)
+        ctrlDev = ControlDevice(logging, servoType=ControlDevice.TYPE_ESC)
+        self.assertEqual(ctrlDev.getType(), ControlDevice.TYPE_ESC)
+
+    def test_setSetup(self):
+        """
+        The setSetup method must validate and update the channel and
+        the motion range at once.
+        """
+        testSetup = (1, (10, 50, 90))
+        with patch.object(self.ctrlDev, '_validateMotionRange') \
+                as mockedValMotionRange:
+            self.ctrlDev.setSetup(testSetup)
+            mockedValMotionRange.assert_called_once_with(testSetup[1])
+        self.assertEqual(self.ctrlDev.getSetup(), testSetup)
+        self.assertEqual(self.ctrlDev.getChannel(), 1)
+        self.assertEqual(self.ctrlDev.getMotionRange(), testSetup[1])
+
+    def test_setSetupChannelMove(self):
+        """
+        The setSetup method must set the previous channel to neutral
+        and center the new one when the channel changes.
+        """
+        mockedBackend = Mock()
+        ControlDevice.initBackend(mockedBackend)
+        esc = ControlDevice(logging, ControlDevice.TYPE_ESC, channel=1)
+        esc.modifyPosition(0.8)
+        mockedBackend.reset_mock()
+        esc.setSetup((3, (10, 50, 90)))
+        mockedBackend.setAngles.assert_called_once_with(
+            ((1, ControlDevice.DEFAULT_CENTER), (3, 50)))
+        self.assertEqual(esc.getModifier(), 0.0)
+        mockedBackend.reset_mock()
+        esc.setSetup((3, (20, 60, 100)))
+        mockedBackend.setAngles.assert_not_called()
+
+    def test_modifyPositionStaleChannel(self):
+        """
+        The modifyPosition method must set a channel back to neutral if
+        the device moved off it during the write.
+        """
+        mockedBackend = Mock()
+        ControlDevice.initBackend(mockedBackend)
+        esc = ControlDevice(logging, ControlDevice.TYPE_ESC, channel=1)
+        staleSetup = esc.getSetup()
+        esc.setSetup((3, staleSetup[1]))
+        mockedBackend.reset_mock()
+        esc.modifyPosition(0.5, staleSetup)
+        self.assertEqual(mockedBackend.setAngle.call_args_list,
+                         [call(1, 135), call(1, ControlDevice.DEFAULT_CENTER)])
+
     def test_getModifier(self):
         """
         The getModifier method must return the current modifier.
@@ -247,7 +347,8 @@ class TestControlDevice(TestCase):
         with patch.object(self.ctrlDev, '_validatePosition') \
                 as mockedValPosition:
             self.ctrlDev.modifyPosition(testModifier)
-            mockedValPosition.assert_called_once_with(expectedPosition)
+            mockedValPosition.assert_called_once_with(
+                expectedPosition, self.ctrlDev.getMotionRange())
 
     def test_modifyPositionUpdateServo(self):
         """
@@ -257,9 +358,69 @@ class TestControlDevice(TestCase):
         for testModifier in testModifiers:
             expectedPosition = int(90 + (90 * testModifier))
             self.ctrlDev.modifyPosition(testModifier)
-            testResult = self.ctrlDev.servos[ControlDevice.CHANNELS[ControlDevice.TYPE_DIRECT]].angle      # noqa: E501
+            testResult = self.mockedServos[ControlDevice.CHANNELS[ControlDevice.TYPE_DIRECT]].angle      # noqa: E501
             self.assertEqual(testResult, expectedPosition)
 
+    def test_modifyPositionSetup(self):
+        """
+        The modifyPosition method must use the given setup instead of
+        the device setup.
+        """
+        testSetup = (0, (10, 50, 90))
+        self.ctrlDev.modifyPosition(0.5, testSetup)
+        self.assertEqual(self.mockedServo.angle, 70)
+        self.assertEqual(self.ctrlDev.getSetup(),
+                         (0, (ControlDevice.MIN_ROTATION,
+                              ControlDevice.DEFAULT_CENTER,
+                              ControlDevice.MAX_ROTATION)))
+
+    def test_modifyPositionZero(self):
+        """
+        The modifyPosition method must set the center position for
+        a zero modifier.
+        """
+        self.ctrlDev.modifyPosition(0.5)
+        self.ctrlDev.modifyPosition(0)
+        self.assertEqual(self.mockedServo.angle, ControlDevice.DEFAULT_CENTER)
+        self.assertEqual(self.ctrlDev.getModifier(), 0)
+
+    def test_modifyPositionOutOfRange(self):
+        """
+        The modifyPosition method must raise a ContrelDevicePositionRange
+        exception for an out of range modifier if not saturating.
+        """
+        with self.assertRaises(ContrelDevicePositionRange):
+            self.ctrlDev.modifyPosition(1.5)
+        self.assertEqual(self.ctrlDev.getClampCount(), 0)
+
+    def test_modifyPositionSaturate(self):
+        """
+        The modifyPosition method must saturate the out of range
+        modifiers and count the clamp events if saturating.
+        """
+        ctrlDev = ControlDevice(logging, saturate=True)
+        testModifiers = [(1.5, 1.0, ControlDevice.MAX_ROTATION),
+                         (-7, -1.0, ControlDevice.MIN_ROTATION),
+                         (float('nan'), 0.0, ControlDevice.DEFAULT_CENTER),
+                         (0.5, 0.5, 135),
+                         (0, 0, ControlDevice.DEFAULT_CENTER)]
+        for testModifier, expectedModifier, expectedPosition \
+                in testModifiers:
+            ctrlDev.modifyPosition(testModifier)
+            self.assertEqual(ctrlDev.getModifier(), expectedModifier)
+            self.assertEqual(self.mockedServo.angle, expectedPosition)
+        self.assertEqual(ctrlDev.getClampCount(), 3)
+
+    def test_modifyPositionSaturateNoValidate(self):
+        """
+        The modifyPosition method must not validate the position
+        if saturating.
+        """
+        ctrlDev = ControlDevice(logging, saturate=True)
+        with patch.object(ctrlDev, '_validatePosition') as mockedValPosition:
+            ctrlDev.modifyPosition(2.0)
+            mockedValPosition.assert_not_called()
+
     def test_getPositon(self):
         """
         The getPosition method must return the current position.
@@ -278,4 +439,4 @@ class TestControlDevice(TestCase):
         self.ctrlDev.modifyPosition(testModifier)
         self.ctrlDev.setToNeutral()
         testResult = self.ctrlDev.getPosition()
-        self.assertEqual(testResult, self.ctrlDev._center)
+        self.assertEqual(testResult, self.ctrlDev.getMotionRange()[1])
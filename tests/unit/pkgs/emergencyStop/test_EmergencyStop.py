@@ -0,0 +1,84 @@
+import logging
+import time
+from unittest import TestCase
+from unittest.mock import Mock
+
+import os
+import sys
+
+sys.path.append(os.path.abspath('./src'))
+
+from pkgs.controlDevice import ControlDevice    # noqa: E402
+from pkgs.emergencyStop import EmergencyStop    # noqa: E402
+
+
+class TestEmergencyStop(TestCase):
+    """
+    Emergency stop test cases.
+    """
+    def setUp(self):
+        """
+        Test cases setup.
+        """
+        self.mockedBackend = Mock()
+        ControlDevice.initBackend(self.mockedBackend)
+        self.esc = ControlDevice(logging, ControlDevice.TYPE_ESC,
+                                 (0, 90, 180), channel=3)
+        self.steering = ControlDevice(logging, motionRange=(10, 50, 90),
+                                      channel=2)
+        self.estop = EmergencyStop(logging, (self.esc, self.steering))
+
+    def tearDown(self):
+        """
+        Test cases teardown.
+        """
+        ControlDevice.backend = None
+
+    def test_trigger(self):
+        """
+        The trigger method must latch the stop and set the devices to
+        neutral, in order, with one bulk write.
+        """
+        self.assertFalse(self.estop.isLatched())
+        self.estop.trigger(time.monotonic())
+        self.assertTrue(self.estop.isLatched())
+        self.mockedBackend.setAngles.assert_called_once_with(
+            ((3, 90), (2, 50)))
+        testResult = self.estop.getLatencyStats()
+        self.assertEqual(testResult['count'], 1)
+        self.assertGreaterEqual(testResult['last'], 0.0)
+
+    def test_triggerBackendFailure(self):
+        """
+        The trigger method must log a backend failure without raising
+        and keep the stop latched.
+        """
+        mockedLogger = Mock()
+        estop = EmergencyStop(mockedLogger, (self.esc, self.steering))
+        self.mockedBackend.setAngles.side_effect = OSError(121,
+                                                           'Remote I/O error')
+        estop.trigger(time.monotonic())
+        self.assertTrue(estop.isLatched())
+        mockedLogger.getLogger.return_value.error.assert_called_once()
+        self.assertEqual(estop.getLatencyStats()['count'], 0)
+
+    def test_enforce(self):
+        """
+        The enforce method must only set the devices to neutral while
+        the stop is latched.
+        """
+        self.estop.enforce()
+        self.mockedBackend.setAngles.assert_not_called()
+        self.estop.trigger()
+        self.estop.enforce()
+        self.assertEqual(self.mockedBackend.setAngles.call_count, 2)
+
+    def test_rearm(self):
+        """
+        The rearm method must release the latched stop.
+        """
+        self.estop.trigger()
+        self.estop.rearm()
+        self.assertFalse(self.estop.isLatched())
+        self.estop.enforce()
+        self.assertEqual(self.mockedBackend.setAngles.call_count, 1)
@@ -0,0 +1,36 @@
+from unittest import TestCase
+
+import os
+import sys
+
+sys.path.append(os.path.abspath('./src'))
+
+from pkgs.latencyStats import LatencyStats  # noqa: E402
+
+
+class TestLatencyStats(TestCase):
+    """
+    Latency statistics test cases.
+    """
+    def test_getStatsEmpty(self):
+        """
+        The getStats method must return empty statistics when no latency
+        was recorded.
+        """
+        self.assertEqual(LatencyStats().getStats(),
+                         {'count': 0, 'mean': None, 'max': None,
+                          'last': None})
+
+    def test_record(self):
+        """
+        The record method must update the count, mean, max and last
+        latency.
+        """
+        stats = LatencyStats()
+        for latency in (0.2, 0.4, 0.3):
+            stats.record(latency)
+        testResult = stats.getStats()
+        self.assertEqual(testResult['count'], 3)
+        self.assertAlmostEqual(testResult['mean'], 0.3)
+        self.assertEqual(testResult['max'], 0.4)
+        self.assertEqual(testResult['last'], 0.3)
@@ -0,0 +1,104 @@
+import logging
+from unittest import TestCase
+
+import os
+import sys
+
+sys.path.append(os.path.abspath('./src'))
+
+from pkgs.linkMonitor import LinkMonitor    # noqa: E402
+
+
+class TestLinkMonitor(TestCase):
+    """
+    Link monitor test cases.
+    """
+    def setUp(self):
+        """
+        Test cases setup.
+        """
+        self.monitor = LinkMonitor(logging, targetLatency=0.05, maxScale=8,
+                                   adjustPeriod=0.5)
+        self.monitor.update(0.0, 0)
+
+    def test_recordLatency(self):
+        """
+        The recordLatency method must average the latencies.
+        """
+        self.assertIsNone(self.monitor.getLatency())
+        self.monitor.recordLatency(0.1)
+        self.assertEqual(self.monitor.getLatency(), 0.1)
+        self.monitor.recordLatency(0.2)
+        self.assertAlmostEqual(self.monitor.getLatency(),
+                               0.1 + LinkMonitor.LATENCY_ALPHA * 0.1)
+
+    def test_updateAdjustPeriod(self):
+        """
+        The update method must adjust the scale at most once per
+        adjust period.
+        """
+        self.monitor.recordLatency(1.0)
+        self.assertEqual(self.monitor.update(0.4, 0), 1.0)
+        self.assertEqual(self.monitor.update(0.5, 0), 2.0)
+        self.assertEqual(self.monitor.update(0.6, 0), 2.0)
+
+    def test_updateBackoffLatency(self):
+        """
+        The update method must back off up to the maximal scale
+        while the latency is above target.
+        """
+        self.monitor.recordLatency(0.2)
+        scales = [self.monitor.update(0.5 * step, 0)
+                  for step in range(1, 6)]
+        self.assertEqual(scales, [2.0, 4.0, 8.0, 8.0, 8.0])
+
+    def test_updateBackoffShed(self):
+        """
+        The update method must back off when telemetry is shed even
+        with a healthy latency.
+        """
+        self.monitor.recordLatency(0.01)
+        self.assertEqual(self.monitor.update(0.5, 3), 2.0)
+        self.monitor.recordLatency(0.01)
+        self.assertEqual(self.monitor.update(1.0, 3), 2.0 *
+                         LinkMonitor.RECOVERY_FACTOR)
+
+    def test_updateRecovery(self):
+        """
+        The update method must recover down to a scale of 1 only while
+        healthy completions are measured.
+        """
+        self.monitor.recordLatency(0.2)
+        self.monitor.update(0.5, 0)
+        self.monitor.update(1.0, 0)
+        for _ in range(20):
+            self.monitor.recordLatency(0.0)
+        step = 3
+        self.assertEqual(self.monitor.update(0.5 * step, 0),
+                         4.0 * LinkMonitor.RECOVERY_FACTOR)
+        while self.monitor.getScale() > 1.0:
+            step += 1
+            self.monitor.recordLatency(0.0)
+            self.monitor.update(0.5 * step, 0)
+        self.assertEqual(self.monitor.getScale(), 1.0)
+
+    def test_updateNoSamples(self):
+        """
+        The update method must not recover without new completions.
+        """
+        self.monitor.recordLatency(0.2)
+        self.monitor.update(0.5, 0)
+        self.monitor._latency = 0.0
+        self.monitor.update(1.0, 0)
+        self.assertEqual(self.monitor.getScale(), 2.0)
+
+    def test_updateBackoffPendingAge(self):
+        """
+        The update method must back off while the oldest pending
+        publication is older than the target, even with a healthy
+        averaged latency.
+        """
+        self.monitor.recordLatency(0.01)
+        self.assertEqual(self.monitor.update(0.5, 0, pendingAge=0.2), 2.0)
+        self.assertEqual(self.monitor.update(1.0, 0, pendingAge=0.7), 4.0)
+        self.assertEqual(self.monitor.update(1.5, 0, pendingAge=0.01), 4.0)
@@ -0,0 +1,78 @@
+from unittest import TestCase
+
+import os
+import sys
+
+sys.path.append(os.path.abspath('./src'))
+
+from pkgs.mission import Mission, MissionInvalid   # noqa: E402
+
+
+class TestMission(TestCase):
+    """
+    Mission class test cases.
+    """
+    def setUp(self):
+        """
+        Test cases setup.
+        """
+        self.mission = Mission({'rate': 10,
+                                'points': [[0, 0, 0],
+                                           [1, 1, 0.5],
+                                           [1.5, -1, 0.5]]})
+
+    def test_constructorInvalid(self):
+        """
+        The constructor must raise a MissionInvalid exception if
+        the mission description is not valid.
+        """
+        validPoints = [[0, 0, 0], [1, 0, 0]]
+        invalidDescriptions = [{},
+                               {'rate': 10},
+                               {'rate': 10, 'points': 'PROUT'},
+                               {'rate': 0, 'points': validPoints},
+                               {'rate': True, 'points': validPoints},
+                               {'rate': float('nan'), 'points': validPoints},
+                               {'rate': Mission.MAX_RATE + 1,
+                                'points': validPoints},
+                               {'rate': 10, 'points': [[0, 0, 0]]},
+                               {'rate': 10, 'points': [[0, 0], [1, 0]]},
+                               {'rate': 10, 'points': [[1, 0, 0], [2, 0, 0]]},
+                               {'rate': 10, 'points': [[0, 0, 0], [0, 0, 0]]},
+                               {'rate': 10, 'points': [[0, 0, 0], [1, 2, 0]]},
+                               {'rate': 10, 'points': [[0, 0, 0],
+                                                       [1, 0, -1.1]]},
+                               {'rate': Mission.MAX_RATE,
+                                'points': [[0, 0, 0], [3600, 0, 0]]}]
+        for invalidDescription in invalidDescriptions:
+            with self.assertRaises(MissionInvalid):
+                Mission(invalidDescription)
+
+    def test_rate(self):
+        """
+        The getRate and getPeriod methods must return the mission
+        rate and setpoint period.
+        """
+        self.assertEqual(self.mission.getRate(), 10)
+        self.assertEqual(self.mission.getPeriod(), 0.1)
+
+    def test_setpointCount(self):
+        """
+        The mission must have one setpoint per period up to the last
+        point included.
+        """
+        self.assertEqual(len(self.mission), 16)
+
+    def test_setpointInterpolation(self):
+        """
+        The setpoints must be linearly interpolated between the points.
+        """
+        expectedSetpoints = {0: (0, 0),
+                             5: (0.5, 0.25),
+                             10: (1, 0.5),
+                             12: (0.2, 0.5),
+                             15: (-1, 0.5)}
+        for index, expectedSetpoint in expectedSetpoints.items():
+            steering, throttle = self.mission.getSetpoint(index)
+            self.assertAlmostEqual(steering, expectedSetpoint[0])
+            self.assertAlmostEqual(throttle, expectedSetpoint[1])
@@ -0,0 +1,140 @@
+import logging
+import threading
+import time
+from unittest import TestCase
+
+import os
+import sys
+
+sys.path.append(os.path.abspath('./src'))
+
+from pkgs.mission import Mission, MissionNotLoaded, \
+    MissionRunner  # noqa: E402
+
+
+class TestMissionRunner(TestCase):
+    """
+    Mission runner test cases.
+    """
+    def setUp(self):
+        """
+        Test cases setup.
+        """
+        self.setpoints = []
+        self.done = threading.Event()
+        self.runner = MissionRunner(logging, self._actuate)
+        self.runner.start()
+        self.mission = Mission({'rate': 100,
+                                'points': [[0, 0, 0], [0.1, 1, -1]]})
+
+    def tearDown(self):
+        """
+        Test cases tear down.
+        """
+        self.runner.stop()
+        self.runner.join(1)
+
+    def _actuate(self, steering, throttle):
+        """
+        Record the applied setpoints.
+        """
+        self.setpoints.append((steering, throttle, time.monotonic()))
+        if len(self.setpoints) == len(self.mission):
+            self.done.set()
+
+    def _waitIdle(self):
+        """
+        Wait for the runner to go back to idle.
+        """
+        deadline = time.monotonic() + 2
+        while self.runner.isActive() and time.monotonic() < deadline:
+            time.sleep(0.005)
+
+    def test_beginNotLoaded(self):
+        """
+        The begin method must raise a MissionNotLoaded exception
+        if no mission is loaded.
+        """
+        with self.assertRaises(MissionNotLoaded):
+            self.runner.begin()
+
+    def test_runMission(self):
+        """
+        The runner must apply every setpoint at the mission rate.
+        """
+        self.runner.load(self.mission)
+        self.assertEqual(self.runner.getState(), MissionRunner.STATE_IDLE)
+        self.runner.begin()
+        self.assertTrue(self.done.wait(2))
+        self._waitIdle()
+        self.assertEqual(self.runner.getState(), MissionRunner.STATE_IDLE)
+        self.assertEqual([setpoint[:2] for setpoint in self.setpoints],
+                         [self.mission.getSetpoint(index)
+                          for index in range(len(self.mission))])
+        duration = self.setpoints[-1][2] - self.setpoints[0][2]
+        self.assertGreaterEqual(duration, 0.1 - 0.005)
+
+    def test_pauseResume(self):
+        """
+        The runner must not apply any setpoint while paused and
+        continue from the paused setpoint when resumed.
+        """
+        self.runner.load(self.mission)
+        self.runner.begin()
+        time.sleep(0.03)
+        self.runner.pause()
+        self.assertEqual(self.runner.getState(), MissionRunner.STATE_PAUSED)
+        self.assertTrue(self.runner.isActive())
+        count = len(self.setpoints)
+        time.sleep(0.05)
+        self.assertEqual(len(self.setpoints), count)
+        self.runner.resume()
+        self.assertTrue(self.done.wait(2))
+        self.assertEqual(len(self.setpoints), len(self.mission))
+
+    def test_override(self):
+        """
+        The override method must abort the active mission and no
+        setpoint must be applied after it returns.
+        """
+        self.runner.load(self.mission)
+        self.runner.begin()
+        time.sleep(0.03)
+        self.runner.override()
+        self.assertFalse(self.runner.isActive())
+        count = len(self.setpoints)
+        time.sleep(0.05)
+        self.assertEqual(len(self.setpoints), count)
+        self.assertLess(count, len(self.mission))
+
+    def test_loadAbortsActiveMission(self):
+        """
+        The load method must abort the active mission.
+        """
+        self.runner.load(self.mission)
+        self.runner.begin()
+        self.runner.load(self.mission)
+        self.assertEqual(self.runner.getState(), MissionRunner.STATE_IDLE)
+
+    def test_actuateFailure(self):
+        """
+        A failing setpoint must abort the mission and leave the runner
+        able to run the next mission.
+        """
+        failures = [OSError('I2C failure')]
+
+        def actuate(steering, throttle):
+            if failures:
+                raise failures.pop()
+            self._actuate(steering, throttle)
+
+        self.runner._actuate = actuate
+        self.runner.load(self.mission)
+        self.runner.begin()
+        self._waitIdle()
+        self.assertFalse(self.runner.isActive())
+        self.assertEqual(self.setpoints, [])
+        self.assertTrue(self.runner.is_alive())
+        self.runner.begin()
+        self.assertTrue(self.done.wait(2))
+        self.assertEqual(len(self.setpoints), len(self.mission))
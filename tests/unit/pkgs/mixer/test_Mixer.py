@@ -0,0 +1,152 @@
+import logging
+from unittest import TestCase
+from unittest.mock import Mock
+
+import numpy as np
+import os
+import sys
+
+sys.path.append(os.path.abspath('./src'))
+
+from pkgs.controlDevice import ControlDevice    # noqa: E402
+from pkgs.mixer import Mixer, MixerInvalid      # noqa: E402
+
+
+class TestMixer(TestCase):
+    """
+    Mixer test cases.
+    """
+    def setUp(self):
+        """
+        Test cases setup.
+        """
+        self.mockedBackend = Mock()
+        self.mockedBackend.getChannelCount.return_value = 16
+        ControlDevice.initBackend(self.mockedBackend)
+        self.config = {'outputs': [{'channel': 4, 'mix': [1.0, 1.0]},
+                                   {'channel': 5, 'mix': [-1.0, 1.0]}]}
+
+    def tearDown(self):
+        """
+        Test cases teardown.
+        """
+        ControlDevice.backend = None
+
+    def test_fromConfig(self):
+        """
+        The fromConfig method must create the output devices with their
+        defaults.
+        """
+        mixer = Mixer.fromConfig(logging, self.config, 'unit-1')
+        devices = mixer.getDevices()
+        self.assertEqual([device.getChannel() for device in devices],
+                         [4, 5])
+        for device in devices:
+            self.assertEqual(device.getType(), ControlDevice.TYPE_ESC)
+            self.assertEqual(device.getMotionRange(), (0, 90, 180))
+
+    def test_fromConfigInvalid(self):
+        """
+        The fromConfig method must raise a MixerInvalid exception if
+        the configuration is not valid.
+        """
+        invalidConfigs = [{},
+                          {'outputs': []},
+                          {'outputs': [{'mix': [1, 1]}]},
+                          {'outputs': [{'channel': 16, 'mix': [1, 1]}]},
+                          {'outputs': [{'channel': 4}]},
+                          {'outputs': [{'channel': 4, 'mix': [1]}]},
+                          {'outputs': [{'channel': 4, 'mix': [1, 'a']}]},
+                          {'outputs': [{'channel': 4, 'mix': [1, 1],
+                                        'type': 'PROUT'}]},
+                          {'outputs': [{'channel': 4, 'mix': [1, 1],
+                                        'range': [90, 50, 10]}]},
+                          {'outputs': [{'channel': 4, 'mix': [1, 1],
+                                        'trim': 1.5}]},
+                          {'outputs': [{'channel': 4, 'mix': [1, 1],
+                                        'expo': -0.1}]},
+                          {'outputs': [{'channel': 4, 'mix': [1, 1],
+                                        'limit': 0}]},
+                          {'outputs': [{'channel': 4, 'mix': [1, 1]},
+                                       {'channel': 4, 'mix': [1, -1]}]},
+                          {'outputs': [{'channel': 4,
+                                        'mix': [1, float('nan')]}]}]
+        for invalidConfig in invalidConfigs:
+            with self.assertRaises(MixerInvalid):
+                Mixer.fromConfig(logging, invalidConfig, 'unit-1')
+            self.assertIsNone(ControlDevice.channels.getOwner(4))
+
+    def test_fromConfigChannels(self):
+        """
+        The fromConfig method must claim the output channels and must
+        not create any device on a channel used by another owner.
+        """
+        Mixer.fromConfig(logging, self.config, 'unit-1')
+        self.assertEqual(ControlDevice.channels.getOwner(4), 'unit-1')
+        self.assertEqual(ControlDevice.channels.getOwner(5), 'unit-1')
+        self.mockedBackend.reset_mock()
+        with self.assertRaises(MixerInvalid):
+            Mixer.fromConfig(logging, {'outputs': [
+                {'channel': 6, 'mix': [1, 1]},
+                {'channel': 5, 'mix': [1, 1]}]}, 'unit-2')
+        self.mockedBackend.setAngle.assert_not_called()
+        self.assertIsNone(ControlDevice.channels.getOwner(6))
+        self.assertEqual(ControlDevice.channels.getOwner(5), 'unit-1')
+
+    def test_getDevicesStopOrder(self):
+        """
+        The getDevices method must return the ESCs first.
+        """
+        self.config['outputs'].insert(0, {'channel': 2, 'mix': [1, 0],
+                                          'type': ControlDevice.TYPE_DIRECT})
+        mixer = Mixer.fromConfig(logging, self.config, 'unit-1')
+        self.assertEqual([device.getChannel()
+                          for device in mixer.getDevices()], [4, 5, 2])
+
+    def test_mixTankDrive(self):
+        """
+        The mix method must apply the mixing matrix and saturate the
+        outputs.
+        """
+        mixer = Mixer.fromConfig(logging, self.config, 'unit-1')
+        np.testing.assert_allclose(mixer.mix(0.0, 0.5), [0.5, 0.5])
+        np.testing.assert_allclose(mixer.mix(0.5, 0.0), [0.5, -0.5])
+        np.testing.assert_allclose(mixer.mix(0.5, 0.75), [1.0, 0.25])
+        self.assertEqual(mixer.getAxes(), (0.5, 0.75))
+        self.assertEqual(mixer.getClampCount(), 0)
+
+    def test_mixShaping(self):
+        """
+        The mix method must apply the expo curves, then the trims,
+        then the limits.
+        """
+        mixer = Mixer(logging, Mixer.fromConfig(logging, self.config,
+                                                'unit-1').getDevices(),
+                      [[0.0, 1.0], [0.0, 1.0]], trims=[0.1, 0.0],
+                      expos=[0.0, 0.5], limits=[0.55, 1.0])
+        np.testing.assert_allclose(mixer.mix(0.0, 0.5), [0.55, 0.3125])
+        np.testing.assert_allclose(mixer.mix(0.0, -0.5), [-0.4, -0.3125])
+
+    def test_mixSaturate(self):
+        """
+        The mix method must saturate the out of range axes and count
+        the clamp events.
+        """
+        mixer = Mixer.fromConfig(logging, self.config, 'unit-1')
+        np.testing.assert_allclose(mixer.mix(0.0, 2.0), [1.0, 1.0])
+        np.testing.assert_allclose(mixer.mix(float('nan'), -0.5),
+                                   [-0.5, -0.5])
+        self.assertEqual(mixer.getAxes(), (0.0, -0.5))
+        self.assertEqual(mixer.getClampCount(), 2)
+
+    def test_apply(self):
+        """
+        The apply method must write every output position with a single
+        bulk write, as ControlDevice maps the modifiers.
+        """
+        self.config['outputs'][1]['range'] = [10, 50, 90]
+        mixer = Mixer.fromConfig(logging, self.config, 'unit-1')
+        mixer.apply(0.25, 0.5)
+        self.mockedBackend.setAngles.assert_called_once_with(
+            ((4, 157), (5, 60)))
+        np.testing.assert_allclose(mixer.getOutputs(), [0.75, 0.25])
@@ -0,0 +1,57 @@
+import logging
+from unittest import TestCase
+from unittest.mock import patch
+
+import os
+import sys
+
+sys.path.append(os.path.abspath('./src'))
+
+from pkgs.powerMonitor import PowerMonitor      # noqa: E402
+
+
+class TestPowerMonitor(TestCase):
+    """
+    Power monitor test cases.
+    """
+    def setUp(self):
+        """
+        Test cases setup.
+        """
+        self.monitor = PowerMonitor(logging)
+
+    def test_getStatsEmpty(self):
+        """
+        The getStats method must return empty statistics before any
+        wakeup interval.
+        """
+        self.monitor.recordWakeup(0.0, False)
+        testResult = self.monitor.getStats()
+        for mode in (PowerMonitor.MODE_ACTIVE, PowerMonitor.MODE_IDLE):
+            self.assertEqual(testResult[mode],
+                             {'time': 0.0, 'cpuTime': 0.0, 'cpuLoad': None,
+                              'wakeupRate': None})
+
+    def test_recordWakeup(self):
+        """
+        The recordWakeup method must account each interval to the mode
+        the loop was sleeping in.
+        """
+        cpuTimes = [0.0, 0.01, 0.02, 0.03, 0.031, 0.032]
+        wakeups = [(0.0, False), (0.025, False), (0.05, True),
+                   (1.05, True), (2.05, True), (3.05, False)]
+        with patch('pkgs.powerMonitor.powerMonitor.time') as mockedTime:
+            mockedTime.process_time.side_effect = cpuTimes
+            for now, idle in wakeups:
+                self.monitor.recordWakeup(now, idle)
+        testResult = self.monitor.getStats()
+        active = testResult[PowerMonitor.MODE_ACTIVE]
+        self.assertAlmostEqual(active['time'], 0.05)
+        self.assertAlmostEqual(active['cpuTime'], 0.02)
+        self.assertAlmostEqual(active['cpuLoad'], 0.4)
+        self.assertAlmostEqual(active['wakeupRate'], 40.0)
+        idle = testResult[PowerMonitor.MODE_IDLE]
+        self.assertAlmostEqual(idle['time'], 3.0)
+        self.assertAlmostEqual(idle['cpuTime'], 0.012)
+        self.assertAlmostEqual(idle['wakeupRate'], 1.0)
+        self.assertEqual(self.monitor.getMode(), PowerMonitor.MODE_ACTIVE)
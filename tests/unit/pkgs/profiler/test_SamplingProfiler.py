@@ -0,0 +1,129 @@
+import logging
+import signal
+import threading
+import time
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+import os
+import sys
+
+sys.path.append(os.path.abspath('./src'))
+
+from pkgs.profiler import ProfilerInvalid, ProfilerNotInstalled, \
+    ProfilerRunning, SamplingProfiler               # noqa: E402
+
+
+def _spin(stopEvent):
+    """
+    Burn CPU until stopped.
+    """
+    while not stopEvent.is_set():
+        sum(range(1000))
+
+
+class TestSamplingProfiler(TestCase):
+    """
+    Sampling profiler test cases.
+    """
+    def setUp(self):
+        """
+        Test cases setup.
+        """
+        self.reports = []
+        self.reported = threading.Event()
+        self.profiler = SamplingProfiler(logging, self._onReport,
+                                         interval=0.001)
+        self.profiler.install()
+
+    def tearDown(self):
+        """
+        Test cases teardown.
+        """
+        self.profiler.uninstall()
+
+    def _onReport(self, report):
+        """
+        Report callback.
+        """
+        self.reports.append(report)
+        self.reported.set()
+
+    def test_startReport(self):
+        """
+        The profiler must sample the worker threads and report the
+        collapsed stacks at the end of the profiling duration.
+        """
+        stopEvent = threading.Event()
+        worker = threading.Thread(target=_spin, args=(stopEvent,),
+                                  name='busy-worker')
+        worker.start()
+        try:
+            self.profiler.start(0.2)
+            self.assertTrue(self.profiler.isRunning())
+            deadline = time.monotonic() + 2.0
+            while not self.reported.is_set() and \
+                    time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            stopEvent.set()
+            worker.join()
+        self.assertFalse(self.profiler.isRunning())
+        report, = self.reports
+        workerStacks = [line for line in report
+                        if line.startswith('busy-worker;')]
+        self.assertTrue(workerStacks)
+        self.assertTrue(any('_spin (test_SamplingProfiler.py:' in line
+                            for line in workerStacks))
+        for line in report:
+            stack, count = line.rsplit(' ', 1)
+            self.assertGreater(int(count), 0)
+
+    def test_stop(self):
+        """
+        The stop method must end the profiling early and report once.
+        """
+        self.profiler.start(60)
+        self.profiler.stop()
+        self.profiler.stop()
+        self.assertFalse(self.profiler.isRunning())
+        self.assertEqual(len(self.reports), 1)
+
+    def test_onSignalSamplesTaken(self):
+        """
+        The signal handler must stop writing to the samples once they
+        are taken by stop.
+        """
+        samples = {}
+        self.profiler._samples = samples
+        self.profiler._running = True
+
+        def frames():
+            yield threading.get_ident(), sys._getframe()
+            self.profiler._samples = {}
+            yield threading.get_ident(), sys._getframe()
+
+        try:
+            with patch('sys._current_frames') as mockedCurrentFrames:
+                mockedCurrentFrames.return_value.items.side_effect = frames
+                self.profiler._onSignal(signal.SIGPROF, sys._getframe())
+        finally:
+            self.profiler._running = False
+        self.assertEqual(sum(samples.values()), 1)
+        self.assertEqual(self.profiler._samples, {})
+
+    def test_startInvalid(self):
+        """
+        The start method must reject invalid durations, a running
+        profiler and a profiler without signal handler.
+        """
+        for duration in (0, -1, SamplingProfiler.MAX_DURATION + 1, '10'):
+            with self.assertRaises(ProfilerInvalid):
+                self.profiler.start(duration)
+        self.profiler.start(60)
+        with self.assertRaises(ProfilerRunning):
+            self.profiler.start(60)
+        self.profiler.stop()
+        profiler = SamplingProfiler(logging, Mock())
+        with self.assertRaises(ProfilerNotInstalled):
+            profiler.start(1)
@@ -0,0 +1,282 @@
+import logging
+import threading
+import time
+from unittest import TestCase
+from unittest.mock import Mock
+
+import os
+import sys
+
+sys.path.append(os.path.abspath('./src'))
+
+from pkgs.publishQueue import PublishQueue      # noqa: E402
+
+
+class TestPublishQueue(TestCase):
+    """
+    Publish queue test cases.
+    """
+    def setUp(self):
+        """
+        Test cases setup.
+        """
+        self.published = []
+        self.allowPublish = threading.Event()
+        self.allowPublish.set()
+        self.queue = PublishQueue(logging, self._publish, sizes=(2, 2, 2))
+
+    def tearDown(self):
+        """
+        Test cases tear down.
+        """
+        self.allowPublish.set()
+        self.queue.stop()
+        if self.queue.is_alive():
+            self.queue.join(1)
+
+    def _publish(self, msg):
+        """
+        Record the published messages, blocking while not allowed.
+        """
+        self.allowPublish.wait()
+        self.published.append(msg)
+
+    def _waitPublished(self, count):
+        """
+        Wait for a number of published messages.
+        """
+        for _ in range(200):
+            if len(self.published) >= count:
+                return
+            threading.Event().wait(0.005)
+
+    def test_putDepth(self):
+        """
+        The put method must queue the message in its priority class.
+        """
+        self.assertTrue(self.queue.put('cxn', PublishQueue.PRIORITY_CRITICAL))
+        self.assertTrue(self.queue.put('state'))
+        stats = self.queue.getStats()
+        self.assertEqual(stats['depth'], (1, 0, 1))
+        self.assertEqual(stats['shed'], (0, 0, 0))
+
+    def test_putShedOldest(self):
+        """
+        The put method must shed the oldest message of a full class
+        and count it.
+        """
+        for index in range(5):
+            self.queue.put(f"state-{index}")
+        stats = self.queue.getStats()
+        self.assertEqual(stats['depth'], (0, 0, 2))
+        self.assertEqual(stats['shed'], (0, 0, 3))
+        self.assertFalse(self.queue.put('state-5'))
+
+    def test_putCriticalNeverShed(self):
+        """
+        The put method must never shed a critical message, and must log
+        a critical class over its size once per overflow.
+        """
+        mockedLogger = Mock()
+        queue = PublishQueue(mockedLogger, Mock(), sizes=(2, 2, 2))
+        for index in range(4):
+            self.assertTrue(queue.put(f"cxn-{index}",
+                                      PublishQueue.PRIORITY_CRITICAL))
+        stats = queue.getStats()
+        self.assertEqual(stats['depth'], (4, 0, 0))
+        self.assertEqual(stats['shed'], (0, 0, 0))
+        mockedLogger.getLogger.return_value.error.assert_called_once()
+
+    def test_putCoalesced(self):
+        """
+        The put method must replace the queued message with the same
+        key, which bounds the critical class to one message per key.
+        """
+        for index in range(10):
+            for unitId in ('unit-1', 'unit-2'):
+                self.assertTrue(self.queue.put(f"cxn-{unitId}-{index}",
+                                               PublishQueue.PRIORITY_CRITICAL,
+                                               key=unitId))
+        self.queue.put('fault', PublishQueue.PRIORITY_CRITICAL)
+        stats = self.queue.getStats()
+        self.assertEqual(stats['depth'], (3, 0, 0))
+        self.assertEqual(stats['coalesced'], (18, 0, 0))
+        self.queue.start()
+        self._waitPublished(3)
+        self.assertEqual(self.published, ['cxn-unit-1-9', 'cxn-unit-2-9',
+                                          'fault'])
+
+    def test_publishPriorityOrder(self):
+        """
+        The worker must publish the highest priority messages first.
+        """
+        self.queue.put('state-0')
+        self.queue.put('ack-0', PublishQueue.PRIORITY_ACK)
+        self.queue.put('cxn-0', PublishQueue.PRIORITY_CRITICAL)
+        self.queue.put('state-1')
+        self.queue.put('cxn-1', PublishQueue.PRIORITY_CRITICAL)
+        self.queue.start()
+        self._waitPublished(5)
+        self.assertEqual(self.published, ['cxn-0', 'cxn-1', 'ack-0',
+                                          'state-0', 'state-1'])
+        self.assertEqual(self.queue.getStats()['published'], 5)
+
+    def test_putNeverBlocks(self):
+        """
+        The put method must not block while the broker is stalled and
+        shed the telemetry that can't keep up.
+        """
+        self.allowPublish.clear()
+        self.queue.start()
+        self.queue.put('state-0')
+        for _ in range(200):
+            if self.queue.getStats()['depth'] == (0, 0, 0):
+                break
+            threading.Event().wait(0.005)
+        for index in range(1, 50):
+            self.queue.put(f"state-{index}")
+        self.queue.put('cxn', PublishQueue.PRIORITY_CRITICAL)
+        self.assertGreater(self.queue.getStats()['shed'][2], 0)
+        self.allowPublish.set()
+        self._waitPublished(4)
+        self.assertEqual(self.published, ['state-0', 'cxn',
+                                          'state-48', 'state-49'])
+
+    def test_publishFailure(self):
+        """
+        The worker must count the failed publications and keep running.
+        """
+        mockedPublish = Mock(side_effect=[Exception('broker'), None])
+        queue = PublishQueue(logging, mockedPublish)
+        queue.put('state-0')
+        queue.put('state-1')
+        queue.start()
+        for _ in range(200):
+            if mockedPublish.call_count == 2:
+                break
+            threading.Event().wait(0.005)
+        queue.stop()
+        queue.join(1)
+        stats = queue.getStats()
+        self.assertEqual(stats['failed'], 1)
+        self.assertEqual(stats['published'], 1)
+
+    def test_onComplete(self):
+        """
+        The worker must report the completion latency of every
+        published message, and warn once when the publish function
+        returns no completion info.
+        """
+        latencies = []
+        done = threading.Event()
+
+        def onComplete(latency):
+            latencies.append(latency)
+            if len(latencies) == 2:
+                done.set()
+
+        mockedLogger = Mock()
+        queue = PublishQueue(mockedLogger, Mock(return_value=None),
+                             onComplete=onComplete)
+        queue.put('state-0')
+        queue.put('state-1')
+        queue.start()
+        self.assertTrue(done.wait(1))
+        queue.stop()
+        queue.join(1)
+        for latency in latencies:
+            self.assertGreaterEqual(latency, 0)
+        mockedLogger.getLogger.return_value.warning.assert_called_once()
+
+    def test_onCompleteAcknowledge(self):
+        """
+        The worker must wait for the message acknowledge before
+        reporting its completion, without warning.
+        """
+        acknowledged = threading.Event()
+        info = Mock()
+        info.is_published.side_effect = acknowledged.is_set
+        onComplete = Mock()
+        mockedLogger = Mock()
+        queue = PublishQueue(mockedLogger, Mock(return_value=info),
+                             onComplete=onComplete)
+        queue.put('cxn', PublishQueue.PRIORITY_CRITICAL)
+        queue.start()
+        threading.Event().wait(0.05)
+        onComplete.assert_not_called()
+        acknowledged.set()
+        for _ in range(200):
+            if onComplete.called:
+                break
+            threading.Event().wait(0.005)
+        queue.stop()
+        queue.join(1)
+        latency, = onComplete.call_args.args
+        self.assertGreaterEqual(latency, 0.05)
+        mockedLogger.getLogger.return_value.warning.assert_not_called()
+
+    def test_onPublished(self):
+        """
+        The worker must call the publication callback of the published
+        messages only, never of the shed or failed ones.
+        """
+        onPublished = Mock()
+        queue = PublishQueue(logging,
+                             Mock(side_effect=[OSError('broken'), None]),
+                             sizes=(4, 4, 1))
+        queue.put('state-0', onPublished=onPublished)
+        queue.put('state-1', onPublished=onPublished)
+        queue.put('state-2', PublishQueue.PRIORITY_CRITICAL,
+                  onPublished=onPublished)
+        queue.start()
+        for _ in range(200):
+            if onPublished.called:
+                break
+            threading.Event().wait(0.005)
+        queue.stop()
+        queue.join(1)
+        msg, queuedTime, publishedTime = onPublished.call_args.args
+        onPublished.assert_called_once()
+        self.assertEqual(msg, 'state-1')
+        self.assertGreaterEqual(publishedTime, queuedTime)
+
+    def test_pendingEviction(self):
+        """
+        The worker must count the publications evicted while waiting
+        for their acknowledge, log the stall once and report the age
+        of the oldest pending publication.
+        """
+        info = Mock()
+        info.is_published.return_value = False
+        mockedLogger = Mock()
+        queue = PublishQueue(mockedLogger, Mock(return_value=info))
+        queue.MAX_PENDING = 2
+        self.assertIsNone(queue.getPendingAge(time.monotonic()))
+        for index in range(4):
+            queue.put(f"cxn-{index}", PublishQueue.PRIORITY_CRITICAL)
+        queue.start()
+        for _ in range(200):
+            if queue.getStats()['evicted'] == 2:
+                break
+            threading.Event().wait(0.005)
+        stats = queue.getStats()
+        self.assertEqual((stats['pending'], stats['evicted']), (2, 2))
+        self.assertGreater(queue.getPendingAge(time.monotonic() + 1.0), 1.0)
+        mockedLogger.getLogger.return_value.warning.assert_called_once()
+        info.is_published.return_value = True
+        for _ in range(200):
+            if queue.getStats()['pending'] == 0:
+                break
+            threading.Event().wait(0.005)
+        queue.stop()
+        queue.join(1)
+        self.assertIsNone(queue.getPendingAge(time.monotonic()))
+
+    def test_stop(self):
+        """
+        The stop method must stop the worker.
+        """
+        self.queue.start()
+        self.queue.stop()
+        self.queue.join(1)
+        self.assertFalse(self.queue.is_alive())
@@ -0,0 +1,112 @@
+from unittest import TestCase
+from unittest.mock import Mock, call, patch
+
+import os
+import sys
+
+sys.path.append(os.path.abspath('./src'))
+
+from pkgs.pwmBackend import Pca9685Backend, \
+    PwmBackendOperation                         # noqa: E402
+
+
+class TestPca9685Backend(TestCase):
+    """
+    PCA9685 backend test cases.
+    """
+    def setUp(self):
+        """
+        Test cases setup.
+        """
+        self.mockedSmbus = Mock()
+        self.mockedBus = self.mockedSmbus.return_value
+        with patch('pkgs.pwmBackend.pca9685Backend.time'):
+            self.backend = Pca9685Backend(busNum=3, frequency=50,
+                                          minPulse=1000, maxPulse=2000,
+                                          smbus=self.mockedSmbus)
+
+    def test_constructorOpenBus(self):
+        """
+        The constructor must open the requested I2C bus.
+        """
+        self.mockedSmbus.assert_called_once_with(3)
+
+    def test_setFrequency(self):
+        """
+        The setFrequency method must program the prescaler while the
+        chip is sleeping and then restart it with auto-increment.
+        """
+        self.mockedBus.reset_mock()
+        addr = Pca9685Backend.DEFAULT_ADDRESS
+        with patch('pkgs.pwmBackend.pca9685Backend.time'):
+            self.backend.setFrequency(200)
+        expectedCalls = [call.write_byte_data(addr, Pca9685Backend.MODE1,
+                                              Pca9685Backend.MODE1_SLEEP),
+                         call.write_byte_data(addr, Pca9685Backend.PRESCALE,
+                                              30),
+                         call.write_byte_data(addr, Pca9685Backend.MODE1,
+                                              Pca9685Backend.MODE1_AUTO_INC),
+                         call.write_byte_data(addr, Pca9685Backend.MODE1,
+                                              Pca9685Backend.MODE1_RESTART |
+                                              Pca9685Backend.MODE1_AUTO_INC)]
+        self.mockedBus.assert_has_calls(expectedCalls)
+
+    def test_setAngle(self):
+        """
+        The setAngle method must write the channel OFF ticks
+        from the lookup table.
+        """
+        self.backend.setAngle(2, 90)
+        # 1500 us at the 50.03 Hz actual frequency.
+        self.mockedBus.write_i2c_block_data.assert_called_once_with(
+            Pca9685Backend.DEFAULT_ADDRESS, Pca9685Backend.LED0_ON_L + 8,
+            (0, 0, 307 & 0xFF, 307 >> 8))
+        self.assertEqual(self.backend.getAngle(2), 90)
+
+    def test_setAngleInvalid(self):
+        """
+        The setAngle method must not index the lookup table with a
+        negative or real angle.
+        """
+        self.mockedBus.reset_mock()
+        with self.assertRaises(PwmBackendOperation):
+            self.backend.setAngle(2, -1)
+        self.backend.setAngle(2, 90.0)
+        self.mockedBus.write_i2c_block_data.assert_called_once_with(
+            Pca9685Backend.DEFAULT_ADDRESS, Pca9685Backend.LED0_ON_L + 8,
+            (0, 0, 307 & 0xFF, 307 >> 8))
+
+    def test_setAnglesConsecutive(self):
+        """
+        The setAngles method must write consecutive channels in one
+        block write and split the others.
+        """
+        self.backend.setAngles(((0, 0), (1, 180), (5, 0)))
+        addr = Pca9685Backend.DEFAULT_ADDRESS
+        minTicks = list(self.backend._ticks[0])
+        maxTicks = list(self.backend._ticks[180])
+        expectedCalls = [call(addr, Pca9685Backend.LED0_ON_L,
+                              minTicks + maxTicks),
+                         call(addr, Pca9685Backend.LED0_ON_L + 20,
+                              minTicks)]
+        self.assertEqual(self.mockedBus.write_i2c_block_data.call_args_list,
+                         expectedCalls)
+        self.assertEqual(self.backend.getAngle(1), 180)
+
+    def test_setAnglesBlockLimit(self):
+        """
+        The setAngles method must not exceed the I2C block size.
+        """
+        testAngles = tuple((channel, 90) for channel in range(10))
+        self.backend.setAngles(testAngles)
+        blocks = self.mockedBus.write_i2c_block_data.call_args_list
+        self.assertEqual(len(blocks), 2)
+        self.assertEqual(len(blocks[0].args[2]),
+                         4 * Pca9685Backend.MAX_BLOCK_CHAN)
+
+    def test_close(self):
+        """
+        The close method must close the I2C bus.
+        """
+        self.backend.close()
+        self.mockedBus.close.assert_called_once()
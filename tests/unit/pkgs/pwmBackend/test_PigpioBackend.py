@@ -0,0 +1,126 @@
+import socket
+import struct
+import threading
+from unittest import TestCase
+
+import os
+import sys
+
+sys.path.append(os.path.abspath('./src'))
+
+from pkgs.pwmBackend import PigpioBackend, PwmBackendConnection, \
+    PwmBackendOperation  # noqa: E402
+
+
+class FakePigpiod:
+    """
+    Local fake pigpiod daemon speaking the socket command protocol.
+    """
+    def __init__(self, results: dict = None):
+        """
+        Constructor.
+
+        Params:
+            results:    The result code to answer for a given GPIO.
+                        Default 0 for every GPIO.
+        """
+        self.commands = []
+        self.reads = []
+        self._results = results or {}
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.bind(('127.0.0.1', 0))
+        self._server.listen(1)
+        self.port = self._server.getsockname()[1]
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self):
+        """
+        Serve a single client connection.
+        """
+        cxn, _ = self._server.accept()
+        with cxn:
+            while True:
+                data = cxn.recv(4096)
+                if not data:
+                    break
+                self.reads.append(len(data))
+                response = b''
+                for offset in range(0, len(data), 16):
+                    cmd, gpio, pulse, _ = struct.unpack_from('<IIII', data,
+                                                             offset)
+                    self.commands.append((cmd, gpio, pulse))
+                    response += struct.pack('<IIIi', cmd, gpio, pulse,
+                                            self._results.get(gpio, 0))
+                cxn.sendall(response)
+
+    def close(self):
+        """
+        Close the daemon once its client is disconnected.
+        """
+        self._thread.join(1)
+        self._server.close()
+
+
+class TestPigpioBackend(TestCase):
+    """
+    PIGPIO backend test cases.
+    """
+    def setUp(self):
+        """
+        Test cases setup.
+        """
+        self.daemon = FakePigpiod(results={27: -8})
+        self.backend = PigpioBackend((12, 13, 27), host='127.0.0.1',
+                                     port=self.daemon.port,
+                                     minPulse=1000, maxPulse=2000)
+
+    def tearDown(self):
+        """
+        Test cases tear down.
+        """
+        self.backend.close()
+        self.daemon.close()
+
+    def test_constructorConnection(self):
+        """
+        The constructor must raise a PwmBackendConnection exception
+        if the daemon is unreachable.
+        """
+        probe = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+        probe.close()
+        with self.assertRaises(PwmBackendConnection):
+            PigpioBackend((12,), host='127.0.0.1', port=port)
+
+    def test_setAngle(self):
+        """
+        The setAngle method must send the servo pulse command
+        of the channel GPIO.
+        """
+        self.backend.setAngle(1, 90)
+        self.assertEqual(self.daemon.commands,
+                         [(PigpioBackend.CMD_SERVO, 13, 1500)])
+        self.assertEqual(self.backend.getAngle(1), 90)
+
+    def test_setAnglesPipelined(self):
+        """
+        The setAngles method must send every servo pulse command
+        in one write.
+        """
+        self.backend.setAngles(((1, 90), (0, 180)))
+        self.assertEqual(self.daemon.commands,
+                         [(PigpioBackend.CMD_SERVO, 13, 1500),
+                          (PigpioBackend.CMD_SERVO, 12, 2000)])
+        self.assertEqual(self.daemon.reads, [32])
+        self.assertEqual(self.backend.getAngle(0), 180)
+
+    def test_setAngleFailure(self):
+        """
+        The setAngle method must raise a PwmBackendOperation exception
+        if the daemon reports an error.
+        """
+        with self.assertRaises(PwmBackendOperation):
+            self.backend.setAngle(2, 90)
+        self.assertIsNone(self.backend.getAngle(2))
@@ -0,0 +1,103 @@
+from unittest import TestCase
+from unittest.mock import Mock, call, patch
+
+import os
+import sys
+
+sys.path.append(os.path.abspath('./src'))
+
+from pkgs.pwmBackend import PwmBackend, PwmBackendOperation, \
+    PwmBackendType, createBackend  # noqa: E402
+
+
+class TestPwmBackend(TestCase):
+    """
+    PWM backend base class and factory test cases.
+    """
+    def setUp(self):
+        """
+        Test cases setup.
+        """
+        self.backend = PwmBackend(4)
+
+    def test_buildPulseTable(self):
+        """
+        The buildPulseTable class method must map every integer angle
+        to its pulse width.
+        """
+        testResult = PwmBackend.buildPulseTable(1000, 2000)
+        self.assertEqual(len(testResult), PwmBackend.MAX_ANGLE + 1)
+        self.assertEqual(testResult[PwmBackend.MIN_ANGLE], 1000)
+        self.assertEqual(testResult[90], 1500)
+        self.assertEqual(testResult[PwmBackend.MAX_ANGLE], 2000)
+        for pulse in testResult:
+            self.assertIsInstance(pulse, int)
+
+    def test_getChannelCount(self):
+        """
+        The getChannelCount method must return the number of channels.
+        """
+        self.assertEqual(self.backend.getChannelCount(), 4)
+
+    def test_setAnglesInOrder(self):
+        """
+        The setAngles method must set every angle in the given order.
+        """
+        testAngles = ((1, 90), (0, 45))
+        with patch.object(self.backend, '_setAngle') as mockedSetAngle:
+            self.backend.setAngles(testAngles)
+            mockedSetAngle.assert_has_calls([call(1, 90), call(0, 45)])
+
+    def test_setAngleRounded(self):
+        """
+        The setAngle and setAngles methods must write real angles as
+        integers.
+        """
+        with patch.object(self.backend, '_setAngle') as mockedSetAngle:
+            self.backend.setAngle(0, 90.0)
+            self.backend.setAngles(((1, 44.6), (2, 180)))
+            self.assertEqual(mockedSetAngle.call_args_list,
+                             [call(0, 90), call(1, 45), call(2, 180)])
+            for angleCall in mockedSetAngle.call_args_list:
+                self.assertIs(type(angleCall.args[1]), int)
+
+    def test_setAngleInvalid(self):
+        """
+        The setAngle and setAngles methods must raise a
+        PwmBackendOperation exception and write nothing if an angle is
+        not a real number between MIN_ANGLE and MAX_ANGLE.
+        """
+        with patch.object(self.backend, '_setAngle') as mockedSetAngle:
+            for angle in (-1, 181, 180.6, float('nan'), float('inf'),
+                          True, '90', None):
+                with self.assertRaises(PwmBackendOperation):
+                    self.backend.setAngle(0, angle)
+                with self.assertRaises(PwmBackendOperation):
+                    self.backend.setAngles(((1, 90), (0, angle)))
+            mockedSetAngle.assert_not_called()
+
+    def test_getAngleNeverSet(self):
+        """
+        The getAngle method must return None for a channel never set.
+        """
+        self.assertIsNone(self.backend.getAngle(2))
+
+    def test_createBackend(self):
+        """
+        The createBackend function must create the requested backend
+        with the given parameters.
+        """
+        mockedServoKit = Mock()
+        backend = createBackend(PwmBackend.TYPE_SERVOKIT,
+                                servoKit=mockedServoKit, chanCount=8,
+                                frequency=60)
+        mockedServoKit.assert_called_once_with(channels=8, frequency=60)
+        self.assertEqual(backend.getChannelCount(), 8)
+
+    def test_createBackendUnsupported(self):
+        """
+        The createBackend function must raise a PwmBackendType exception
+        if the backend type is unsupported.
+        """
+        with self.assertRaises(PwmBackendType):
+            createBackend('PROUT')
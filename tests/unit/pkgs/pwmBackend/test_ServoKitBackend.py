@@ -0,0 +1,56 @@
+from unittest import TestCase
+from unittest.mock import Mock
+
+import os
+import sys
+
+sys.path.append(os.path.abspath('./src'))
+
+from pkgs.pwmBackend import PwmBackendUnsupported, \
+    ServoKitBackend                             # noqa: E402
+
+
+class TestServoKitBackend(TestCase):
+    """
+    ServoKit backend test cases.
+    """
+    def setUp(self):
+        """
+        Test cases setup.
+        """
+        self.mockedServos = [Mock(angle=None), Mock(angle=None)]
+        self.mockedServoKit = Mock()
+        self.mockedServoKit.return_value = Mock(servo=self.mockedServos)
+        self.backend = ServoKitBackend(self.mockedServoKit, chanCount=8,
+                                       frequency=90)
+
+    def test_constructor(self):
+        """
+        The constructor must initialize the servo kit with the good
+        number of channels and frequency.
+        """
+        self.mockedServoKit.assert_called_once_with(channels=8, frequency=90)
+
+    def test_setAngle(self):
+        """
+        The setAngle method must update the servo kit channel angle.
+        """
+        self.backend.setAngle(1, 120)
+        self.assertEqual(self.mockedServos[1].angle, 120)
+        self.assertIsNone(self.mockedServos[0].angle)
+
+    def test_getAngle(self):
+        """
+        The getAngle method must return the servo kit channel angle.
+        """
+        self.mockedServos[0].angle = 33
+        self.assertEqual(self.backend.getAngle(0), 33)
+
+    def test_setFrequency(self):
+        """
+        The setFrequency method must only accept the servo kit creation
+        frequency.
+        """
+        self.backend.setFrequency(90)
+        with self.assertRaises(PwmBackendUnsupported):
+            self.backend.setFrequency(200)
@@ -0,0 +1,66 @@
+import logging
+import struct
+import tempfile
+from unittest import TestCase
+
+import os
+import sys
+
+sys.path.append(os.path.abspath('./src'))
+
+from pkgs.recorder import Recorder      # noqa: E402
+
+
+class TestRecorder(TestCase):
+    """
+    Recorder test cases.
+    """
+    def setUp(self):
+        """
+        Test cases setup.
+        """
+        self.tmpDir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpDir.name, 'unit-1.rec')
+        self.recorder = Recorder(logging, self.path)
+
+    def tearDown(self):
+        """
+        Test cases teardown.
+        """
+        self.recorder.close()
+        self.tmpDir.cleanup()
+
+    def test_record(self):
+        """
+        The records must be saved after the header as fixed size
+        records.
+        """
+        self.recorder.record(Recorder.KIND_COMMAND, 1.0, 1.5, 0.25, -2.0,
+                             Recorder.FLAG_CLAMPED)
+        self.recorder.record(Recorder.KIND_STATE, 2.0, 2.0, 0.25, -1.0)
+        self.recorder.close()
+        self.assertEqual(self.recorder.getCount(), 2)
+        with open(self.path, 'rb') as recordFile:
+            data = recordFile.read()
+        headerSize = struct.calcsize(Recorder.HEADER_FORMAT)
+        recordSize = struct.calcsize(Recorder.RECORD_FORMAT)
+        self.assertEqual(struct.unpack_from(Recorder.HEADER_FORMAT, data),
+                         (Recorder.MAGIC, Recorder.VERSION, recordSize))
+        self.assertEqual(len(data), headerSize + 2 * recordSize)
+        records = list(struct.iter_unpack(Recorder.RECORD_FORMAT,
+                                          data[headerSize:]))
+        self.assertEqual(records,
+                         [(Recorder.KIND_COMMAND, Recorder.FLAG_CLAMPED, 0,
+                           1.0, 1.5, 0.25, -2.0),
+                          (Recorder.KIND_STATE, 0, 1, 2.0, 2.0, 0.25,
+                           -1.0)])
+
+    def test_recordClosed(self):
+        """
+        The records must be ignored once the recorder is closed.
+        """
+        self.recorder.close()
+        self.recorder.record(Recorder.KIND_STATE, 2.0, 2.0, 0.0, 0.0)
+        self.assertEqual(self.recorder.getCount(), 0)
+        self.assertEqual(os.path.getsize(self.path),
+                         struct.calcsize(Recorder.HEADER_FORMAT))
@@ -0,0 +1,83 @@
+import json
+import logging
+import tempfile
+from unittest import TestCase
+from unittest.mock import Mock
+
+import os
+import sys
+
+sys.path.append(os.path.abspath('./src'))
+
+from pkgs.tuning import TuningFileWatcher, TuningInvalid  # noqa: E402
+
+
+class TestTuningFileWatcher(TestCase):
+    """
+    Tuning file watcher test cases.
+    """
+    def setUp(self):
+        """
+        Test cases setup.
+        """
+        self.tmpDir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpDir.name, 'tuning.json')
+        self.mockedStore = Mock()
+        self.watcher = TuningFileWatcher(logging, self.mockedStore,
+                                         self.path, pollPeriod=0.01)
+
+    def tearDown(self):
+        """
+        Test cases tear down.
+        """
+        self.tmpDir.cleanup()
+
+    def _writeTuning(self, tuning, mtime):
+        """
+        Write the tuning file with a given modification time.
+        """
+        with open(self.path, 'w') as tuningFile:
+            json.dump(tuning, tuningFile)
+        os.utime(self.path, ns=(mtime, mtime))
+
+    def test_pollMissingFile(self):
+        """
+        The poll method must ignore a missing tuning file.
+        """
+        self.assertFalse(self.watcher.poll())
+        self.mockedStore.update.assert_not_called()
+
+    def test_pollModified(self):
+        """
+        The poll method must update the store only when the tuning
+        file is modified.
+        """
+        self._writeTuning({'idleDelay': 5.0}, 1000)
+        self.assertTrue(self.watcher.poll())
+        self.assertFalse(self.watcher.poll())
+        self._writeTuning({'idleDelay': 10.0}, 2000)
+        self.assertTrue(self.watcher.poll())
+        self.assertEqual(self.mockedStore.update.call_args_list,
+                         [(({'idleDelay': 5.0},),), (({'idleDelay': 10.0},),)])
+
+    def test_pollInvalid(self):
+        """
+        The poll method must not raise on an invalid tuning file.
+        """
+        with open(self.path, 'w') as tuningFile:
+            tuningFile.write('not json')
+        self.assertFalse(self.watcher.poll())
+        self._writeTuning({'idleDelay': -1}, 3000)
+        self.mockedStore.update.side_effect = TuningInvalid('idleDelay', -1)
+        self.assertFalse(self.watcher.poll())
+
+    def test_runStop(self):
+        """
+        The run method must poll until the watcher is stopped.
+        """
+        self._writeTuning({'idleDelay': 5.0}, 1000)
+        self.watcher.start()
+        self.watcher.stop()
+        self.watcher.join(1)
+        self.assertFalse(self.watcher.is_alive())
+        self.mockedStore.update.assert_called_once_with({'idleDelay': 5.0})
@@ -0,0 +1,209 @@
+import logging
+import threading
+from unittest import TestCase
+from unittest.mock import Mock, call
+
+import os
+import sys
+
+sys.path.append(os.path.abspath('./src'))
+
+from pkgs.controlDevice import ControlDevice    # noqa: E402
+from pkgs.tuning import Tunables, TuningApplyFailed, TuningInvalid, \
+    TuningStore                                 # noqa: E402
+
+
+class TestTuningStore(TestCase):
+    """
+    Tuning store test cases.
+    """
+    def setUp(self):
+        """
+        Test cases setup.
+        """
+        mockedBackend = Mock()
+        mockedBackend.getChannelCount.return_value = 16
+        ControlDevice.initBackend(mockedBackend)
+        self.defaults = Tunables(0.025, (0, (0, 90, 180)), (1, (0, 90, 180)))
+        self.store = TuningStore(logging, self.defaults, 'unit-1')
+
+    def tearDown(self):
+        """
+        Test cases teardown.
+        """
+        ControlDevice.backend = None
+        ControlDevice.channels = None
+
+    def test_constructorValidate(self):
+        """
+        The constructor must validate the default tuning.
+        """
+        with self.assertRaises(TuningInvalid):
+            TuningStore(logging, self.defaults._replace(stateUpdatePeriod=0),
+                        'unit-2')
+
+    def test_constructorChannels(self):
+        """
+        The constructor must claim the device channels and raise a
+        TuningInvalid exception if another owner uses one of them.
+        """
+        self.assertEqual(ControlDevice.channels.getOwner(0), 'unit-1')
+        self.assertEqual(ControlDevice.channels.getOwner(1), 'unit-1')
+        with self.assertRaises(TuningInvalid):
+            TuningStore(logging, self.defaults._replace(
+                steering=(2, (0, 90, 180))), 'unit-2')
+        self.assertIsNone(ControlDevice.channels.getOwner(2))
+        TuningStore(logging, self.defaults._replace(steering=None,
+                                                    throttle=None), 'unit-2')
+
+    def test_get(self):
+        """
+        The get method must return the current tuning snapshot.
+        """
+        self.assertEqual(self.store.get(), self.defaults)
+
+    def test_updateMerge(self):
+        """
+        The update method must merge the changes into a new snapshot
+        and keep the previous one untouched.
+        """
+        previous = self.store.get()
+        testResult = self.store.update({'stateUpdatePeriod': 0.1,
+                                        'steering': {'range': [10, 50, 90]}})
+        self.assertEqual(testResult.stateUpdatePeriod, 0.1)
+        self.assertEqual(testResult.steering, (0, (10, 50, 90)))
+        self.assertEqual(testResult.throttle, self.defaults.throttle)
+        self.assertIs(self.store.get(), testResult)
+        self.assertEqual(previous, self.defaults)
+
+    def test_updateInvalid(self):
+        """
+        The update method must raise a TuningInvalid exception and keep
+        the current snapshot if the update is invalid.
+        """
+        invalidUpdates = [{'stateUpdatePeriod': 0},
+                          {'idleDelay': -1.0},
+                          {'idleStatePeriod': 'slow'},
+                          {'steering': {'range': [90, 50, 10]}},
+                          {'steering': {'range': [0, 90]}},
+                          {'steering': {'range': [0, 90.0, 180]}},
+                          {'steering': {'range': [0, 90, 180.5]}},
+                          {'steering': {'channel': True}},
+                          {'steering': {'channel': 16}},
+                          {'steering': {'channel': 1}},
+                          {'steering': {'channel': 'a'}},
+                          {'steering': 3},
+                          {'unknown': 1},
+                          [1, 2]]
+        for invalidUpdate in invalidUpdates:
+            with self.assertRaises(TuningInvalid):
+                self.store.update(invalidUpdate)
+            self.assertEqual(self.store.get(), self.defaults)
+
+    def test_updateListeners(self):
+        """
+        The update method must call the listeners with the previous
+        and the new snapshot.
+        """
+        mockedListener = Mock()
+        self.store.registerListener(mockedListener)
+        testResult = self.store.update({'stateUpdatePeriod': 0.1})
+        mockedListener.assert_called_once_with(self.defaults, testResult)
+
+    def test_updateChannels(self):
+        """
+        The update method must claim the new device channels, release
+        the previous ones and reject the channels of another owner.
+        """
+        ControlDevice.channels.claim('unit-2', (3,))
+        with self.assertRaises(TuningInvalid):
+            self.store.update({'steering': {'channel': 3}})
+        self.assertEqual(self.store.get(), self.defaults)
+        self.store.update({'steering': {'channel': 2}})
+        self.assertIsNone(ControlDevice.channels.getOwner(0))
+        self.assertEqual(ControlDevice.channels.getOwner(2), 'unit-1')
+        self.assertEqual(ControlDevice.channels.getOwner(3), 'unit-2')
+
+    def test_updateChannelsListenerFailure(self):
+        """
+        The update method must release the new device channels and
+        keep the previous ones if a listener fails.
+        """
+        self.store.registerListener(Mock(side_effect=OSError('I2C failure')))
+        with self.assertRaises(TuningApplyFailed):
+            self.store.update({'steering': {'channel': 2}})
+        self.assertIsNone(ControlDevice.channels.getOwner(2))
+        self.assertEqual(ControlDevice.channels.getOwner(0), 'unit-1')
+
+    def test_updateAbsentDevice(self):
+        """
+        The update method must reject the setup of an absent device.
+        """
+        store = TuningStore(logging, self.defaults._replace(steering=None,
+                                                            throttle=None),
+                            'unit-2')
+        with self.assertRaises(TuningInvalid):
+            store.update({'steering': {'channel': 2}})
+        self.assertIsNone(ControlDevice.channels.getOwner(2))
+
+    def test_updateListenerFailure(self):
+        """
+        The update method must give the previous tuning back to the
+        called listeners, keep the current tuning and raise a
+        TuningApplyFailed exception if a listener fails.
+        """
+        firstListener = Mock()
+        failingListener = Mock(side_effect=OSError('I2C failure'))
+        lastListener = Mock()
+        for listener in (firstListener, failingListener, lastListener):
+            self.store.registerListener(listener)
+        current = self.store.get()
+        with self.assertRaises(TuningApplyFailed):
+            self.store.update({'stateUpdatePeriod': 0.1})
+        self.assertIs(self.store.get(), current)
+        tunables = firstListener.call_args_list[0].args[1]
+        self.assertEqual(firstListener.call_args_list,
+                         [call(current, tunables),
+                          call(tunables, current)])
+        self.assertEqual(failingListener.call_args_list,
+                         [call(current, tunables),
+                          call(tunables, current)])
+        lastListener.assert_not_called()
+
+    def test_updateListenerBeforeSwap(self):
+        """
+        The listeners must be called before the new tuning is readable.
+        """
+        current = self.store.get()
+        seen = []
+        self.store.registerListener(
+            lambda previous, tunables: seen.append(self.store.get()))
+        self.store.update({'stateUpdatePeriod': 0.1})
+        self.assertIs(seen[0], current)
+        self.assertEqual(seen, [current])
+
+    def test_updateConcurrent(self):
+        """
+        The readers must only ever see complete snapshots while
+        updates are applied concurrently.
+        """
+        ranges = [(0, 90, 180), (10, 50, 90)]
+        torn = []
+        stop = threading.Event()
+
+        def reader():
+            while not stop.is_set():
+                tunables = self.store.get()
+                index = ranges.index(tunables.steering[1])
+                if tunables.throttle[1] != ranges[index]:
+                    torn.append(tunables)
+
+        thread = threading.Thread(target=reader)
+        thread.start()
+        for count in range(500):
+            motionRange = list(ranges[count % 2])
+            self.store.update({'steering': {'range': motionRange},
+                               'throttle': {'range': motionRange}})
+        stop.set()
+        thread.join()
+        self.assertEqual(torn, [])
@@ -0,0 +1,104 @@
+import logging
+import threading
+import time
+from unittest import TestCase
+from unittest.mock import Mock
+
+import os
+import sys
+
+sys.path.append(os.path.abspath('./src'))
+
+from pkgs.unit.commandWorker import CommandWorker   # noqa: E402
+
+
+class TestCommandWorker(TestCase):
+    """
+    Command worker test cases.
+    """
+    def setUp(self):
+        """
+        Test cases setup.
+        """
+        self.handled = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.worker = CommandWorker(logging, self._handler)
+        self.worker.start()
+
+    def tearDown(self):
+        """
+        Test cases teardown.
+        """
+        self.gate.set()
+        self.worker.stop()
+        self.worker.join(1.0)
+
+    def _handler(self, msg, receivedTime):
+        """
+        Slow command handler.
+        """
+        self.gate.wait()
+        self.handled.append(msg)
+
+    def _waitHandled(self, msg):
+        """
+        Wait for a message to be handled.
+        """
+        deadline = time.monotonic() + 1.0
+        while msg not in self.handled and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+    def test_post(self):
+        """
+        The posted commands must be handled by the worker.
+        """
+        self.worker.post('cmd-1')
+        self._waitHandled('cmd-1')
+        self.assertEqual(self.handled, ['cmd-1'])
+
+    def test_postLatestWins(self):
+        """
+        The commands posted while the worker is busy must be coalesced
+        into the latest one.
+        """
+        self.gate.clear()
+        self.worker.post('cmd-1')
+        time.sleep(0.01)
+        for i in range(2, 6):
+            self.worker.post(f"cmd-{i}")
+        self.gate.set()
+        self._waitHandled('cmd-5')
+        self.assertEqual(self.handled, ['cmd-1', 'cmd-5'])
+        self.assertEqual(self.worker.getCoalescedCount(), 3)
+
+    def test_postNeverBlocks(self):
+        """
+        Posting must not wait for a busy worker, so the posting thread
+        stays free to handle an emergency stop under a saturated command
+        stream.
+        """
+        self.gate.clear()
+        releaser = threading.Timer(0.1, self.gate.set)
+        releaser.start()
+        start = time.monotonic()
+        for i in range(100):
+            self.worker.post(f"cmd-{i}")
+        self.assertLess(time.monotonic() - start, 0.1)
+        self.assertFalse(self.gate.is_set())
+        self._waitHandled('cmd-99')
+        releaser.join()
+        self.assertEqual(self.handled[-1], 'cmd-99')
+
+    def test_postOnCoalesced(self):
+        """
+        The coalesced callback must be called for every superseded
+        command.
+        """
+        onCoalesced = Mock()
+        worker = CommandWorker(logging, self._handler,
+                               onCoalesced=onCoalesced)
+        for i in range(3):
+            worker.post(f"cmd-{i}")
+        self.assertEqual(onCoalesced.call_count, 2)
+        self.assertEqual(worker.getCoalescedCount(), 2)
@@ -0,0 +1,572 @@
+import json
+import logging
+import tempfile
+import threading
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath('./src'))
+
+from pkgs.controlDevice import ControlDevice    # noqa: E402
+from pkgs.messages import UnitWhldCmdMsg        # noqa: E402
+from pkgs.mission import MissionNotLoaded       # noqa: E402
+from pkgs.mixer import Mixer                    # noqa: E402
+from pkgs.recorder import Recorder              # noqa: E402
+from pkgs.tuning import Tunables, TuningInvalid  # noqa: E402
+from pkgs.unit import Unit                      # noqa: E402
+
+
+class TestUnit(TestCase):
+    """
+    Unit class test cases.
+    """
+    def setUp(self):
+        """
+        Test cases setup.
+        """
+        self.mockedBackend = Mock()
+        self.mockedBackend.getChannelCount.return_value = 16
+        ControlDevice.initBackend(self.mockedBackend)
+        self.defaults = Tunables(0.025, (2, (0, 90, 180)), (3, (0, 90, 180)))
+        self.otherDefaults = self.defaults._replace(
+            steering=(4, (0, 90, 180)), throttle=(5, (0, 90, 180)))
+        self.unit = Unit(logging, 'unit-1', self.defaults)
+        self.unit._steering = Mock()
+        self.unit._throttle = Mock()
+        self.unit._missionRunner = Mock()
+        self.unit._missionRunner.isActive.return_value = False
+
+    def _commandMsg(self, steering, throttle):
+        """
+        Build a command message.
+        """
+        return json.dumps({'unit id': 'test unit',
+                           'payload': {'steering': steering,
+                                       'throttle': throttle}})
+
+    def test_constructorDevices(self):
+        """
+        The constructor must create the unit devices on the unit
+        channels.
+        """
+        with patch('pkgs.unit.unit.ControlDevice') as mockedControlDevice:
+            mockedControlDevice.backend = self.mockedBackend
+            Unit(logging, 'unit-2', self.otherDefaults)
+            steeringCall, throttleCall = \
+                mockedControlDevice.call_args_list
+            self.assertEqual(steeringCall.args[1:],
+                             (mockedControlDevice.TYPE_DIRECT, (0, 90, 180)))
+            self.assertEqual(steeringCall.kwargs,
+                             {'channel': 4, 'saturate': True})
+            self.assertEqual(throttleCall.args[1:],
+                             (mockedControlDevice.TYPE_ESC, (0, 90, 180)))
+            self.assertEqual(throttleCall.kwargs,
+                             {'channel': 5, 'saturate': True})
+
+    def test_constructorChannels(self):
+        """
+        The constructor must claim the unit channels and refuse the
+        channels of another unit before creating any device.
+        """
+        self.assertEqual(ControlDevice.channels.getOwner(2), 'unit-1')
+        self.assertEqual(ControlDevice.channels.getOwner(3), 'unit-1')
+        self.mockedBackend.reset_mock()
+        with self.assertRaises(TuningInvalid):
+            Unit(logging, 'unit-2', self.otherDefaults._replace(
+                throttle=self.defaults.throttle))
+        self.mockedBackend.setAngle.assert_not_called()
+        self.assertIsNone(ControlDevice.channels.getOwner(4))
+
+    def test_getSubscriptions(self):
+        """
+        The getSubscriptions method must return the unit topics with
+        their callbacks.
+        """
+        testResult = self.unit.getSubscriptions()
+        self.assertEqual(testResult,
+                         ((('unit-1/estop', Unit.TOPIC_QOS),
+                           self.unit.onEstopMsg),
+                          (('unit-1/rearm', Unit.TOPIC_QOS),
+                           self.unit.onRearmMsg),
+                          (UnitWhldCmdMsg('unit-1').getTopic(),
+                           self.unit.onCommandMsg),
+                          (('unit-1/tuning', Unit.TOPIC_QOS),
+                           self.unit.onTuningMsg),
+                          (('unit-1/mission', Unit.TOPIC_QOS),
+                           self.unit.onMissionMsg)))
+
+    def test_applySetpoint(self):
+        """
+        The applySetpoint method must modify both devices positions
+        with the same tuning snapshot.
+        """
+        self.unit.applySetpoint(0.3, -0.4)
+        self.unit._steering.modifyPosition.assert_called_once_with(
+            0.3, self.defaults.steering)
+        self.unit._throttle.modifyPosition.assert_called_once_with(
+            -0.4, self.defaults.throttle)
+
+    def test_applySetpointLatched(self):
+        """
+        The applySetpoint method must not modify the devices positions
+        while the emergency stop is latched.
+        """
+        self.unit.onEstopMsg(None, None, b'')
+        self.unit.applySetpoint(0.3, -0.4)
+        self.unit._steering.modifyPosition.assert_not_called()
+        self.unit._throttle.modifyPosition.assert_not_called()
+
+    def test_onCommandMsg(self):
+        """
+        The onCommandMsg method must only post the message to the
+        command worker.
+        """
+        self.unit._commandWorker = Mock()
+        msg = self._commandMsg(0.25, -0.45)
+        self.unit.onCommandMsg(None, None, msg)
+        self.unit._commandWorker.post.assert_called_once_with(msg)
+        self.unit._steering.modifyPosition.assert_not_called()
+
+    def test_handleCommand(self):
+        """
+        The _handleCommand method must modify the devices positions
+        based on the received message and record the command latency.
+        """
+        self.unit._handleCommand(self._commandMsg(0.25, -0.45),
+                                 time.monotonic())
+        self.assertEqual(self.unit.getLatencyStats()['command']['count'], 1)
+        self.unit._steering.modifyPosition.assert_called_once_with(
+            0.25, self.defaults.steering)
+        self.unit._throttle.modifyPosition.assert_called_once_with(
+            -0.45, self.defaults.throttle)
+
+    def test_handleCommandOverrideMission(self):
+        """
+        The _handleCommand method must override the active mission
+        before applying the live command.
+        """
+        now = time.monotonic()
+        self.unit._handleCommand(self._commandMsg(0.1, 0.2), now)
+        self.unit._missionRunner.override.assert_not_called()
+        self.unit._missionRunner.isActive.return_value = True
+        self.unit._handleCommand(self._commandMsg(0.1, 0.2), now)
+        self.unit._missionRunner.override.assert_called_once()
+
+    def test_onEstopMsg(self):
+        """
+        The onEstopMsg method must set the throttle then the steering
+        to neutral in one write, abort the mission and drop the next
+        commands until re-armed.
+        """
+        self.unit.onEstopMsg(None, None, b'')
+        self.mockedBackend.setAngles.assert_called_once_with(
+            ((3, 90), (2, 90)))
+        self.unit._missionRunner.abort.assert_called_once()
+        self.unit._handleCommand(self._commandMsg(0.1, 0.2),
+                                 time.monotonic())
+        self.unit._steering.modifyPosition.assert_not_called()
+        self.assertEqual(self.unit.getLatencyStats()['estop']['count'], 1)
+        self.unit.onRearmMsg(None, None, b'')
+        self.unit._handleCommand(self._commandMsg(0.1, 0.2),
+                                 time.monotonic())
+        self.unit._steering.modifyPosition.assert_called_once()
+
+    def test_onEstopMsgReceivedTime(self):
+        """
+        The onEstopMsg method must measure the stop latency from the
+        callback entry.
+        """
+        with patch.object(self.unit._estop, 'trigger') as mockedTrigger, \
+                patch('pkgs.unit.unit.time') as mockedTime:
+            mockedTime.monotonic.return_value = 12.0
+            self.unit.onEstopMsg(None, None, b'')
+        mockedTrigger.assert_called_once_with(12.0)
+
+    def test_onEstopMsgSaturated(self):
+        """
+        An emergency stop received on another thread while the command
+        worker is saturated must reach the PWM faster than the commands,
+        both measured from their callback entry.
+        """
+        handling = threading.Event()
+        posting = threading.Event()
+        posting.set()
+
+        def slowHandling(*args):
+            handling.set()
+            time.sleep(0.02)
+
+        def postCommands():
+            count = 0
+            while posting.is_set():
+                self.unit.onCommandMsg(
+                    None, None, self._commandMsg(0.1, count % 100 / 100))
+                count += 1
+                time.sleep(0.001)
+
+        self.unit._steering.modifyPosition.side_effect = slowHandling
+        self.unit._commandWorker.start()
+        poster = threading.Thread(target=postCommands)
+        poster.start()
+        self.assertTrue(handling.wait(1))
+        time.sleep(0.05)
+        estop = threading.Thread(target=self.unit.onEstopMsg,
+                                 args=(None, None, b''))
+        estop.start()
+        estop.join(1)
+        posting.clear()
+        poster.join(1)
+        self.unit._commandWorker.stop()
+        self.unit._commandWorker.join(1)
+        stats = self.unit.getLatencyStats()
+        self.assertGreater(stats['coalesced'], 0)
+        self.assertGreaterEqual(stats['command']['count'], 2)
+        self.assertEqual(stats['estop']['count'], 1)
+        self.assertLess(stats['estop']['max'], stats['command']['mean'])
+
+    def test_onMissionMsgLoadStart(self):
+        """
+        The onMissionMsg method must load and start the received
+        mission.
+        """
+        missionMsg = json.dumps({'action': 'start',
+                                 'mission': {'rate': 10,
+                                             'points': [[0, 0, 0],
+                                                        [1, 0.5, 0.5]]}})
+        self.unit.onMissionMsg(None, None, missionMsg)
+        mission, = self.unit._missionRunner.load.call_args.args
+        self.assertEqual(len(mission), 11)
+        self.unit._missionRunner.begin.assert_called_once()
+
+    def test_onMissionMsgActions(self):
+        """
+        The onMissionMsg method must forward the mission actions
+        to the mission runner.
+        """
+        runner = self.unit._missionRunner
+        for action, method in (('pause', runner.pause),
+                               ('resume', runner.resume),
+                               ('abort', runner.abort)):
+            self.unit.onMissionMsg(None, None, json.dumps({'action': action}))
+            method.assert_called_once()
+        runner.load.assert_not_called()
+
+    def test_onMissionMsgInvalid(self):
+        """
+        The onMissionMsg method must not raise on invalid messages.
+        """
+        self.unit._missionRunner.begin.side_effect = MissionNotLoaded()
+        invalidMsgs = ['not json', '[1]', 'null', '5',
+                       json.dumps({'mission': {'rate': True,
+                                               'points': [[0, 0, 0],
+                                                          [1, 0, 0]]}}),
+                       json.dumps({'mission': {'rate': 10}}),
+                       json.dumps({'action': 'PROUT'}),
+                       json.dumps({'action': 'start'})]
+        with patch.object(self.unit, '_logger') as mockedLogger:
+            for invalidMsg in invalidMsgs:
+                self.unit.onMissionMsg(None, None, invalidMsg)
+            self.assertEqual(mockedLogger.error.call_count, len(invalidMsgs))
+
+    def test_onTuningMsg(self):
+        """
+        The onTuningMsg method must update the unit tuning.
+        """
+        self.unit.onTuningMsg(None, None,
+                              json.dumps({'stateUpdatePeriod': 0.1}))
+        self.assertEqual(self.unit.getStatePeriod(), 0.1)
+
+    def test_onTuningMsgInvalid(self):
+        """
+        The onTuningMsg method must not raise on invalid messages.
+        """
+        with patch.object(self.unit, '_logger') as mockedLogger, \
+                patch.object(self.unit._tuning, 'update') as mockedUpdate:
+            mockedUpdate.side_effect = TuningInvalid('idleDelay', -1)
+            self.unit.onTuningMsg(None, None, json.dumps({'idleDelay': -1}))
+            self.unit.onTuningMsg(None, None, 'not json')
+            self.assertEqual(mockedLogger.error.call_count, 2)
+
+    def test_onTuningMsgBackendFailure(self):
+        """
+        The onTuningMsg method must not raise and keep the current
+        tuning if the backend fails to apply it.
+        """
+        self.unit._steering.setSetup.side_effect = OSError('I2C failure')
+        with patch.object(self.unit, '_logger') as mockedLogger:
+            self.unit.onTuningMsg(None, None,
+                                  json.dumps({'steering': {'channel': 4}}))
+            mockedLogger.error.assert_called_once()
+        self.assertEqual(self.unit.getTuning().get().steering,
+                         self.defaults.steering)
+        self.assertIsNone(ControlDevice.channels.getOwner(4))
+
+    def test_onTuningMsgChannelUsed(self):
+        """
+        The onTuningMsg method must refuse to move a device onto the
+        channel of another unit.
+        """
+        Unit(logging, 'unit-2', self.otherDefaults)
+        with patch.object(self.unit, '_logger') as mockedLogger:
+            self.unit.onTuningMsg(None, None,
+                                  json.dumps({'throttle': {'channel': 5}}))
+            mockedLogger.error.assert_called_once()
+        self.unit._throttle.setSetup.assert_not_called()
+        self.assertEqual(ControlDevice.channels.getOwner(5), 'unit-2')
+
+    def test_applyTunables(self):
+        """
+        The tuning updates must be applied to the devices.
+        """
+        self.unit.getTuning().update({'steering': {'range': [10, 50, 90]}})
+        self.unit._steering.setSetup.assert_called_once_with(
+            (2, (10, 50, 90)))
+        self.unit._throttle.setSetup.assert_called_once_with(
+            self.defaults.throttle)
+
+    def test_updateIdle(self):
+        """
+        The updateIdle method must enter the idle mode only after the
+        idle delay at neutral without setpoint changes.
+        """
+        now = time.monotonic()
+        self.assertFalse(self.unit.updateIdle(now))
+        self.unit.applySetpoint(0.5, 0.0)
+        self.assertFalse(self.unit.updateIdle(now + 60.0))
+        self.unit.applySetpoint(0.0, 0.0)
+        now = time.monotonic()
+        self.assertFalse(self.unit.updateIdle(now + 29.0))
+        self.assertEqual(self.unit.getStatePeriod(), 0.025)
+        self.assertTrue(self.unit.updateIdle(now + 30.0))
+        self.assertTrue(self.unit.isIdle())
+        self.assertEqual(self.unit.getStatePeriod(), 1.0)
+
+    def test_updateIdleEstop(self):
+        """
+        The updateIdle method must enter the idle mode while the
+        emergency stop is latched.
+        """
+        self.unit.applySetpoint(0.5, 0.5)
+        self.unit.onEstopMsg(None, None, b'')
+        self.assertTrue(self.unit.updateIdle(time.monotonic() + 30.0))
+
+    def test_applySetpointIdle(self):
+        """
+        The applySetpoint method must skip the neutral setpoints while
+        idle and wake the unit up on the first non-neutral one, which
+        the main loop turns into leaving the idle mode.
+        """
+        wakeListener = Mock()
+        self.unit.registerWakeListener(wakeListener)
+        now = time.monotonic()
+        self.assertTrue(self.unit.updateIdle(now + 30.0))
+        self.unit.applySetpoint(0.0, 0.0)
+        self.unit._steering.modifyPosition.assert_not_called()
+        self.unit._throttle.modifyPosition.assert_not_called()
+        wakeListener.assert_not_called()
+        self.unit.applySetpoint(0.0, 0.2)
+        wakeListener.assert_called_once_with()
+        self.unit._throttle.modifyPosition.assert_called_once_with(
+            0.2, self.defaults.throttle)
+        self.unit.applySetpoint(0.0, 0.0)
+        self.unit._throttle.modifyPosition.assert_called_with(
+            0.0, self.defaults.throttle)
+        self.assertFalse(self.unit.updateIdle(now + 30.0))
+        self.assertFalse(self.unit.isIdle())
+
+    def test_updateIdleRace(self):
+        """
+        The updateIdle method must not enter the idle mode when a
+        setpoint is published while it switches the mode.
+        """
+        tunables = self.unit.getTuning().get()
+
+        def publishSetpoint():
+            self.unit._lastActivity = time.monotonic()
+            return tunables
+
+        with patch.object(self.unit.getTuning(), 'get',
+                          side_effect=publishSetpoint):
+            self.assertFalse(
+                self.unit.updateIdle(time.monotonic() + 30.0))
+        self.assertFalse(self.unit.isIdle())
+
+    def test_recordFile(self):
+        """
+        The handled and dropped commands and the published states must
+        be recorded when a record file is given.
+        """
+        with tempfile.TemporaryDirectory() as tmpDir:
+            unit = Unit(logging, 'unit-2', self.otherDefaults,
+                        recordFile=os.path.join(tmpDir, 'unit-2.rec'))
+            unit._recorder.close()
+            unit._recorder = Mock()
+            now = time.monotonic()
+            unit._handleCommand(self._commandMsg(1.5, 0.5), now)
+            unit._onCoalesced(now)
+            unit.getStateMsg()
+            unit._recorder.record.assert_called_once()
+            unit.onStatePublished(unit.getStateMsg(), now, now + 0.01)
+            unit.onEstopMsg(None, None, b'')
+            unit._handleCommand(self._commandMsg(0.0, 0.0), now)
+            unit._onCoalesced(now)
+            unit.stop()
+        records = unit._recorder.record.call_args_list
+        kinds = [(record.args[0], record.args[-1]) for record in records]
+        self.assertEqual(kinds,
+                         [(Recorder.KIND_COMMAND, Recorder.FLAG_CLAMPED),
+                          (Recorder.KIND_STATE, 0),
+                          (Recorder.KIND_DROP, Recorder.FLAG_COALESCED),
+                          (Recorder.KIND_DROP, Recorder.FLAG_ESTOP),
+                          (Recorder.KIND_DROP, Recorder.FLAG_COALESCED)])
+        self.assertEqual(records[0].args[3:5], (1.5, 0.5))
+        self.assertEqual(records[1].args[1:3], (now, now + 0.01))
+        unit._recorder.close.assert_called_once()
+
+    def test_onCoalescedNoFileAccess(self):
+        """
+        The superseded commands must be kept in memory on the MQTT
+        thread and recorded by the command worker.
+        """
+        with tempfile.TemporaryDirectory() as tmpDir:
+            unit = Unit(logging, 'unit-2', self.otherDefaults,
+                        recordFile=os.path.join(tmpDir, 'unit-2.rec'))
+            unit._recorder.close()
+            unit._recorder = Mock()
+            for _ in range(3):
+                unit._onCoalesced(time.monotonic())
+            unit._recorder.record.assert_not_called()
+            unit._handleCommand(self._commandMsg(0.0, 0.0),
+                                time.monotonic())
+        flags = [record.args[-1]
+                 for record in unit._recorder.record.call_args_list]
+        self.assertEqual(flags, [Recorder.FLAG_COALESCED] * 3 + [0])
+
+    def test_mixer(self):
+        """
+        A unit with a mixer must drive the mixer outputs, stop them
+        and report the mixed command axes.
+        """
+        mixer = Mock()
+        mixer.getAxes.return_value = (0.25, -0.5)
+        mixer.getDevices.return_value = (Mock(), Mock())
+        unit = Unit(logging, 'unit-2', self.defaults, mixer=mixer)
+        self.assertIsNone(unit._steering)
+        self.assertIsNone(unit._throttle)
+        unit.applySetpoint(0.25, -0.5)
+        mixer.apply.assert_called_once_with(0.25, -0.5)
+        unitStateMsg = unit.getStateMsg()
+        self.assertEqual(unitStateMsg.getSteering(), 0.25)
+        self.assertEqual(unitStateMsg.getThrottle(), -0.5)
+        with patch('pkgs.unit.unit.ControlDevice') as mockedControlDevice:
+            unit.stop()
+            mockedControlDevice.setAllToNeutral.assert_called_once_with(
+                mixer.getDevices.return_value)
+
+    def test_mixerInitAngles(self):
+        """
+        A unit with a mixer must leave the mixer outputs at their own
+        neutral after init, even on the default device channels.
+        """
+        angles = {}
+        self.mockedBackend.setAngle.side_effect = angles.__setitem__
+        self.mockedBackend.setAngles.side_effect = angles.update
+        ControlDevice.channels.release('unit-1')
+        mixer = Mixer.fromConfig(logging, {'outputs': [
+            {'channel': 2, 'range': [0, 60, 180], 'mix': [1, 1]},
+            {'channel': 3, 'range': [0, 60, 180], 'mix': [-1, 1]}]},
+            'unit-2')
+        unit = Unit(logging, 'unit-2', self.defaults, mixer=mixer)
+        self.assertEqual(angles, {2: 60, 3: 60})
+        self.assertIsNone(unit._tuning.get().steering)
+        with self.assertRaises(TuningInvalid):
+            unit._tuning.update({'steering': {'channel': 5}})
+
+    def test_constructorMissingDevices(self):
+        """
+        A unit without a mixer must have steering and throttle setups.
+        """
+        with self.assertRaises(TuningInvalid):
+            Unit(logging, 'unit-2', self.defaults._replace(throttle=None))
+
+    def test_tuningChannelMoveEstop(self):
+        """
+        Moving a device to another channel must leave its previous
+        channel at neutral, and the emergency stop must drive the new
+        one.
+        """
+        angles = {}
+        self.mockedBackend.setAngle.side_effect = angles.__setitem__
+        self.mockedBackend.setAngles.side_effect = angles.update
+        ControlDevice.channels.release('unit-1')
+        unit = Unit(logging, 'unit-2', self.defaults)
+        unit.applySetpoint(0.0, 0.8)
+        self.assertEqual(angles[3], 162)
+        unit.onTuningMsg(None, None, json.dumps({'throttle': {'channel': 4}}))
+        unit.applySetpoint(0.0, 0.8)
+        unit.onEstopMsg(None, None, b'')
+        self.assertEqual(angles, {2: 90, 3: 90, 4: 90})
+
+    def test_floatTuningEstop(self):
+        """
+        A motion range with non integer positions must be refused, so
+        the emergency stop keeps writing integer neutral positions.
+        """
+        angles = {}
+        self.mockedBackend.setAngle.side_effect = angles.__setitem__
+        self.mockedBackend.setAngles.side_effect = angles.update
+        ControlDevice.channels.release('unit-1')
+        unit = Unit(logging, 'unit-2', self.defaults)
+        unit.onTuningMsg(None, None,
+                         json.dumps({'throttle': {'range': [0, 90.0, 180]}}))
+        self.assertEqual(unit.getTuning().get().throttle,
+                         self.defaults.throttle)
+        unit.applySetpoint(0.0, 0.8)
+        unit.onEstopMsg(None, None, b'')
+        self.assertEqual(angles, {2: 90, 3: 90})
+        for angle in angles.values():
+            self.assertIs(type(angle), int)
+
+    def test_getCxnStateMsg(self):
+        """
+        The getCxnStateMsg method must return the online connection
+        state of the unit.
+        """
+        cxnStateMsg = self.unit.getCxnStateMsg()
+        self.assertEqual(cxnStateMsg.getUnit(), 'unit-1')
+        self.assertTrue(cxnStateMsg.isOnline())
+
+    def test_getStateMsg(self):
+        """
+        The getStateMsg method must return the current unit state.
+        """
+        self.unit._steering.getModifier.return_value = 0.45
+        self.unit._throttle.getModifier.return_value = -0.97
+        unitStateMsg = self.unit.getStateMsg()
+        self.assertEqual(unitStateMsg.getUnit(), 'unit-1')
+        self.assertEqual(unitStateMsg.getSteering(), 0.45)
+        self.assertEqual(unitStateMsg.getThrottle(), -0.97)
+
+    def test_startStop(self):
+        """
+        The start and stop methods must start and stop the unit
+        workers, set the devices to neutral and release the unit
+        channels on stop.
+        """
+        self.unit._tuningWatcher = Mock()
+        self.unit._commandWorker = Mock()
+        self.unit.start()
+        self.unit._commandWorker.start.assert_called_once()
+        self.unit._missionRunner.start.assert_called_once()
+        self.unit._tuningWatcher.start.assert_called_once()
+        self.unit.stop()
+        self.unit._commandWorker.stop.assert_called_once()
+        self.unit._missionRunner.stop.assert_called_once()
+        self.unit._tuningWatcher.stop.assert_called_once()
+        self.unit._steering.setToNeutral.assert_called_once()
+        self.unit._throttle.setToNeutral.assert_called_once()
+        self.assertIsNone(ControlDevice.channels.getOwner(2))
@@ -0,0 +1,73 @@
+import io
+import json
+import logging
+import tempfile
+from contextlib import redirect_stderr, redirect_stdout
+from unittest import TestCase
+
+import os
+import sys
+
+sys.path.append(os.path.abspath('./src'))
+
+import analyze                      # noqa: E402
+from pkgs.recorder import Recorder  # noqa: E402
+
+
+class TestAnalyze(TestCase):
+    """
+    The analyze module test cases.
+    """
+    def setUp(self):
+        """
+        The test cases setup.
+        """
+        self.tmpDir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpDir.name, 'unit-1.rec')
+        recorder = Recorder(logging, self.path)
+        recorder.record(Recorder.KIND_COMMAND, 0.0, 0.001, 0.0, 0.0)
+        recorder.record(Recorder.KIND_COMMAND, 0.01, 0.011, 0.0, 0.0)
+        recorder.close()
+
+    def tearDown(self):
+        """
+        The test cases teardown.
+        """
+        self.tmpDir.cleanup()
+
+    def _main(self, argv):
+        """
+        Run the main function and capture its output.
+        """
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            status = analyze.main(argv)
+        return status, stdout.getvalue(), stderr.getvalue()
+
+    def test_main(self):
+        """
+        The main function must print a report per session.
+        """
+        status, stdout, _ = self._main([self.path])
+        self.assertEqual(status, 0)
+        self.assertTrue(stdout.startswith('session unit-1'))
+
+    def test_mainJson(self):
+        """
+        The main function must print the summaries as JSON if requested.
+        """
+        status, stdout, _ = self._main(['--json', self.path])
+        self.assertEqual(status, 0)
+        self.assertEqual(json.loads(stdout)['unit-1']['commands'], 2)
+
+    def test_mainInvalid(self):
+        """
+        The main function must report the invalid sessions and still
+        report the valid ones.
+        """
+        missing = os.path.join(self.tmpDir.name, 'missing.rec')
+        status, stdout, stderr = self._main([missing, self.path])
+        self.assertEqual(status, 1)
+        self.assertIn('missing.rec', stderr)
+        self.assertIn('session unit-1', stdout)
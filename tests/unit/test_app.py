@@ -1,6 +1,9 @@
+from contextlib import ExitStack
 import json
+import logging
+import tempfile
 from unittest import TestCase
-from unittest.mock import Mock, call, patch
+from unittest.mock import Mock, call, mock_open, patch
 
 import os
 import sys
@@ -10,64 +13,216 @@ mockedAdafruitSrvoKit = Mock()
 sys.modules['adafruit_servokit'] = mockedAdafruitSrvoKit
 
 import app      # noqa: E402
+from pkgs.mixer import MixerInvalid     # noqa: E402
+from pkgs.tuning import TuningInvalid   # noqa: E402
 
 
 class TestApp(TestCase):
     """
     The app module test cases.
     """
+    INIT_STEPS = ('_initControlDevices', '_initUnits', '_initProfiler',
+                  '_initMqttClient', '_initPublisher', '_initPowerMonitor',
+                  '_sendCxnState')
+
     def setUp(self):
         """
         The test cases setup.
         """
         app.client = Mock()
         app.logger = Mock()
-        app.steering = Mock()
-        app.throttle = Mock()
-        app.ControlDevice.servos = [Mock(), Mock()]
-        self.testSubs = (app.UnitWhldCmdMsg(app.CLIENT_ID).getTopic())
+        self.mockedUnits = [Mock(), Mock()]
+        for unit in self.mockedUnits:
+            unit.getSubscriptions.return_value = ()
+            unit.updateIdle.return_value = False
+        app.units = {'unit-1': self.mockedUnits[0],
+                     'unit-2': self.mockedUnits[1]}
+        app.publisher = Mock()
+        app.publisher.getStats.return_value = {'depth': (0, 0, 0),
+                                               'shed': (0, 0, 0),
+                                               'coalesced': (0, 0, 0),
+                                               'published': 0, 'failed': 0,
+                                               'pending': 0, 'evicted': 0}
+        app.publisher.getPendingAge.return_value = None
+        app.linkMonitor = Mock()
+        app.linkMonitor.update.return_value = 1.0
+        app.linkMonitor.getScale.return_value = 1.0
+        app.powerMonitor = Mock()
+        app.powerMonitor.getStats.return_value = {}
+        app.wakeup = Mock()
+        app.profiler = Mock()
+        app.ControlDevice.backend = Mock()
+        app.ControlDevice.channels = Mock()
+
+    def test__getBackendParams(self):
+        """
+        The _getBackendParams function must return the parameters
+        of the selected PWM backend.
+        """
+        testResult = app._getBackendParams(app.PwmBackend.TYPE_SERVOKIT)
+        self.assertEqual(testResult, {'servoKit': app.ServoKit,
+                                      'chanCount': app.PWM_CHAN_CNT,
+                                      'frequency': app.PWM_FREQ})
+        testResult = app._getBackendParams(app.PwmBackend.TYPE_PCA9685)
+        self.assertEqual(testResult, {'busNum': app.PWM_I2C_BUS,
+                                      'chanCount': app.PWM_CHAN_CNT,
+                                      'frequency': app.PWM_FREQ})
+        testResult = app._getBackendParams(app.PwmBackend.TYPE_PIGPIO)
+        self.assertEqual(testResult, {'pins': app.PIGPIO_PINS,
+                                      'host': app.PIGPIO_HOST,
+                                      'port': app.PIGPIO_PORT})
 
-    def test_onCommandMsgSteering(self):
+    def test__initControlDevice(self):
         """
-        The _onCommandMsg function must modify the steering position
-        based on the received message.
+        The _initControlDevice function must initialize the PWM backend.
         """
-        expectedModifier = 0.25
-        commandMsg = json.dumps({'unit id': 'test unit',
-                                 'payload': {'steering': expectedModifier,
-                                             'throttle': -0.45}})
-        app._onCommandMsg(None, None, commandMsg)
-        app.steering.modifyPosition.assert_called_once_with(expectedModifier)
+        with patch('app.ControlDevice') as mockedControlDevice, \
+                patch('app.createBackend') as mockedCreateBackend:
+            app._initControlDevices(Mock())
+            mockedCreateBackend.assert_called_once_with(
+                app.PWM_BACKEND, **app._getBackendParams(app.PWM_BACKEND))
+            mockedControlDevice.initBackend.assert_called_once_with(
+                mockedCreateBackend.return_value)
 
-    def test_onCommandMsgThrottle(self):
+    def test__loadUnitConfigsDefault(self):
         """
-        The _onCommandMsg function must modify the throttle position
-        based on the received message.
+        The _loadUnitConfigs function must return the default units
+        if no units file is defined.
         """
-        expectedModifier = -0.90
-        throttleMsg = json.dumps({'unit id': 'test unit',
-                                  'payload': {'steering': -0.23,
-                                              'throttle': expectedModifier}})
-        app._onCommandMsg(None, None, throttleMsg)
-        app.throttle.modifyPosition.assert_called_once_with(expectedModifier)
+        self.assertEqual(app._loadUnitConfigs(), app.UNITS)
 
-    def test__initControlDevice(self):
+    def test__loadUnitConfigsFile(self):
         """
-        The _initControlDevice function must create the two control device.
+        The _loadUnitConfigs function must load the units file
+        if defined.
         """
-        with patch('app.ControlDevice') as mockedControlDevice, \
-                patch('app.ServoKit') as mockedServoKit:
-            mockedControlDevice.side_effect = [Mock(), Mock()]
-            mockedAppLogger = Mock()
-            app._initControlDevices(mockedAppLogger)
-            expectedCalls = [call.initServoKit(mockedServoKit,
-                                               chanCount=app.PWM_CHAN_CNT,
-                                               frequency=app.PWM_FREQ),
-                             call(mockedAppLogger, app.STEERING_TYPE,
-                                  (app.STEERING_MIN, app.STEERING_NEUTRAL, app.STEERING_MAX)),  # noqa: E501
-                             call(mockedAppLogger, app.THROTTLE_TYPE,
-                                  (app.THROTTLE_MIN, app.THROTTLE_NEUTRAL, app.THROTTLE_MAX))]  # noqa: E501
-            mockedControlDevice.assert_has_calls(expectedCalls)
+        testUnits = [{'id': 'unit-1', 'steering': 0, 'throttle': 1},
+                     {'id': 'unit-2', 'steering': 2, 'throttle': 3}]
+        with patch('app.UNITS_FILE', 'units.json'), \
+                patch('builtins.open',
+                      mock_open(read_data=json.dumps(testUnits))):
+            self.assertEqual(app._loadUnitConfigs(), tuple(testUnits))
+
+    def test__getUnitTunables(self):
+        """
+        The _getUnitTunables function must build the unit tuning
+        on the unit channels.
+        """
+        testResult = app._getUnitTunables({'id': 'unit-2', 'steering': 2,
+                                           'throttle': 3})
+        self.assertEqual(testResult.stateUpdatePeriod,
+                         app.STATE_UPDATE_PERIOD)
+        self.assertEqual(testResult.steering,
+                         (2, (app.STEERING_MIN, app.STEERING_NEUTRAL,
+                              app.STEERING_MAX)))
+        self.assertEqual(testResult.throttle,
+                         (3, (app.THROTTLE_MIN, app.THROTTLE_NEUTRAL,
+                              app.THROTTLE_MAX)))
+        self.assertEqual(testResult.idleDelay, app.IDLE_DELAY)
+        self.assertEqual(testResult.idleStatePeriod,
+                         app.IDLE_STATE_UPDATE_PERIOD)
+        testResult = app._getUnitTunables({'id': 'unit-3', 'mixer': {}})
+        self.assertIsNone(testResult.steering)
+        self.assertIsNone(testResult.throttle)
+
+    def test__getRecordFile(self):
+        """
+        The _getRecordFile function must return a unit session record
+        file in the record directory, if defined.
+        """
+        self.assertIsNone(app._getRecordFile('unit-1'))
+        with patch('app.RECORD_DIR', '/var/records'):
+            testResult = app._getRecordFile('unit-1')
+        self.assertEqual(os.path.dirname(testResult), '/var/records')
+        self.assertRegex(os.path.basename(testResult),
+                         r'^unit-1-\d{8}-\d{6}\.rec$')
+
+    def test__initUnits(self):
+        """
+        The _initUnits function must create and start every unit once.
+        """
+        testUnits = ({'id': 'unit-1', 'steering': 0, 'throttle': 1},
+                     {'id': 'unit-2', 'steering': 2, 'throttle': 3,
+                      'tuningFile': 'tuning.json'},
+                     {'id': 'unit-1', 'steering': 4, 'throttle': 5})
+        mockedAppLogger = Mock()
+        with patch('app.UNITS', testUnits), \
+                patch('app.Unit') as mockedUnit:
+            mockedUnit.side_effect = [Mock(), Mock()]
+            app._initUnits(mockedAppLogger)
+            expectedCalls = [call(mockedAppLogger, 'unit-1',
+                                  app._getUnitTunables(testUnits[0]),
+                                  tuningFile=None, recordFile=None,
+                                  mixer=None),
+                             call(mockedAppLogger, 'unit-2',
+                                  app._getUnitTunables(testUnits[1]),
+                                  tuningFile='tuning.json',
+                                  recordFile=None, mixer=None)]
+            self.assertEqual(mockedUnit.call_args_list, expectedCalls)
+        self.assertEqual(list(app.units), ['unit-1', 'unit-2'])
+        for unit in app.units.values():
+            unit.registerWakeListener.assert_called_once_with(
+                app.wakeup.set)
+            unit.start.assert_called_once()
+        app.logger.error.assert_called_once()
+
+    def test__getUnitMixer(self):
+        """
+        The _getUnitMixer function must create the unit mixer if the
+        unit configuration has one.
+        """
+        mixerConfig = {'outputs': [{'channel': 4, 'mix': [1, 1]}]}
+        mockedAppLogger = Mock()
+        with patch('app.Mixer') as mockedMixer:
+            self.assertIsNone(app._getUnitMixer(mockedAppLogger,
+                                                {'id': 'unit-1'}))
+            testResult = app._getUnitMixer(mockedAppLogger,
+                                           {'id': 'unit-1',
+                                            'mixer': mixerConfig})
+            mockedMixer.fromConfig.assert_called_once_with(
+                mockedAppLogger, mixerConfig, 'unit-1')
+            self.assertEqual(testResult, mockedMixer.fromConfig.return_value)
+
+    def test__initUnitsInvalid(self):
+        """
+        The _initUnits function must ignore a unit with an invalid
+        configuration or failing to be created, and release its channels.
+        """
+        testUnits = ({'id': 'unit-1', 'mixer': {}},
+                     {'id': 'unit-2', 'steering': 0, 'throttle': 1},
+                     {'id': 'unit-3', 'steering': 2, 'throttle': 3},
+                     {'id': 'unit-4', 'steering': 4, 'throttle': 5},
+                     {'id': 'unit-5', 'throttle': 6},
+                     {'steering': 7, 'throttle': 8},
+                     'unit-6',
+                     {'id': 'unit-7', 'steering': 9, 'throttle': 10})
+        with patch('app.UNITS', testUnits), \
+                patch('app.Unit') as mockedUnit, \
+                patch('app._getUnitMixer') as mockedGetUnitMixer:
+            mockedGetUnitMixer.side_effect = [MixerInvalid('no output'),
+                                              None, None, None, None]
+            mockedUnit.side_effect = [TuningInvalid('channels', (0, 1)),
+                                      OSError(13, 'Permission denied'),
+                                      KeyError('steering'),
+                                      Mock()]
+            app._initUnits(Mock())
+            self.assertEqual(mockedUnit.call_count, 4)
+        self.assertEqual(list(app.units), ['unit-7'])
+        self.assertEqual(app.ControlDevice.channels.release.call_args_list,
+                         [call('unit-1'), call('unit-2'), call('unit-3'),
+                          call('unit-4')])
+        self.assertEqual(app.logger.error.call_count, 7)
+
+    def test__initUnitsNone(self):
+        """
+        The _initUnits function must fail when no unit is hosted.
+        """
+        with patch('app.UNITS', ({'id': 'unit-1'},)), \
+                patch('app.Unit') as mockedUnit:
+            with self.assertRaisesRegex(RuntimeError, 'no unit'):
+                app._initUnits(Mock())
+            mockedUnit.assert_not_called()
+        self.assertEqual(app.units, {})
 
     def test__initMqttClientInit(self):
         """
@@ -79,128 +234,397 @@ class TestApp(TestCase):
                                                 app.CLIENT_ID,
                                                 app.CLIENT_PASSWORD)
 
-    def test__initMqttClientSubscribe(self):
+    def test__initMqttClientSubscriptions(self):
+        """
+        The _initMqttClient function must subscribe to every unit topics
+        and register their callbacks.
+        """
+        for index, unit in enumerate(self.mockedUnits):
+            unit.getSubscriptions.return_value = \
+                (((f"cmd/{index}", 0), unit.onCommandMsg),
+                 ((f"tuning/{index}", 1), unit.onTuningMsg))
+        app._initMqttClient(Mock())
+        expectedSubs = [call(('cmd/0', 0)), call(('tuning/0', 1)),
+                        call(('cmd/1', 0)), call(('tuning/1', 1)),
+                        call((app.PWM_TOPIC, app.PWM_QOS)),
+                        call((app.PROFILE_TOPIC, app.PROFILE_QOS))]
+        self.assertEqual(app.client.subscribe.call_args_list, expectedSubs)
+        expectedCallbacks = [
+            call('cmd/0', self.mockedUnits[0].onCommandMsg),
+            call('tuning/0', self.mockedUnits[0].onTuningMsg),
+            call('cmd/1', self.mockedUnits[1].onCommandMsg),
+            call('tuning/1', self.mockedUnits[1].onTuningMsg),
+            call(app.PWM_TOPIC, app._onPwmMsg),
+            call(app.PROFILE_TOPIC, app._onProfileMsg)]
+        self.assertEqual(app.client.registerMsgCallback.call_args_list,
+                         expectedCallbacks)
+
+    def test__initProfiler(self):
         """
-        The _initMqttClient function must subscribe to the relevant topics.
+        The _initProfiler function must create the profiler and install
+        its signal handler.
         """
-        mockedAppLogger = Mock()
-        app._initMqttClient(mockedAppLogger)
-        app.client.subscribe.assert_called_once_with(self.testSubs)
+        with patch('app.SamplingProfiler') as mockedProfiler:
+            mockedAppLogger = Mock()
+            app._initProfiler(mockedAppLogger)
+            mockedProfiler.assert_called_once_with(mockedAppLogger,
+                                                   app._saveProfile)
+            app.profiler.install.assert_called_once()
 
-    def test__initMqttClientRegisterMsgCallbacks(self):
+    def test__onPwmMsg(self):
         """
-        The _initMqttClient function must register the message callbacks.
+        The _onPwmMsg function must set the backend PWM frequency.
         """
-        mockedAppLogger = Mock()
-        app._initMqttClient(mockedAppLogger)
-        expectedCalls = [call(self.testSubs[0], app._onCommandMsg)]
-        app.client.registerMsgCallback.assert_has_calls(expectedCalls)
+        with patch.object(app.ControlDevice, 'backend') as mockedBackend:
+            app._onPwmMsg(None, None, json.dumps({'pwmFreq': 60}))
+        mockedBackend.setFrequency.assert_called_once_with(60)
+        app.logger.error.assert_not_called()
+
+    def test__onPwmMsgInvalid(self):
+        """
+        The _onPwmMsg function must not raise on invalid messages or
+        backend failures.
+        """
+        invalidMsgs = ['not json', '[1]', json.dumps({}),
+                       json.dumps({'pwmFreq': 0}),
+                       json.dumps({'pwmFreq': 60.5}),
+                       json.dumps({'pwmFreq': True})]
+        with patch.object(app.ControlDevice, 'backend') as mockedBackend:
+            for invalidMsg in invalidMsgs:
+                app._onPwmMsg(None, None, invalidMsg)
+            mockedBackend.setFrequency.assert_not_called()
+            for error in (app.PwmBackendUnsupported('PWM frequency changes'),
+                          OSError(5, 'I/O error')):
+                mockedBackend.setFrequency.side_effect = error
+                app._onPwmMsg(None, None, json.dumps({'pwmFreq': 60}))
+        self.assertEqual(app.logger.error.call_count, len(invalidMsgs) + 2)
+
+    def test__onProfileMsg(self):
+        """
+        The _onProfileMsg function must start and stop the profiler.
+        """
+        app._onProfileMsg(None, None, json.dumps({'action': 'start'}))
+        app.profiler.start.assert_called_once_with(app.PROFILE_DURATION)
+        app._onProfileMsg(None, None, json.dumps({'action': 'start',
+                                                  'duration': 30}))
+        app.profiler.start.assert_called_with(30)
+        app._onProfileMsg(None, None, json.dumps({'action': 'stop'}))
+        app.profiler.stop.assert_called_once()
+
+    def test__onProfileMsgInvalid(self):
+        """
+        The _onProfileMsg function must not raise on invalid messages.
+        """
+        app.profiler.start.side_effect = app.ProfilerRunning()
+        invalidMsgs = ['not json', '[1]', json.dumps({'action': 'PROUT'}),
+                       json.dumps({'action': 'start'})]
+        for invalidMsg in invalidMsgs:
+            app._onProfileMsg(None, None, invalidMsg)
+        self.assertEqual(app.logger.error.call_count, len(invalidMsgs))
+
+    def test__saveProfile(self):
+        """
+        The _saveProfile function must save the collapsed stacks
+        in the profile directory.
+        """
+        report = ['MainThread;run (app.py:1) 3',
+                  'MainThread;run (app.py:1);wait (threading.py:2) 7']
+        with tempfile.TemporaryDirectory() as tmpDir, \
+                patch('app.PROFILE_DIR', tmpDir):
+            app._saveProfile(report)
+            profileFile, = os.listdir(tmpDir)
+            self.assertTrue(profileFile.endswith('.folded'))
+            with open(os.path.join(tmpDir, profileFile)) as savedFile:
+                self.assertEqual(savedFile.read().splitlines(), report)
+        with patch('app.PROFILE_DIR', '/not/a/dir'):
+            app._saveProfile(report)
+            app.logger.error.assert_called_once()
+
+    def test__initPublisher(self):
+        """
+        The _initPublisher function must create and start the publish
+        queue on the MQTT client.
+        """
+        with patch('app.PublishQueue') as mockedPublishQueue, \
+                patch('app.LinkMonitor') as mockedLinkMonitor:
+            mockedAppLogger = Mock()
+            app._initPublisher(mockedAppLogger)
+            mockedLinkMonitor.assert_called_once_with(
+                mockedAppLogger, targetLatency=app.TELEMETRY_TARGET_LATENCY,
+                maxScale=app.TELEMETRY_MAX_SCALE)
+            mockedPublishQueue.assert_called_once_with(
+                mockedAppLogger, app.client.publish,
+                onComplete=app.linkMonitor.recordLatency)
+            app.publisher.start.assert_called_once()
 
     def test__sendCxnState(self):
         """
-        The _sendCxnState function must send the online connection state.
+        The _sendCxnState function must queue the connection state
+        of every unit as critical, coalesced per unit.
         """
         app._sendCxnState()
-        cxnStateMsg, = app.client.publish.call_args.args
-        self.assertEqual(cxnStateMsg.getUnit(), app.CLIENT_ID)
-        self.assertTrue(cxnStateMsg.isOnline())
+        expectedCalls = [call(unit.getCxnStateMsg.return_value,
+                              app.PublishQueue.PRIORITY_CRITICAL,
+                              key=unit.getId.return_value)
+                         for unit in self.mockedUnits]
+        self.assertEqual(app.publisher.put.call_args_list, expectedCalls)
+        app.client.publish.assert_not_called()
 
     def test__sendUnitState(self):
         """
-        The _sendUnitState function must send the current unit state.
+        The _sendUnitState function must queue the unit state
+        as telemetry.
+        """
+        unit = self.mockedUnits[1]
+        app._sendUnitState(unit)
+        app.publisher.put.assert_called_once_with(
+            unit.getStateMsg.return_value,
+            app.PublishQueue.PRIORITY_TELEMETRY,
+            onPublished=unit.onStatePublished)
+        app.client.publish.assert_not_called()
+
+    def test__reportPublishStats(self):
+        """
+        The _reportPublishStats function must log the publish queue
+        statistics.
+        """
+        app._reportPublishStats()
+        app.publisher.getStats.assert_called_once()
+        app.logger.info.assert_called_once()
+
+    def _init(self):
         """
-        expectedSteeringMod = 0.45
-        expectedThrottleMod = -0.97
-        app.steering.getModifier.return_value = expectedSteeringMod
-        app.throttle.getModifier.return_value = expectedThrottleMod
-        app._sendUnitState()
-        unitStateMsg, = app.client.publish.call_args.args
-        self.assertEqual(unitStateMsg.getUnit(), app.CLIENT_ID)
-        self.assertEqual(unitStateMsg.getSteering(), expectedSteeringMod)
-        self.assertEqual(unitStateMsg.getThrottle(), expectedThrottleMod)
+        Run the init function with every initialization step mocked.
+
+        Return:
+            The app logger and the mocked initialization steps.
+        """
+        with ExitStack() as stack:
+            mockedInitLogger = stack.enter_context(patch('app.initLogger'))
+            mockedSteps = {step: stack.enter_context(patch(f"app.{step}"))
+                           for step in self.INIT_STEPS}
+            app.init()
+        return mockedInitLogger.return_value, mockedSteps
 
     def test_initControlDevices(self):
         """
         The init function must initialize the control devices.
         """
-        with patch('app.initLogger') as mockedInitLogger, \
-                patch('app._initControlDevices') as mockedInitCtrlDev, \
-                patch('app._initMqttClient'), \
-                patch('app._sendCxnState'):
-            mockedAppLogger = Mock()
-            mockedInitLogger.return_value = mockedAppLogger
-            app.init()
-            mockedInitCtrlDev.assert_called_once_with(mockedAppLogger)
+        appLogger, mockedSteps = self._init()
+        mockedSteps['_initControlDevices'].assert_called_once_with(appLogger)
+
+    def test_initUnits(self):
+        """
+        The init function must initialize the hosted units.
+        """
+        appLogger, mockedSteps = self._init()
+        mockedSteps['_initUnits'].assert_called_once_with(appLogger)
+
+    def test_initProfiler(self):
+        """
+        The init function must initialize the profiler.
+        """
+        appLogger, mockedSteps = self._init()
+        mockedSteps['_initProfiler'].assert_called_once_with(appLogger)
 
     def test_initMqttClient(self):
         """
-        The init function must initialize the control devices.
+        The init function must initialize the MQTT client.
         """
-        with patch('app.initLogger') as mockedInitLogger, \
-                patch('app._initControlDevices'), \
-                patch('app._initMqttClient') as mockedInitMqttClient, \
-                patch('app._sendCxnState'):
-            mockedAppLogger = Mock()
-            mockedInitLogger.return_value = mockedAppLogger
-            app.init()
-            mockedInitMqttClient.assert_called_once_with(mockedAppLogger)
+        appLogger, mockedSteps = self._init()
+        mockedSteps['_initMqttClient'].assert_called_once_with(appLogger)
+
+    def test_initPublisher(self):
+        """
+        The init function must initialize the publish queue.
+        """
+        appLogger, mockedSteps = self._init()
+        mockedSteps['_initPublisher'].assert_called_once_with(appLogger)
+
+    def test_initPowerMonitor(self):
+        """
+        The init function must initialize the power monitor.
+        """
+        appLogger, mockedSteps = self._init()
+        mockedSteps['_initPowerMonitor'].assert_called_once_with(appLogger)
 
     def test_initStartLoop(self):
         """
         The init function must start the client network loop.
         """
-        with patch('app.initLogger') as mockedInitLogger, \
-                patch('app._initControlDevices'), \
-                patch('app._initMqttClient'), \
-                patch('app._sendCxnState'):
-            mockedAppLogger = Mock()
-            mockedInitLogger.return_value = mockedAppLogger
-            app.init()
-            app.client.startLoop.assert_called_once()
+        self._init()
+        app.client.startLoop.assert_called_once()
 
     def test_initSendCxnStateMsg(self):
         """
         The init function must notify its connection state.
         """
-        with patch('app.initLogger') as mockedInitLogger, \
-                patch('app._initControlDevices'), \
-                patch('app._initMqttClient'), \
-                patch('app._sendCxnState') as mockedSendCxnState:
-            mockedAppLogger = Mock()
-            mockedInitLogger.return_value = mockedAppLogger
-            app.init()
-            mockedSendCxnState.assert_called_once()
+        _, mockedSteps = self._init()
+        mockedSteps['_sendCxnState'].assert_called_once()
 
     def test_runSendUnitState(self):
         """
-        The run function must send the unit current state.
+        The run function must send every unit current state.
         """
+        for unit in self.mockedUnits:
+            unit.getStatePeriod.return_value = 0.025
         with patch('app.time') as mockedTime, \
                 patch('app._sendUnitState') as mockedSendUnitState:
-            mockedTime.sleep.side_effect = Exception
+            mockedTime.monotonic.return_value = 10.0
+            app.wakeup.wait.side_effect = Exception
             try:
                 app.run()
             except Exception:
-                mockedSendUnitState.assert_called_once()
+                expectedCalls = [call(unit) for unit in self.mockedUnits]
+                self.assertEqual(mockedSendUnitState.call_args_list,
+                                 expectedCalls)
 
     def test_runLoopPeriod(self):
         """
-        The run function must loop based on the state update period.
+        The run function must loop until the next unit state deadline.
         """
-        with patch('app.time') as mockedTime:
-            mockedTime.sleep.side_effect = Exception
+        self.mockedUnits[0].getStatePeriod.return_value = 0.1
+        self.mockedUnits[1].getStatePeriod.return_value = 0.025
+        with patch('app.time') as mockedTime, \
+                patch('app._sendUnitState') as mockedSendUnitState:
+            mockedTime.monotonic.side_effect = [10.0, 10.0, 10.0,
+                                                10.025, 10.025,
+                                                10.05, 10.05]
+            app.wakeup.wait.side_effect = [None, None, Exception]
+            try:
+                app.run()
+            except Exception:
+                sleeps = [sleep.args[0]
+                          for sleep in app.wakeup.wait.call_args_list]
+                for sleep in sleeps:
+                    self.assertAlmostEqual(sleep, 0.025)
+                expectedCalls = [call(self.mockedUnits[0]),
+                                 call(self.mockedUnits[1]),
+                                 call(self.mockedUnits[1]),
+                                 call(self.mockedUnits[1])]
+                self.assertEqual(mockedSendUnitState.call_args_list,
+                                 expectedCalls)
+
+    def test_runTelemetryScale(self):
+        """
+        The run function must scale the units state period with
+        the link monitor scale.
+        """
+        for unit in self.mockedUnits:
+            unit.getStatePeriod.return_value = 0.025
+        app.linkMonitor.update.return_value = 4.0
+        app.publisher.getStats.return_value['shed'] = (0, 0, 7)
+        app.publisher.getPendingAge.return_value = 0.5
+        with patch('app.time') as mockedTime, \
+                patch('app._sendUnitState'):
+            mockedTime.monotonic.return_value = 10.0
+            app.wakeup.wait.side_effect = Exception
             try:
                 app.run()
             except Exception:
-                mockedTime.sleep.assert_called_once_with(app.STATE_UPDATE_PERIOD)   # noqa: E501
+                app.linkMonitor.update.assert_called_once_with(10.0, 7, 0.5)
+                sleep, = app.wakeup.wait.call_args.args
+                self.assertAlmostEqual(sleep, 0.1)
+
+    def test_runIdleWakeup(self):
+        """
+        The run function must send the state of a unit leaving the idle
+        mode right away and record the loop mode on every wakeup.
+        """
+        for unit in self.mockedUnits:
+            unit.getStatePeriod.return_value = 1.0
+        self.mockedUnits[0].updateIdle.side_effect = [True, False]
+        self.mockedUnits[1].updateIdle.side_effect = [True, True]
+        with patch('app.time') as mockedTime, \
+                patch('app._sendUnitState') as mockedSendUnitState:
+            mockedTime.monotonic.side_effect = [10.0, 10.0, 10.0,
+                                                10.2, 10.2]
+            app.wakeup.wait.side_effect = [None, Exception]
+            try:
+                app.run()
+            except Exception:
+                expectedCalls = [call(self.mockedUnits[0]),
+                                 call(self.mockedUnits[1]),
+                                 call(self.mockedUnits[0])]
+                self.assertEqual(mockedSendUnitState.call_args_list,
+                                 expectedCalls)
+                self.assertEqual(app.powerMonitor.recordWakeup.call_args_list,
+                                 [call(10.0, True), call(10.2, False)])
+
+    def test_runPowerMonitor(self):
+        """
+        The run function must record its wakeups in the power monitor
+        created from the app logger.
+        """
+        app.logger = logging.getLogger('APP')
+        app._initPowerMonitor(logging)
+        self.assertIsInstance(app.powerMonitor, app.PowerMonitor)
+        for unit in self.mockedUnits:
+            unit.getStatePeriod.return_value = 0.025
+        app.wakeup.wait.side_effect = [None, Exception]
+        with patch('app._sendUnitState'), \
+                self.assertRaises(Exception):
+            app.run()
+        self.assertEqual(app.wakeup.wait.call_count, 2)
+        self.assertEqual(app.powerMonitor.getMode(),
+                         app.PowerMonitor.MODE_ACTIVE)
+        self.assertIsNotNone(
+            app.powerMonitor.getStats()['active']['cpuTime'])
+
+    def test_runReportPublishStats(self):
+        """
+        The run function must report the publish queue statistics
+        on their period.
+        """
+        for unit in self.mockedUnits:
+            unit.getStatePeriod.return_value = app.PUBLISH_STATS_PERIOD
+        with patch('app.time') as mockedTime, \
+                patch('app._sendUnitState'), \
+                patch('app._reportPublishStats') as mockedReportStats:
+            mockedTime.monotonic.side_effect = [10.0, 10.0, 10.0,
+                                                20.0, 20.0]
+            app.wakeup.wait.side_effect = [None, Exception]
+            try:
+                app.run()
+            except Exception:
+                mockedReportStats.assert_called_once()
+
+    def test_stopUnits(self):
+        """
+        The stop function must stop every unit.
+        """
+        app.stop()
+        for unit in self.mockedUnits:
+            unit.stop.assert_called_once()
+
+    def test_stopCloseBackend(self):
+        """
+        The stop function must close the PWM backend.
+        """
+        app.stop()
+        app.ControlDevice.backend.close.assert_called_once()
+
+    def test_stopPublisher(self):
+        """
+        The stop function must report and stop the publish queue.
+        """
+        app.stop()
+        app.publisher.getStats.assert_called_once()
+        app.publisher.stop.assert_called_once()
+
+    def test_stopProfiler(self):
+        """
+        The stop function must stop the profiler.
+        """
+        app.stop()
+        app.profiler.stop.assert_called_once()
 
-    def test_stopSetControlDevicesToNeutral(self):
+    def test_stopPowerStats(self):
         """
-        The stop function must set to neutral the control devices.
+        The stop function must report the power usage statistics.
         """
         app.stop()
-        app.steering.setToNeutral.assert_called_once()
-        app.throttle.setToNeutral.assert_called_once()
+        app.powerMonitor.getStats.assert_called_once()
 
     def test_stopDisconnectClient(self):
         """